@@ -2,18 +2,32 @@ import socket
 import json
 import sys
 import argparse
+from typing import Callable
 
 from wvcr.commands import get_user_command_names, Command, COMMAND_REGISTRY
 
 SOCKET_PATH = "/tmp/wvcr.sock"
 
 
-def send_command(command: str, args: dict = None) -> dict:
-    """Send command to daemon and get response."""
+def send_command(
+    command: str,
+    args: dict = None,
+    wait: bool = True,
+    on_event: Callable[[dict], None] | None = None,
+) -> dict:
+    """Send command to daemon and get response.
+
+    With wait=False pipeline commands return right after being queued; the
+    response carries the job id to poll with `status --job-id`.
+    With on_event the daemon streams NDJSON progress events (step begin/end,
+    partial transcripts, deltas) which are passed to on_event as they come.
+    """
     if args is None:
         args = {}
 
-    request = {"command": command, "args": args}
+    request = {"command": command, "args": args, "wait": wait}
+    if on_event is not None:
+        request["stream"] = True
 
     try:
         # Connect to daemon
@@ -24,6 +38,9 @@ def send_command(command: str, args: dict = None) -> dict:
         sock.sendall(json.dumps(request).encode("utf-8"))
         sock.shutdown(socket.SHUT_WR)
 
+        if on_event is not None:
+            return _read_event_stream(sock, on_event)
+
         # Receive response
         data = b""
         while True:
@@ -48,6 +65,51 @@ def send_command(command: str, args: dict = None) -> dict:
         sys.exit(1)
 
 
+def _read_event_stream(sock: socket.socket, on_event: Callable[[dict], None]) -> dict:
+    """Read NDJSON lines; events go to on_event, the final line is the response."""
+    response = {"status": "error", "error": "Daemon closed the stream without a result"}
+    with sock, sock.makefile("rb") as stream:
+        for line in stream:
+            if not line.strip():
+                continue
+            msg = json.loads(line)
+            if msg.get("event", "result") == "result":
+                response = msg
+                break
+            on_event(msg)
+    return response
+
+
+_in_delta = False
+
+
+def _print_progress(msg: dict):
+    """Human-readable progress on stderr; stdout stays the final result."""
+    global _in_delta
+    event = msg["event"]
+    if _in_delta and event != "delta":
+        # Streamed text does not end with a newline
+        print(file=sys.stderr, flush=True)
+        _in_delta = False
+    if event == "step_begin":
+        print(f"[{msg['step']}] ...", file=sys.stderr, flush=True)
+    elif event == "step_end":
+        status = "done" if msg.get("ok", True) else "failed"
+        print(f"[{msg['step']}] {status} in {msg['duration']:.2f}s", file=sys.stderr, flush=True)
+    elif event == "partial":
+        print(f"[partial {msg['index']}] {msg['text']}", file=sys.stderr, flush=True)
+    elif event == "delta":
+        sys.stderr.write(msg["text"])
+        sys.stderr.flush()
+        _in_delta = True
+    elif event in ("queued", "running"):
+        print(f"[job {msg['job_id']}] {event}", file=sys.stderr, flush=True)
+
+
+def _print_ndjson(msg: dict):
+    print(json.dumps(msg, ensure_ascii=False), flush=True)
+
+
 def main():
     """Main entry point for client."""
     parser = argparse.ArgumentParser(description="WVCR - Voice Recording Client")
@@ -77,6 +139,41 @@ def main():
     parser.add_argument(
         "--vad", action="store_true", help="Enable voice activity detection"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Transcribe segments while still recording (transcribe only)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        help="Bypass the transcript cache (always re-transcribe)",
+    )
+    parser.add_argument(
+        "--job-id", dest="job_id", help="Job ID for status/cancel"
+    )
+    parser.add_argument(
+        "--no-wait",
+        dest="wait",
+        action="store_false",
+        help="Queue the command and print its job ID instead of waiting",
+    )
+    parser.add_argument(
+        "--prom",
+        action="store_true",
+        help="stats: print Prometheus text instead of JSON",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show live step progress and partial text on stderr",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Print raw progress events and the result as NDJSON on stdout",
+    )
     parser.add_argument(
         "--citations",
         action="store_true",
@@ -96,12 +193,27 @@ def main():
             cmd_args[arg_name] = getattr(args, arg_name)
 
     # Send to daemon
-    response = send_command(args.command, cmd_args)
+    on_event = None
+    if args.ndjson:
+        on_event = _print_ndjson
+    elif args.progress:
+        on_event = _print_progress
+    if not args.wait:
+        on_event = None
+
+    response = send_command(args.command, cmd_args, wait=args.wait, on_event=on_event)
 
     # Handle response
+    if args.ndjson and on_event is not None:
+        _print_ndjson(response)
+        sys.exit(0 if response.get("status") == "success" else 1)
     if response["status"] == "success":
         result = response.get("result")
-        if result:
+        if not args.wait and response.get("job_id"):
+            print(response["job_id"])
+        elif isinstance(result, (dict, list)):
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        elif result:
             print(result)
         sys.exit(0)
     else:
@@ -6,7 +6,9 @@ from wvcr.notification_manager import (
 from wvcr.pipeline import RuntimeContext
 from wvcr.ipc import IPCVoiceRecorder
 from wvcr.config import OUTPUT
+from wvcr.config.clients import prewarm_from_env
 from wvcr.config.simple_config import WVCRConfig, get_default_config
+from wvcr.services.audio_output import get_audio_output
 from wvcr.services.tts_service import TTSService
 
 
@@ -25,6 +27,7 @@ def build_runtime_context(cfg: WVCRConfig | None = None) -> RuntimeContext:
         "clipboard": cfg.clipboard,
         "notify": cfg.notify,
         "provider": cfg.provider,
+        "parallel_steps": cfg.parallel_steps,
         # audio overrides (flat for now)
         "rate": cfg.recorder.RATE,
         "channels": cfg.recorder.CHANNELS,
@@ -36,6 +39,15 @@ def build_runtime_context(cfg: WVCRConfig | None = None) -> RuntimeContext:
         "instruction": cfg.instruction,
         "thing": cfg.thing,
     }
+    # Warm provider connections in the background; first request skips the handshake
+    prewarm_from_env(
+        openai_key=cfg.oai.api_key or None,
+        gemini_key=cfg.gemini.api_key or None,
+    )
+
+    # One output device for the whole process (TTS, file playback)
+    audio_out = get_audio_output()
+
     runtime = RuntimeContext(
         oai_config=cfg.oai,
         gemini_config=cfg.gemini,
@@ -44,7 +56,8 @@ def build_runtime_context(cfg: WVCRConfig | None = None) -> RuntimeContext:
         options=options,
         services={
             "recorder": IPCVoiceRecorder(config=cfg.recorder, use_evdev=cfg.use_evdev),
-            "tts": TTSService(oai_config=cfg.oai, gemini_config=cfg.gemini),
+            "audio_out": audio_out,
+            "tts": TTSService(oai_config=cfg.oai, gemini_config=cfg.gemini, audio_out=audio_out),
         },
     )
     return runtime
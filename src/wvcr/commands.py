@@ -15,6 +15,9 @@ class Command(str, Enum):
     # Daemon-specific
     PING = "ping"
     SHUTDOWN = "shutdown"
+    STATUS = "status"
+    CANCEL = "cancel"
+    STATS = "stats"
 
 
 @dataclass
@@ -32,25 +35,25 @@ COMMAND_REGISTRY: Dict[Command, CommandSpec] = {
     Command.TRANSCRIBE: CommandSpec(
         name=Command.TRANSCRIBE,
         description="Record and transcribe audio",
-        args=["language", "provider", "vad"],
+        args=["language", "provider", "vad", "stream", "no_cache"],
         pipeline_mode="TranscribePipelineMode",
     ),
     Command.TRANSCRIBE_URL: CommandSpec(
         name=Command.TRANSCRIBE_URL,
         description="Transcribe audio from URL (YouTube, etc)",
-        args=["url", "language", "provider"],
+        args=["url", "language", "provider", "no_cache"],
         pipeline_mode="TranscribeUrlPipelineMode",
     ),
     Command.EXPLAIN: CommandSpec(
         name=Command.EXPLAIN,
         description="Record a question and explain something",
-        args=["instruction", "thing", "language", "provider", "vad"],
+        args=["instruction", "thing", "language", "provider", "vad", "no_cache"],
         pipeline_mode="ExplainPipelineMode",
     ),
     Command.VOICEOVER: CommandSpec(
         name=Command.VOICEOVER,
         description="Generate voiceover from clipboard text",
-        args=["language", "provider"],
+        args=["language", "provider", "no_cache"],
         pipeline_mode="VoiceoverPipelineMode",
     ),
     Command.RESEARCH: CommandSpec(
@@ -77,6 +80,24 @@ COMMAND_REGISTRY: Dict[Command, CommandSpec] = {
         args=[],
         pipeline_mode=None,
     ),
+    Command.STATUS: CommandSpec(
+        name=Command.STATUS,
+        description="Show daemon job queue, or one job with --job-id",
+        args=["job_id"],
+        pipeline_mode=None,
+    ),
+    Command.CANCEL: CommandSpec(
+        name=Command.CANCEL,
+        description="Cancel a job (--job-id) or all active jobs",
+        args=["job_id"],
+        pipeline_mode=None,
+    ),
+    Command.STATS: CommandSpec(
+        name=Command.STATS,
+        description="Show pipeline latency histograms and counters",
+        args=["prom"],
+        pipeline_mode=None,
+    ),
 }
 
 
@@ -90,6 +111,9 @@ def get_user_commands() -> list[Command]:
         Command.RESEARCH,
         Command.AGENTIC,
         Command.PING,
+        Command.STATUS,
+        Command.CANCEL,
+        Command.STATS,
     ]
 
 
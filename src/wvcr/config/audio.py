@@ -14,13 +14,23 @@ class RecorderAudioConfig:
     FORMAT: int = pyaudio.paInt16
     CHANNELS: int = 1
     RATE: int = 16000
-    AUDIO_FORMAT: str = "mp3"  # File format: mp3, wav
+    AUDIO_FORMAT: str = "mp3"  # File format: mp3, wav, ogg (Opus)
+    MP3_BITRATE: str = "128k"
+    OPUS_BITRATE: str = "32k"  # Opus is transparent for speech well below mp3 rates
     STOP_KEY: Any = Key.esc
     MAX_DURATION: int = 120  # seconds
     MIN_RECORD_DURATION: int = (
         5  # seconds - recordings shorter than this are considered accidental
     )
     ENABLE_VAD: bool = False
+    IPC_TRANSPORT: str = "shm"  # capture -> recorder: "shm" (shared-memory ring) or "socket"
+    # Streaming transcription: cut a segment on a pause (no frames for
+    # SEGMENT_GAP_S with VAD on, or a quiet batch without VAD) once it is
+    # at least SEGMENT_MIN_S long; always cut at SEGMENT_MAX_S.
+    SEGMENT_MIN_S: float = 4.0
+    SEGMENT_MAX_S: float = 20.0
+    SEGMENT_GAP_S: float = 0.6
+    SEGMENT_QUIET_LEVEL: int = 300  # mean abs amplitude (int16) of a quiet batch
 
 
 @dataclass
@@ -31,4 +41,5 @@ class PlayerAudioConfig:
     FORMAT: int = pyaudio.paInt16
     CHANNELS: int = 1
     RATE: int = 44100
+    MAX_BUFFER_MS: int = 300  # queued ahead of the device; bounds stop latency
     STOP_KEY: Any = Key.esc
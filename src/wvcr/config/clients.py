@@ -0,0 +1,135 @@
+"""Shared provider clients on one pooled HTTP transport.
+
+All OpenAI/Gemini/ADK traffic goes through a single httpx.Client (HTTP/2
+via the httpx[http2] extra, explicit keep-alive), and SDK clients
+are cached per API key, so the daemon and the hint runner pay client
+construction and the TLS handshake once instead of per request.
+prewarm() opens connections to the provider endpoints in the background.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+from typing import Any
+
+from loguru import logger
+
+OPENAI_ENDPOINT = "https://api.openai.com/v1/models"
+GEMINI_ENDPOINT = "https://generativelanguage.googleapis.com/"
+
+KEEPALIVE_EXPIRY_S = 300.0
+MAX_CONNECTIONS = 20
+
+_lock = threading.Lock()
+_http: Any = None
+_openai: dict[str, Any] = {}
+_genai: dict[str, Any] = {}
+
+
+def http_client():
+    """Process-wide pooled httpx.Client. Do not close it; pass per-request timeouts."""
+    global _http
+    with _lock:
+        if _http is None:
+            import httpx
+
+            # h2 ships with the httpx[http2] dependency; an install without
+            # it still works, just over HTTP/1.1
+            http2 = importlib.util.find_spec("h2") is not None
+            if not http2:
+                logger.warning("h2 not installed, shared HTTP client falls back to HTTP/1.1")
+            _http = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_S,
+                ),
+                timeout=httpx.Timeout(300.0, connect=10.0),
+            )
+            logger.debug(f"Shared HTTP client created (http2={http2})")
+        return _http
+
+
+def openai_client(api_key: str):
+    with _lock:
+        client = _openai.get(api_key)
+    if client is not None:
+        return client
+    try:
+        from openai import OpenAI
+    except ImportError as e:
+        raise RuntimeError(
+            "openai package not installed. Install openai to use OpenAI provider."
+        ) from e
+    client = OpenAI(api_key=api_key, http_client=http_client())
+    with _lock:
+        return _openai.setdefault(api_key, client)
+
+
+def genai_client(api_key: str):
+    with _lock:
+        client = _genai.get(api_key)
+    if client is not None:
+        return client
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError as e:
+        raise RuntimeError(
+            "google-generativeai package not installed. "
+            "Install it to use Gemini provider."
+        ) from e
+    try:
+        # Newer SDKs accept an external httpx client; share the pool when possible
+        client = genai.Client(
+            api_key=api_key, http_options=types.HttpOptions(httpx_client=http_client())
+        )
+    except (TypeError, ValueError):
+        client = genai.Client(api_key=api_key)
+    with _lock:
+        return _genai.setdefault(api_key, client)
+
+
+def _warm(urls: list[str]):
+    client = http_client()
+    for url in urls:
+        try:
+            # Any response means DNS + TCP + TLS are done and the connection is pooled
+            client.head(url, timeout=5.0)
+            logger.debug(f"Prewarmed connection to {url}")
+        except Exception as e:
+            logger.debug(f"Prewarm of {url} failed: {e}")
+
+
+def prewarm(
+    openai_key: str | None = None,
+    gemini_key: str | None = None,
+    extra_urls: list[str] | None = None,
+) -> threading.Thread:
+    """Build clients for the configured keys and open provider connections in the background."""
+
+    def run():
+        urls = list(extra_urls or [])
+        try:
+            if openai_key:
+                openai_client(openai_key)
+                urls.append(OPENAI_ENDPOINT)
+            if gemini_key:
+                genai_client(gemini_key)
+                urls.append(GEMINI_ENDPOINT)
+        except Exception as e:
+            logger.debug(f"Client prewarm failed: {e}")
+        _warm(urls)
+
+    thread = threading.Thread(target=run, name="wvcr-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def prewarm_from_env(openai_key: str | None, gemini_key: str | None) -> threading.Thread:
+    """prewarm() for the given keys plus the ADK API server if ADK_API_URL is set."""
+    extra = [os.environ["ADK_API_URL"]] if os.getenv("ADK_API_URL") else []
+    return prewarm(openai_key=openai_key, gemini_key=gemini_key, extra_urls=extra)
@@ -15,13 +15,9 @@ class OAIConfig:
 
     def get_client(self):
         if self._client is None:
-            try:
-                from openai import OpenAI
-            except ImportError as e:
-                raise RuntimeError(
-                    "openai package not installed. Install openai to use OpenAI provider."
-                ) from e
-            self._client = OpenAI(api_key=self.api_key)
+            from .clients import openai_client
+
+            self._client = openai_client(self.api_key)
         return self._client
 
 
@@ -37,12 +33,7 @@ class GeminiConfig:
 
     def get_client(self):
         if self._client is None:
-            try:
-                from google import genai
-            except ImportError as e:
-                raise RuntimeError(
-                    "google-generativeai package not installed. "
-                    "Install it to use Gemini provider."
-                ) from e
-            self._client = genai.Client(api_key=self.api_key)
+            from .clients import genai_client
+
+            self._client = genai_client(self.api_key)
         return self._client
@@ -21,6 +21,10 @@ class WVCRConfig:
     use_evdev: bool = field(
         default_factory=lambda: os.getenv("WVCR_USE_EVDEV", "true").lower() == "true"
     )
+    # Run independent pipeline steps concurrently (requires/provides DAG)
+    parallel_steps: bool = field(
+        default_factory=lambda: os.getenv("WVCR_PARALLEL_STEPS", "false").lower() == "true"
+    )
 
     # Output directory
     output_dir: str = field(default_factory=lambda: str(OUTPUT))
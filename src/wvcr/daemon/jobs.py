@@ -0,0 +1,216 @@
+"""Bounded job queue for pipeline commands run by the daemon.
+
+Connections only submit jobs and wait on them; a small pool of worker
+threads runs the pipelines. Recording jobs serialize on the mic inside the
+recorder, so text-only jobs can overlap with them when workers > 1.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable
+
+from loguru import logger
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+FINISHED = (DONE, ERROR, CANCELLED)
+MAX_EVENTS = 1000  # per job, kept for replay (the terminal event is always kept)
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class Job:
+    """One pipeline command submitted to the daemon."""
+
+    def __init__(self, command: str, args: dict):
+        self.id = uuid.uuid4().hex[:8]
+        self.command = command
+        self.args = args
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: str | None = None
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        # Progress events, replayed to late subscribers (status --job-id)
+        self.events: list[dict] = []
+        self._subscribers: list[queue.Queue] = []
+        self._events_lock = threading.Lock()
+
+    def publish(self, event: str, payload: dict | None = None):
+        """Record a progress event and fan it out to subscribers."""
+        msg = {"event": event, "job_id": self.id, **(payload or {})}
+        with self._events_lock:
+            # Replay must end with the terminal event or late subscribers never finish
+            if len(self.events) < MAX_EVENTS or event in FINISHED:
+                self.events.append(msg)
+            for q in self._subscribers:
+                q.put(msg)
+
+    def subscribe(self) -> queue.Queue:
+        """Queue receiving all past and future events of this job."""
+        q: queue.Queue = queue.Queue()
+        with self._events_lock:
+            for msg in self.events:
+                q.put(msg)
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._events_lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def to_dict(self, with_result: bool = True) -> dict:
+        info = {
+            "job_id": self.id,
+            "command": self.command,
+            "status": self.status,
+            "queued_s": round((self.started or time.time()) - self.created, 3),
+        }
+        if self.started:
+            info["elapsed_s"] = round((self.finished or time.time()) - self.started, 3)
+        if self.error:
+            info["error"] = self.error
+        if with_result and self.status == DONE:
+            info["result"] = self.result
+        return info
+
+
+class JobQueue:
+    """Fixed pool of worker threads pulling from a bounded queue.
+
+    runner(job) runs the pipeline and returns the job result; exceptions
+    mark the job as failed. Finished jobs are kept (up to `history`) so
+    clients can poll them by id.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], Any],
+        workers: int = 1,
+        max_pending: int = 16,
+        history: int = 100,
+    ):
+        self._runner = runner
+        self._workers = max(1, int(workers))
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._history = history
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def start(self):
+        for i in range(self._workers):
+            t = threading.Thread(target=self._worker, name=f"wvcr-job-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(f"Job queue started with {self._workers} worker(s)")
+
+    def submit(self, command: str, args: dict) -> Job:
+        job = Job(command, args)
+        job.publish(QUEUED, {"command": command})
+        with self._lock:
+            self._jobs[job.id] = job
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                del self._jobs[job.id]
+                raise JobQueueFull(f"Job queue full ({self._queue.maxsize} pending)")
+            self._trim()
+        logger.info(f"Job {job.id} queued: {command}")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active(self) -> list[Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if j.status not in FINISHED]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job, or ask a running one to stop. False if unknown/finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+        logger.info(f"Job {job.id} cancel requested")
+        return True
+
+    def status(self) -> dict:
+        with self._lock:
+            jobs = [j.to_dict(with_result=False) for j in self._jobs.values()]
+        return {
+            "workers": self._workers,
+            "pending": self._queue.qsize(),
+            "jobs": jobs,
+        }
+
+    def shutdown(self):
+        for job in self.active():
+            self.cancel(job.id)
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+    def _trim(self):
+        while len(self._jobs) > self._history:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.status not in FINISHED:
+                break
+            self._jobs.popitem(last=False)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: str | None = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished = time.time()
+        job.publish(status, {"error": error} if error else None)
+        job.done.set()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.cancel_event.is_set():
+                    continue  # cancelled while queued
+                job.status = RUNNING
+                job.started = time.time()
+            job.publish(RUNNING)
+            logger.info(f"Job {job.id} running: {job.command}")
+            try:
+                result = self._runner(job)
+            except Exception as e:
+                logger.exception(f"Job {job.id} failed")
+                self._finish(job, ERROR, error=str(e))
+                continue
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED)
+            else:
+                self._finish(job, DONE, result=result)
+            logger.info(f"Job {job.id} {job.status} ({job.finished - job.started:.2f}s)")
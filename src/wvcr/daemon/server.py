@@ -1,7 +1,9 @@
 import os
 import json
+import queue
 import time
 import socket
+import threading
 from typing import Any
 
 from loguru import logger
@@ -35,6 +37,8 @@ _configure_logging()
 # Heavy imports - loaded once at daemon startup
 from wvcr.cli.runtime import build_runtime_context
 from wvcr.commands import Command, COMMAND_REGISTRY
+from wvcr.daemon.jobs import JobQueue, Job, FINISHED, ERROR, CANCELLED
+from wvcr.pipeline.metrics import METRICS
 from wvcr.modes2.transcribe_pipeline_mode import TranscribePipelineMode
 from wvcr.modes2.transcribe_url_pipeline_mode import TranscribeUrlPipelineMode
 from wvcr.modes2.explain_pipeline_mode import ExplainPipelineMode
@@ -44,6 +48,13 @@ from wvcr.modes2.agentic_pipeline_mode import AgenticPipelineMode
 
 SOCKET_PATH = "/tmp/wvcr.sock"
 PID_FILE = "/tmp/wvcr.pid"
+# Pipeline jobs run on a small worker pool behind a bounded queue
+DAEMON_WORKERS = int(os.getenv("WVCR_DAEMON_WORKERS", "2"))
+DAEMON_MAX_PENDING = int(os.getenv("WVCR_DAEMON_MAX_PENDING", "16"))
+# Optional metrics dump after every job: *.prom -> Prometheus text, else JSON
+METRICS_FILE = os.getenv("WVCR_METRICS_FILE")
+# Options the daemon sets itself; client args with these names are dropped
+RESERVED_JOB_ARGS = {"cancel_event"}
 
 # Pipeline mode class mapping
 MODE_CLASSES = {
@@ -65,6 +76,14 @@ class WVCRDaemon:
         start = time.monotonic()
         # Pre-load runtime context (this is the slow part) - no config needed for daemon init
         self.runtime_ctx = build_runtime_context()  # Uses default config
+        # Open the mic and load VAD now so the first recording starts instantly
+        try:
+            self.runtime_ctx.services["recorder"].warm()
+        except Exception as e:
+            logger.warning(f"Failed to pre-start mic capture: {e}")
+        self.jobs = JobQueue(
+            self._run_job, workers=DAEMON_WORKERS, max_pending=DAEMON_MAX_PENDING
+        )
         logger.debug(
             f"[wvcr] CLI modules loaded in {time.monotonic() - start:.3f} seconds"
         )
@@ -83,16 +102,25 @@ class WVCRDaemon:
         # Create Unix domain socket
         self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self.sock.bind(self.socket_path)
-        self.sock.listen(5)
+        self.sock.listen(16)
+        # Wake up periodically so SHUTDOWN from a connection thread is noticed
+        self.sock.settimeout(0.5)
         os.chmod(self.socket_path, 0o600)  # Only owner can connect
 
+        self.jobs.start()
         logger.info(f"Daemon listening on {self.socket_path}")
         self.running = True
 
         try:
             while self.running:
-                conn, _ = self.sock.accept()
-                self._handle_client(conn)
+                try:
+                    conn, _ = self.sock.accept()
+                except socket.timeout:
+                    continue
+                # One thread per connection: control commands never wait on a pipeline
+                threading.Thread(
+                    target=self._handle_client, args=(conn,), daemon=True
+                ).start()
         except KeyboardInterrupt:
             logger.info("Daemon interrupted, shutting down...")
         finally:
@@ -118,15 +146,22 @@ class WVCRDaemon:
             request = json.loads(data.decode("utf-8"))
             command = request.get("command")
             args = request.get("args", {})
+            wait = request.get("wait", True)
+            stream = request.get("stream", False)
 
             logger.info(f"Received command: {command}")
 
+            # Streaming: NDJSON progress events, then the final response line
+            job = self._job_to_stream(command, args) if stream else None
+            if job is not None:
+                self._stream_job(conn, job)
+                return
+
             # Execute command
-            result = self._execute_command(command, args)
+            response = self._execute_command(command, args, wait=wait)
 
             # Send response
-            response = {"status": "success", "result": result}
-            conn.sendall(json.dumps(response).encode("utf-8"))
+            conn.sendall(json.dumps(response, default=str).encode("utf-8"))
 
         except Exception as e:
             logger.exception(f"Error handling client: {e}")
@@ -138,8 +173,7 @@ class WVCRDaemon:
         finally:
             conn.close()
 
-    def _execute_command(self, command: str, args: dict) -> Any:
-        """Execute command using registry."""
+    def _resolve(self, command: str):
         # Convert string to Command enum
         try:
             cmd = Command(command)
@@ -150,29 +184,124 @@ class WVCRDaemon:
         spec = COMMAND_REGISTRY.get(cmd)
         if not spec:
             raise ValueError(f"Command not in registry: {command}")
+        return cmd, spec
+
+    def _job_to_stream(self, command: str, args: dict) -> Job | None:
+        """Job whose progress a streaming request follows (new or via status --job-id)."""
+        cmd, spec = self._resolve(command)
+        if cmd == Command.STATUS and args.get("job_id"):
+            job = self.jobs.get(args["job_id"])
+            if job is None:
+                raise ValueError(f"Unknown job: {args['job_id']}")
+            return job
+        if spec.pipeline_mode:
+            return self.jobs.submit(command, args)
+        return None
+
+    def _stream_job(self, conn: socket.socket, job: Job):
+        """Forward job events as NDJSON lines; the last line is the response."""
+        events = job.subscribe()
+        try:
+            while True:
+                try:
+                    msg = events.get(timeout=1.0)
+                except queue.Empty:
+                    if job.done.is_set() and events.empty():
+                        break
+                    continue
+                if msg["event"] in FINISHED:
+                    break
+                conn.sendall((json.dumps(msg, default=str) + "\n").encode("utf-8"))
+        except OSError:
+            # Client went away; the job keeps running and can be polled
+            logger.info(f"Stream client for job {job.id} disconnected")
+            return
+        finally:
+            job.unsubscribe(events)
+        response = {"event": "result", **self._job_response(job)}
+        conn.sendall((json.dumps(response, default=str) + "\n").encode("utf-8"))
+
+    def _job_response(self, job: Job) -> dict:
+        if job.status == ERROR:
+            return {"status": "error", "job_id": job.id, "error": job.error}
+        if job.status == CANCELLED:
+            return {"status": "error", "job_id": job.id, "error": "cancelled"}
+        return {"status": "success", "job_id": job.id, "result": job.result}
+
+    def _execute_command(self, command: str, args: dict, wait: bool = True) -> dict:
+        """Answer control commands inline; queue pipeline commands as jobs."""
+        cmd, spec = self._resolve(command)
 
         # Handle special daemon commands
         if cmd == Command.PING:
-            return "pong"
+            return {"status": "success", "result": "pong"}
 
         if cmd == Command.SHUTDOWN:
             logger.info("Shutdown command received")
             self.running = False
-            return "shutting down"
+            return {"status": "success", "result": "shutting down"}
+
+        if cmd == Command.STATUS:
+            job_id = args.get("job_id")
+            if not job_id:
+                return {"status": "success", "result": self.jobs.status()}
+            job = self.jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"Unknown job: {job_id}")
+            return {"status": "success", "result": job.to_dict()}
+
+        if cmd == Command.STATS:
+            if args.get("prom"):
+                return {"status": "success", "result": METRICS.to_prometheus()}
+            stats = METRICS.snapshot()
+            audio_out = self.runtime_ctx.services.get("audio_out")
+            if audio_out is not None:
+                stats["audio_out"] = audio_out.stats()
+            return {"status": "success", "result": stats}
+
+        if cmd == Command.CANCEL:
+            job_id = args.get("job_id")
+            ids = [job_id] if job_id else [j.id for j in self.jobs.active()]
+            cancelled = [i for i in ids if self.jobs.cancel(i)]
+            return {"status": "success", "result": {"cancelled": cancelled}}
 
         # Handle pipeline commands
         if not spec.pipeline_mode:
             raise ValueError(f"Command {command} has no pipeline mode")
 
-        # Update runtime context with args
-        for arg_name, arg_value in args.items():
-            if arg_value is not None:
-                self.runtime_ctx.options[arg_name] = arg_value
+        job = self.jobs.submit(command, args)
+        if not wait:
+            return {"status": "success", "job_id": job.id, "result": job.to_dict()}
+        job.done.wait()
+        return self._job_response(job)
+
+    def _run_job(self, job: Job) -> Any:
+        """Run one pipeline command on a job worker thread."""
+        cmd = Command(job.command)
+        spec = COMMAND_REGISTRY[cmd]
+
+        # Private options per job; the preloaded context (clients, recorder,
+        # TTS) is shared but never mutated, so jobs can run side by side
+        args = {k: v for k, v in job.args.items() if k not in RESERVED_JOB_ARGS}
+        if len(args) != len(job.args):
+            logger.warning(f"Job {job.id}: ignoring reserved args {sorted(RESERVED_JOB_ARGS & set(job.args))}")
+        ctx = self.runtime_ctx.derive(**args, cancel_event=job.cancel_event)
+        ctx.on_event = job.publish
 
         # Get and instantiate pipeline class
         mode_class = MODE_CLASSES[spec.pipeline_mode]
-        pipeline = mode_class(self.runtime_ctx)
-        state = pipeline.run()
+        pipeline = mode_class(ctx)
+        try:
+            state = pipeline.run()
+        finally:
+            self._dump_metrics()
+        ctx.emit(
+            "timeline",
+            steps=state.timeline,
+            errors=state.errors,
+            critical_path=state.get("critical_path"),
+            critical_path_s=state.get("critical_path_s"),
+        )
 
         # Extract result based on command type
         result_key_map = {
@@ -187,8 +316,24 @@ class WVCRDaemon:
         result_key = result_key_map.get(cmd, "result")
         return state.get(result_key, "")
 
+    def _dump_metrics(self):
+        if not METRICS_FILE:
+            return
+        try:
+            METRICS.dump(METRICS_FILE)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics to {METRICS_FILE}: {e}")
+
     def cleanup(self):
         """Clean up resources."""
+        self.jobs.shutdown()
+        try:
+            self.runtime_ctx.services["recorder"].close()
+        except Exception as e:
+            logger.warning(f"Failed to stop mic capture: {e}")
+        audio_out = self.runtime_ctx.services.get("audio_out")
+        if audio_out is not None:
+            audio_out.close()
         if self.sock:
             self.sock.close()
         if os.path.exists(self.socket_path):
@@ -3,7 +3,9 @@ from __future__ import annotations
 import io
 import subprocess
 import threading
+import time
 import wave
+from collections import deque
 
 from loguru import logger
 
@@ -20,21 +22,62 @@ MP3_BITRATE = "16k"  # matches what Gemini downsamples to internally anyway,
 # so sending higher bitrate is just wasted upload bytes.
 
 
+# Capacity beyond the window: new audio lands here first, so views handed
+# out by snapshot_views() stay intact for this long while they are consumed.
+SLACK_SECONDS = 5.0
+# How often new audio is fed to the background MP3 encoder
+FEED_SECONDS = 0.2
+# LAME encoder delay (576) plus MP3 decoder delay (529): sample j of the
+# decoded stream is input sample j - ENCODER_DELAY_SAMPLES
+ENCODER_DELAY_SAMPLES = 1105
+# Frames kept ahead of the window so the first one can resolve its
+# bit-reservoir back-reference (main_data_begin is at most 255 bytes, and
+# a 16 kbps MPEG-2 frame is 72)
+RESERVOIR_FRAMES = 4
+RESTART_DELAY_S = 5.0
+# How long a snapshot waits for the encoder to emit the frames up to the
+# live edge (its lookahead plus decoder delay is ~100 ms of audio)
+FLUSH_WAIT_S = 0.3
+
+
 class RingBuffer:
-    """In-memory rolling buffer of the last `window_seconds` of PCM16 audio.
+    """Rolling buffer of the last `window_seconds` of PCM16 audio.
 
     A background thread reads raw PCM from `pacat --record` on the hint bus
-    monitor and appends it. Old bytes are trimmed off the front. Reading is
-    I/O-bound (blocks on read), so idle CPU cost is ~0.
+    monitor straight into a preallocated circular bytearray (readinto at
+    the write index), so steady-state capture neither allocates nor moves
+    old audio. Reading is I/O-bound (blocks on read), so idle CPU cost is
+    ~0. Snapshots are at most two memoryviews over the buffer.
+
+    A second thread feeds the capture into one long-lived ffmpeg encoder
+    and keeps its output as individual MP3 frames, each mapped to the PCM
+    range it decodes to. snapshot_mp3() slices the frames covering the
+    window out of that single continuous stream, so there is no encoder
+    delay or padding inside it and no transcoding at snapshot time.
     """
 
     def __init__(self, window_seconds: float = 600.0):
-        self._max_bytes = int(SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH * window_seconds)
-        self._buf = bytearray()
+        bytes_per_s = SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH
+        frame = CHANNELS * SAMPLE_WIDTH
+        self._max_bytes = int(bytes_per_s * window_seconds) // frame * frame
+        self._capacity = self._max_bytes + int(bytes_per_s * SLACK_SECONDS) // frame * frame
+        self._feed_bytes = int(bytes_per_s * FEED_SECONDS) // frame * frame
+        self._buf = bytearray(self._capacity)
+        self._view = memoryview(self._buf)
+        self._total = 0  # bytes ever written; the write index is _total % capacity
         self._lock = threading.Lock()
         self._stop = threading.Event()
         self._proc: subprocess.Popen | None = None
         self._thread: threading.Thread | None = None
+        # MP3 frames of the running encoder as (start, end, frame), where
+        # [start, end) is the absolute PCM byte range the frame decodes to
+        self._frames: deque[tuple[int, int, bytes]] = deque()
+        self._frames_cond = threading.Condition(self._lock)
+        self._flushing = 0
+        self._fed = 0
+        self._feed_ready = threading.Event()
+        self._encoder: threading.Thread | None = None
+        self._mp3_proc: subprocess.Popen | None = None
 
     def start(self) -> None:
         self._proc = subprocess.Popen(
@@ -54,6 +97,8 @@ class RingBuffer:
         )
         self._thread = threading.Thread(target=self._read_loop, daemon=True)
         self._thread.start()
+        self._encoder = threading.Thread(target=self._encode_loop, daemon=True)
+        self._encoder.start()
         logger.info(f"hint ring buffer capturing {CAPTURE_DEVICE}")
 
     def _read_loop(self) -> None:
@@ -61,51 +106,179 @@ class RingBuffer:
         stdout = self._proc.stdout
         assert stdout is not None
         while not self._stop.is_set():
-            chunk = stdout.read(FRAME_BYTES)
-            if not chunk:
+            # The slack region ahead of the write index is outside every
+            # snapshot, so it is filled without holding the lock
+            pos = self._total % self._capacity
+            end = min(pos + FRAME_BYTES, self._capacity)
+            n = stdout.readinto(self._view[pos:end])
+            if not n:
                 logger.warning("hint capture stdout closed")
                 break
-            with self._lock:
-                self._buf.extend(chunk)
-                excess = len(self._buf) - self._max_bytes
-                if excess > 0:
-                    del self._buf[:excess]
+            self._advance(n)
 
-    def snapshot(self) -> bytes:
+    def _advance(self, n: int) -> None:
+        """Account for n bytes just written at the write index."""
         with self._lock:
-            return bytes(self._buf)
+            self._total += n
+            # A pending snapshot wants every read fed at once, so the
+            # encoder's lookahead fills and it emits the live edge
+            if self._flushing or self._total - self._fed >= self._feed_bytes:
+                self._feed_ready.set()
+
+    def _views_between(self, start: int, end: int) -> list[memoryview]:
+        """Absolute byte range [start, end) as at most two memoryviews."""
+        a = start % self._capacity
+        n = end - start
+        if a + n <= self._capacity:
+            return [self._view[a : a + n]]
+        return [self._view[a:], self._view[: a + n - self._capacity]]
+
+    def _window(self, size: int) -> tuple[int, int]:
+        """Absolute [start, end) of the last `size` bytes, whole samples only."""
+        with self._lock:
+            total = self._total
+        # A short pipe read can leave half a sample at the end; skip it
+        end = total - total % (CHANNELS * SAMPLE_WIDTH)
+        oldest = max(0, total - self._capacity)
+        return max(oldest, end - size), end
+
+    def snapshot_views(self, seconds: float | None = None) -> list[memoryview]:
+        """The latest window (or last `seconds`) as at most two memoryviews.
+
+        Zero-copy: the views alias the ring and remain valid for about
+        SLACK_SECONDS, which is plenty to stream them into an encoder.
+        """
+        size = self._max_bytes
+        if seconds is not None:
+            size = min(size, int(SAMPLE_RATE * seconds) * CHANNELS * SAMPLE_WIDTH)
+        return self._views_between(*self._window(size))
+
+    def snapshot(self) -> bytes:
+        return b"".join(self.snapshot_views())
 
     def snapshot_wav(self) -> bytes:
-        pcm = self.snapshot()
+        views = self.snapshot_views()
         out = io.BytesIO()
         with wave.open(out, "wb") as wf:
             wf.setnchannels(CHANNELS)
             wf.setsampwidth(SAMPLE_WIDTH)
             wf.setframerate(SAMPLE_RATE)
-            wf.writeframes(pcm)
+            for view in views:
+                wf.writeframes(view)
         return out.getvalue()
 
     def snapshot_mp3(self) -> bytes:
-        """Compress the current snapshot to MP3 in-memory (no temp files).
+        """The current window as MP3, cut from the background encoder's stream.
 
         Gemini downsamples all audio to 16 Kbps internally, so a low-bitrate
         MP3 costs no understanding quality while cutting payload size ~6x
         vs raw PCM/WAV -- important once the window is minutes long.
+        Nothing is encoded here: the encoder is fed immediately and given up
+        to FLUSH_WAIT_S to emit the frames reaching the live edge; audio it
+        has not covered by then is left out.
         """
-        pcm = self.snapshot()
-        cmd = [
-            "ffmpeg",
-            "-f", "s16le",
-            "-ar", str(SAMPLE_RATE),
-            "-ac", str(CHANNELS),
-            "-i", "pipe:0",
-            "-codec:a", "libmp3lame",
-            "-b:a", MP3_BITRATE,
-            "-f", "mp3",
-            "pipe:1",
-        ]
-        result = subprocess.run(cmd, input=pcm, capture_output=True, check=True)
-        return result.stdout
+        start, end = self._window(self._max_bytes)
+        deadline = time.monotonic() + FLUSH_WAIT_S
+        with self._frames_cond:
+            self._flushing += 1
+            self._feed_ready.set()
+            try:
+                while not (self._frames and self._frames[-1][1] >= end):
+                    left = deadline - time.monotonic()
+                    if left <= 0 or self._mp3_proc is None:
+                        break
+                    self._frames_cond.wait(left)
+            finally:
+                self._flushing -= 1
+            frames = [f for f in self._frames if f[0] < end]
+        first = next((i for i, f in enumerate(frames) if f[1] > start), len(frames))
+        if first == len(frames):
+            logger.warning("hint background encoder has no audio for the window")
+            return b""
+        if frames[first][0] > start:
+            missing = (frames[first][0] - start) / (SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH)
+            logger.info(f"hint window starts {missing:.1f}s late: encoder restarted")
+        if end > frames[-1][1]:
+            missing = (end - frames[-1][1]) / (SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH)
+            logger.debug(f"hint window ends {missing:.2f}s short: encoder still flushing")
+        return b"".join(f[2] for f in frames[max(0, first - RESERVOIR_FRAMES) :])
+
+    def _encode_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._run_encoder()
+            except (OSError, ValueError) as e:
+                if not self._stop.is_set():
+                    # Snapshots only carry audio from after the restart
+                    logger.warning(f"hint background encoder stopped: {e}")
+            self._stop.wait(RESTART_DELAY_S)
+
+    def _run_encoder(self) -> None:
+        """Feed the capture into one ffmpeg process until it fails or we stop."""
+        sample = CHANNELS * SAMPLE_WIDTH
+        with self._lock:
+            origin = self._total - self._total % sample
+            self._frames.clear()
+            self._fed = origin
+        proc = subprocess.Popen(
+            _mp3_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._mp3_proc = proc
+        reader = threading.Thread(target=self._read_frames, args=(proc.stdout, origin), daemon=True)
+        reader.start()
+        fed = origin
+        try:
+            while not self._stop.is_set():
+                self._feed_ready.wait(timeout=1.0)
+                self._feed_ready.clear()
+                with self._lock:
+                    total = self._total
+                end = total - total % sample
+                if end - fed > self._max_bytes:
+                    raise ValueError("fell behind the ring buffer")
+                for view in self._views_between(fed, end):
+                    proc.stdin.write(view)
+                proc.stdin.flush()
+                fed = end
+                with self._lock:
+                    self._fed = fed
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            reader.join(timeout=1)
+            self._mp3_proc = None
+
+    def _read_frames(self, stdout, origin: int) -> None:
+        """Split the encoder output into frames and index them by PCM range."""
+        sample = CHANNELS * SAMPLE_WIDTH
+        position = -ENCODER_DELAY_SAMPLES  # input sample the next frame starts at
+        pending = bytearray()
+        while True:
+            data = stdout.read1(4096)
+            if not data:
+                return
+            pending += data
+            new = []
+            for frame, samples in _split_mp3_frames(pending):
+                start = origin + position * sample
+                position += samples
+                new.append((start, origin + position * sample, frame))
+            with self._frames_cond:
+                self._frames.extend(new)
+                self._frames_cond.notify_all()
+                oldest = self._total - self._max_bytes
+                # Keep a few extra frames as bit-reservoir lead-in
+                while len(self._frames) > RESERVOIR_FRAMES and self._frames[RESERVOIR_FRAMES][1] <= oldest:
+                    self._frames.popleft()
 
     def stop(self) -> None:
         self._stop.set()
@@ -117,5 +290,75 @@ class RingBuffer:
                 self._proc.kill()
             except Exception as e:
                 logger.warning(f"error stopping hint capture: {e}")
-        if self._thread is not None and self._thread.is_alive():
-            self._thread.join(timeout=1)
+        proc = self._mp3_proc
+        if proc is not None:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+        self._feed_ready.set()
+        for thread in (self._thread, self._encoder):
+            if thread is not None and thread.is_alive():
+                thread.join(timeout=1)
+
+
+def _mp3_command() -> list[str]:
+    return [
+        "ffmpeg",
+        "-f", "s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-ac", str(CHANNELS),
+        "-i", "pipe:0",
+        "-codec:a", "libmp3lame",
+        "-b:a", MP3_BITRATE,
+        # Bare frames only: no Xing/LAME info frame or ID3 tag, so frame
+        # slices form a valid stream
+        "-write_xing", "0",
+        "-id3v2_version", "0",
+        # Hand out frames as they are encoded instead of in 32 KB blocks
+        "-flush_packets", "1",
+        "-f", "mp3",
+        "pipe:1",
+    ]
+
+
+# Layer III bitrates (kbps) by MPEG version: MPEG-1, then MPEG-2/2.5
+_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by the header's version bits
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _split_mp3_frames(buf: bytearray):
+    """Yield (frame, samples) for each complete Layer III frame at the front of buf.
+
+    Consumed bytes are removed from buf; a trailing partial frame stays.
+    """
+    pos = 0
+    while len(buf) - pos >= 4:
+        b1, b2 = buf[pos + 1], buf[pos + 2]
+        version = (b1 >> 3) & 3
+        bitrate_idx = b2 >> 4
+        rate_idx = (b2 >> 2) & 3
+        if (
+            buf[pos] != 0xFF
+            or b1 & 0xE0 != 0xE0
+            or version == 1
+            or (b1 >> 1) & 3 != 1
+            or bitrate_idx in (0, 15)
+            or rate_idx == 3
+        ):
+            pos += 1  # not a frame header: resync
+            continue
+        mpeg1 = version == 3
+        bitrate = _BITRATES[mpeg1][bitrate_idx] * 1000
+        rate = _SAMPLE_RATES[version][rate_idx]
+        length = (144 if mpeg1 else 72) * bitrate // rate + ((b2 >> 1) & 1)
+        if len(buf) - pos < length:
+            break
+        yield bytes(buf[pos : pos + length]), 1152 if mpeg1 else 576
+        pos += length
+    del buf[:pos]
+
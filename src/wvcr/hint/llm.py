@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from loguru import logger
-from google import genai
 from google.genai import types
 
+from wvcr.config.clients import genai_client
+
 MODEL = "gemini-3.7-flash"
 
 _BASE = """You are a live assistant listening to a conversation.
@@ -104,7 +105,7 @@ def get_hint(
     prompt = PROMPTS.get(mode, PROMPTS["hint"])
     if context:
         prompt = f"{prompt}\nCONTEXT (provided by me ahead of time):\n{context}\n"
-    client = genai.Client(api_key=api_key)
+    client = genai_client(api_key)
     tools = [types.Tool(google_search=types.GoogleSearch())]
 
     logger.debug(f"HINT PROMPT:\n{prompt}")
@@ -7,6 +7,7 @@ import time
 
 from loguru import logger
 
+from wvcr.config.clients import prewarm
 from wvcr.notification_manager import LayerShellNotificationManager as SystemNotificationManager
 
 from .audio import setup, teardown, watch_defaults
@@ -82,6 +83,8 @@ class HintRunner:
             self._busy.release()
 
     def run(self) -> None:
+        # First hint should not pay client construction + TLS handshake
+        prewarm(gemini_key=self.api_key)
         setup()
         self.buffer.start()
         self._watcher = threading.Thread(
@@ -1,3 +1,3 @@
 from wvcr.ipc.audio_ipc import UnixAudioInput, start_mic_capture_process
 from wvcr.ipc.ipc_mic_handler import IPCMicHandler
-from wvcr.ipc.ipc_recorder import IPCVoiceRecorder
+from wvcr.ipc.ipc_recorder import IPCVoiceRecorder, RecordingCancelled
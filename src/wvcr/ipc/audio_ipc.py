@@ -5,15 +5,22 @@ import struct
 import threading
 import queue
 import multiprocessing as mp
-from collections import deque
 
 from loguru import logger
 
+from wvcr.ipc.shm_ring import ShmRing
+
+# Socket frame header: payload length, capture session id
+_FRAME_HEADER = struct.Struct("!II")
+
 
 class UnixAudioInput:
     """
     Simple audio input client reading length-prefixed PCM frames from a Unix domain socket
     and exposing a get(timeout)->bytes API for consumers.
+
+    Each frame carries the capture session id; frames not belonging to the
+    current session (set via set_session) are dropped.
     """
 
     def __init__(
@@ -28,7 +35,8 @@ class UnixAudioInput:
         self._srv = None
         self._stop = threading.Event()
         self._reader_thread = None
-        self._frames: queue.Queue[bytes] = queue.Queue(maxsize=self.max_frames)
+        self._frames: queue.Queue[bytearray] = queue.Queue(maxsize=self.max_frames)
+        self.session = 0
 
     def start(self):
         # Ensure old socket file is gone
@@ -72,19 +80,35 @@ class UnixAudioInput:
         except Exception:
             pass
 
+    def set_session(self, session_id: int):
+        """Accept only frames of session_id from now on; drop anything queued."""
+        self.session = session_id
+        while True:
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                break
+
     def get(self, timeout: float | None = None) -> bytes:
         """Blocking pop of next audio frame. Raises queue.Empty on timeout for compatibility."""
         return self._frames.get(timeout=timeout)
 
+    def get_view(self, timeout: float | None = None) -> memoryview:
+        """Same as get(), as a memoryview (parity with ShmAudioInput)."""
+        return memoryview(self._frames.get(timeout=timeout))
+
     # Internal
-    def _recv_exact(self, conn: socket.socket, n: int) -> bytes:
-        buf = bytearray()
-        while len(buf) < n and not self._stop.is_set():
-            chunk = conn.recv(n - len(buf))
-            if not chunk:
+    def _recv_exact(self, conn: socket.socket, n: int) -> bytearray:
+        # Receive straight into a preallocated buffer; no intermediate chunks
+        buf = bytearray(n)
+        view = memoryview(buf)
+        got = 0
+        while got < n and not self._stop.is_set():
+            r = conn.recv_into(view[got:], n - got)
+            if not r:
                 raise ConnectionError("peer closed")
-            buf.extend(chunk)
-        return bytes(buf)
+            got += r
+        return buf
 
     def _accept_and_read(self):
         while not self._stop.is_set():
@@ -93,12 +117,15 @@ class UnixAudioInput:
                 logger.info("UnixAudioInput client connected")
                 with conn:
                     while not self._stop.is_set():
-                        header = self._recv_exact(conn, 4)
-                        frame_len = struct.unpack("!I", header)[0]
+                        header = self._recv_exact(conn, _FRAME_HEADER.size)
+                        frame_len, session = _FRAME_HEADER.unpack(header)
                         if frame_len <= 0 or frame_len > 10_000_000:
                             logger.warning(f"Invalid frame_len={frame_len}, dropping")
                             break
                         data = self._recv_exact(conn, frame_len)
+                        if session != self.session:
+                            # Tail of a previous recording
+                            continue
                         try:
                             self._frames.put_nowait(data)
                         except queue.Full:
@@ -118,8 +145,67 @@ class UnixAudioInput:
         logger.debug("UnixAudioInput reader thread exiting")
 
 
+def _connect_sender(stop_evt, socket_path: str, sndbuf_bytes: int, ring: ShmRing | None):
+    """Return (send(payload, session), close) for the capture process' output transport."""
+    if ring is not None:
+        logger.info("Mic capture writing to shared-memory ring")
+        return ring.write, lambda: None
+
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf_bytes)
+
+    # Retry connect until server is up or stop requested
+    while not stop_evt.is_set():
+        try:
+            s.connect(socket_path)
+            break
+        except OSError:
+            time.sleep(0.1)
+    logger.info("Mic capture connected to Unix socket")
+
+    def _send_payload(payload, session: int) -> bool:
+        header = _FRAME_HEADER.pack(len(payload), session)
+        try:
+            # Scatter/gather send: no header + payload concatenation
+            sent = s.sendmsg([header, payload])
+            total = len(header) + len(payload)
+            if sent < total:
+                rest = (header + bytes(payload))[sent:]
+                s.sendall(rest)
+            return True
+        except (BrokenPipeError, ConnectionError, OSError):
+            logger.warning("Mic capture socket send failed; exiting capture loop")
+            return False
+
+    def _close():
+        try:
+            s.close()
+        except Exception:
+            pass
+
+    return _send_payload, _close
+
+
+def _load_vad(enable_vad: bool, cache: dict):
+    """VAD for the capture loop; the Silero model is loaded once per process."""
+    import sys
+
+    if not enable_vad:
+        from wvcr.services.vad import NoVad
+
+        return NoVad()
+    if "silero" not in cache:
+        from wvcr.services.vad import StreamingSileroVAD
+
+        print("[capture_worker] Loading StreamingSileroVAD...", file=sys.stderr, flush=True)
+        cache["silero"] = StreamingSileroVAD(hangover_ms=1000)
+        print("[capture_worker] StreamingSileroVAD loaded", file=sys.stderr, flush=True)
+    return cache["silero"]
+
+
 def _capture_worker(
     stop_evt,
+    ctrl,
     socket_path: str,
     rate: int,
     channels: int,
@@ -128,7 +214,16 @@ def _capture_worker(
     sndbuf_bytes: int,
     warmup_ms: int,
     enable_vad: bool,
+    ring: ShmRing | None = None,
 ):
+    """Resident capture loop.
+
+    The device is opened (and the VAD model loaded) once; recordings are
+    started and stopped with control messages on `ctrl`:
+      ("arm", session_id), ("disarm", session_id), ("vad", enabled).
+    Every payload is tagged with the session id it was captured for so the
+    reader can drop stale tails from a previous recording.
+    """
     import sys
     import pyaudio  # import inside process
 
@@ -138,17 +233,9 @@ def _capture_worker(
         flush=True,
     )
 
+    vad_cache: dict = {}
     try:
-        if enable_vad:
-            from wvcr.services.vad import SileroVAD
-
-            print("[capture_worker] Loading SileroVAD...", file=sys.stderr, flush=True)
-            vad = SileroVAD(window_ms=1000, hangover_ms=1000)
-            print("[capture_worker] SileroVAD loaded", file=sys.stderr, flush=True)
-        else:
-            from wvcr.services.vad import NoVad
-
-            vad = NoVad()
+        vad = _load_vad(enable_vad, vad_cache)
     except Exception as e:
         print(f"[capture_worker] VAD init failed: {e}", file=sys.stderr, flush=True)
         raise
@@ -172,40 +259,68 @@ def _capture_worker(
                 _ = stream.read(fpb, exception_on_overflow=False)
             except Exception:
                 pass
+    # Idle until the first "arm"; the device stays open
+    stream.stop_stream()
 
-    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-    s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf_bytes)
-
-    # Retry connect until server is up or stop requested
-    while not stop_evt.is_set():
-        try:
-            s.connect(socket_path)
-            break
-        except OSError:
-            time.sleep(0.1)
-    logger.info("Mic capture connected to Unix socket")
-
-    def _send_payload(payload: bytes):
-        header = struct.pack("!I", len(payload))
-        try:
-            s.sendall(header + payload)
-            return True
-        except (BrokenPipeError, ConnectionError, OSError):
-            logger.warning("Mic capture socket send failed; exiting capture loop")
-            return False
+    _send_payload, _close_sender = _connect_sender(stop_evt, socket_path, sndbuf_bytes, ring)
 
     bytes_per_sample = pa.get_sample_size(pyaudio.paInt16)  # 2 for Int16
     pre_seconds = 1.0
     prebuf_bytes = int(rate * channels * bytes_per_sample * pre_seconds)
-    prebuf = deque(maxlen=prebuf_bytes)
+    # Pre-roll as a flat bytearray (a deque here held one int object per byte)
+    prebuf = bytearray()
 
     buf = bytearray()
     last = time.monotonic()
+    armed = False
+    session = 0
+
+    def _flush():
+        if buf:
+            # Transport copies straight out of buf; no bytes() snapshot
+            _send_payload(buf, session)
+            buf.clear()
+
+    def _handle(msg):
+        nonlocal armed, session, vad, last
+        kind = msg[0]
+        if kind == "arm":
+            session = int(msg[1])
+            buf.clear()
+            prebuf.clear()
+            vad.reset()
+            if not armed:
+                stream.start_stream()
+            armed = True
+            last = time.monotonic()
+            logger.debug(f"Mic capture armed (session {session})")
+        elif kind == "disarm":
+            if armed and int(msg[1]) == session:
+                _flush()
+                stream.stop_stream()
+                armed = False
+                logger.debug(f"Mic capture disarmed (session {session})")
+        elif kind == "vad":
+            vad = _load_vad(bool(msg[1]), vad_cache)
+            vad.reset()
+            logger.debug(f"Mic capture VAD={'on' if msg[1] else 'off'}")
+
     try:
         while not stop_evt.is_set():
+            if not armed:
+                # Block on the control pipe; no device reads while idle
+                if ctrl.poll(0.1):
+                    _handle(ctrl.recv())
+                continue
+            if ctrl.poll():
+                _handle(ctrl.recv())
+                continue
+
             chunk = stream.read(fpb, exception_on_overflow=False)
             if not vad.is_speech(chunk, rate):
                 prebuf.extend(chunk)
+                if len(prebuf) > prebuf_bytes:
+                    del prebuf[: len(prebuf) - prebuf_bytes]
                 continue
             else:
                 prebuf.extend(chunk)
@@ -216,26 +331,76 @@ def _capture_worker(
 
             now = time.monotonic()
             if (now - last) * 1000 >= batch_ms:
-                if buf:
-                    send_buf = bytes(buf)
-                    # if vad.is_speech(chunk, rate):
-                    _send_payload(send_buf)
-                    buf.clear()
+                _flush()
                 last = now
+    except (EOFError, OSError):
+        # Control pipe closed: parent went away
+        pass
     finally:
-        if buf:
-            send_buf = bytes(buf)
-            _send_payload(send_buf)
+        if armed:
+            _flush()
         try:
-            stream.stop_stream()
+            if stream.is_active():
+                stream.stop_stream()
             stream.close()
         finally:
             pa.terminate()
+        _close_sender()
+        logger.info("Mic capture process exiting")
+
+
+class _CaptureHandle:
+    def __init__(self, proc, stop_evt, ctrl, join_timeout: float):
+        self._proc = proc
+        self._stop_evt = stop_evt
+        self._ctrl = ctrl
+        self._ctrl_lock = threading.Lock()
+        self._join_timeout = join_timeout
+
+    def is_alive(self) -> bool:
+        return self._proc.is_alive() and not self._stop_evt.is_set()
+
+    def send(self, msg: tuple) -> bool:
+        with self._ctrl_lock:
+            try:
+                self._ctrl.send(msg)
+                return True
+            except (BrokenPipeError, OSError):
+                logger.warning(f"Mic capture control send failed: {msg[0]}")
+                return False
+
+    def arm(self, session_id: int) -> bool:
+        return self.send(("arm", session_id))
+
+    def disarm(self, session_id: int) -> bool:
+        return self.send(("disarm", session_id))
+
+    def set_vad(self, enabled: bool) -> bool:
+        return self.send(("vad", bool(enabled)))
+
+    def stop(self, block: bool = True):
+        """Signal the process to exit.
+
+        If block is False, returns immediately and joins in a background
+        thread, avoiding latency in the caller.
+        """
+        self._stop_evt.set()
+        if block:
+            self._join_with_timeout()
+        else:
+            threading.Thread(target=self._join_with_timeout, daemon=True).start()
+
+    def _join_with_timeout(self):
+        if self._proc.is_alive():
+            self._proc.join(timeout=self._join_timeout)
+            if self._proc.is_alive():
+                logger.warning(
+                    f"Mic capture process still alive after {self._join_timeout:.2f}s; continuing asynchronously"
+                )
         try:
-            s.close()
-        except Exception:
+            self._ctrl.close()
+        except OSError:
             pass
-        logger.info("Mic capture process exiting")
 
 
 def start_mic_capture_process(
@@ -248,12 +413,16 @@ def start_mic_capture_process(
     warmup_ms: int = 50,
     enable_vad: bool = False,
     join_timeout: float = 0.3,
-):
-    """Start the background mic capture process.
+    ring: ShmRing | None = None,
+) -> _CaptureHandle:
+    """Start the resident mic capture process.
 
-    Added join_timeout + non-blocking stop support so callers can avoid the
-    previous hard-coded 2s wait when stopping. The returned handle exposes
-    stop(block: bool = True).
+    The process opens the device once and then idles until armed; the
+    returned handle exposes arm(session_id) / disarm(session_id) /
+    set_vad(enabled) and stop(block: bool = True) to shut it down.
+
+    If ring is given, frames go to that shared-memory ring (inherited by the
+    forked child) instead of the Unix socket at socket_path.
     """
 
     try:
@@ -264,10 +433,12 @@ def start_mic_capture_process(
         pass
 
     stop_evt = mp.Event()
+    ctrl_child, ctrl_parent = mp.Pipe(duplex=False)
     proc = mp.Process(
         target=_capture_worker,
         args=(
             stop_evt,
+            ctrl_child,
             socket_path,
             rate,
             channels,
@@ -276,36 +447,11 @@ def start_mic_capture_process(
             sndbuf_bytes,
             warmup_ms,
             enable_vad,
+            ring,
         ),
         daemon=True,
     )
     proc.start()
+    ctrl_child.close()
 
-    class _Handle:
-        def __init__(self, proc, stop_evt, join_timeout: float):
-            self._proc = proc
-            self._stop_evt = stop_evt
-            self._join_timeout = join_timeout
-
-        def stop(self, block: bool = True):
-            """Signal the process to stop.
-
-            If block is False, returns immediately and joins in a background
-            thread, avoiding latency in the caller (may sacrifice the last
-            partial buffer if the socket is closed early by the caller).
-            """
-            self._stop_evt.set()
-            if block:
-                self._join_with_timeout()
-            else:
-                threading.Thread(target=self._join_with_timeout, daemon=True).start()
-
-        def _join_with_timeout(self):
-            if self._proc.is_alive():
-                self._proc.join(timeout=self._join_timeout)
-                if self._proc.is_alive():
-                    logger.warning(
-                        f"Mic capture process still alive after {self._join_timeout:.2f}s; continuing asynchronously"
-                    )
-
-    return _Handle(proc, stop_evt, join_timeout)
+    return _CaptureHandle(proc, stop_evt, ctrl_parent, join_timeout)
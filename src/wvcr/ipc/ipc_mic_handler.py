@@ -3,18 +3,22 @@ from __future__ import annotations
 """Minimal IPC mic handler extracted from IPCVoiceRecorder.
 
 Responsible only for:
- - starting the UnixAudioInput server
- - spawning the mic capture process
- - exposing get_frame(timeout)
- - stopping both (idempotent)
+ - starting the audio input (UnixAudioInput server or ShmAudioInput ring)
+ - keeping one resident mic capture process warm across recordings
+ - arming/disarming it per recording (start/stop, idempotent)
+ - exposing get_frame(timeout) / get_view(timeout)
+ - shutting everything down on close()
 
 No additional behaviour or streaming logic here; recorder still buffers
 frames in memory and writes them on stop.
 """
 
+import itertools
+
 from loguru import logger
 
 from wvcr.ipc.audio_ipc import UnixAudioInput, start_mic_capture_process
+from wvcr.ipc.shm_ring import ShmAudioInput
 
 
 class IPCMicHandler:
@@ -25,7 +29,8 @@ class IPCMicHandler:
                  rcvbuf_bytes: int = 4_194_304,
                  max_frames: int = 256,
                  enable_vad: bool = False,
-                 join_timeout: float = 0.2):
+                 join_timeout: float = 0.2,
+                 transport: str = "socket"):
         self.rate = rate
         self.channels = channels
         self.socket_path = socket_path
@@ -33,19 +38,32 @@ class IPCMicHandler:
         self._max_frames = max_frames
         self._enable_vad = enable_vad
         self._join_timeout = join_timeout
-        self._socket_client: UnixAudioInput | None = None
+        if transport not in ("socket", "shm"):
+            raise ValueError(f"Unknown IPC transport: {transport}")
+        self.transport = transport
+        self._socket_client: UnixAudioInput | ShmAudioInput | None = None
         self._capture_handle = None
+        self._sessions = itertools.count(1)
+        self._session = 0
         self._started = False
 
-    def start(self):
-        if self._started:
+    def warm(self):
+        """Spawn the capture process (device open, VAD loaded) without recording."""
+        if self._capture_handle is not None and self._capture_handle.is_alive():
             return
-        self._socket_client = UnixAudioInput(
-            socket_path=self.socket_path,
-            rcvbuf_bytes=self._rcvbuf_bytes,
-            max_frames=self._max_frames,
-        )
-        self._socket_client.start()
+        self._shutdown_worker()
+        ring = None
+        if self.transport == "shm":
+            self._socket_client = ShmAudioInput(capacity_bytes=self._rcvbuf_bytes)
+            self._socket_client.start()
+            ring = self._socket_client.ring
+        else:
+            self._socket_client = UnixAudioInput(
+                socket_path=self.socket_path,
+                rcvbuf_bytes=self._rcvbuf_bytes,
+                max_frames=self._max_frames,
+            )
+            self._socket_client.start()
         self._capture_handle = start_mic_capture_process(
             socket_path=self.socket_path,
             rate=self.rate,
@@ -54,33 +72,73 @@ class IPCMicHandler:
             batch_ms=140,
             enable_vad=self._enable_vad,
             join_timeout=self._join_timeout,
+            ring=ring,
         )
+        logger.debug("IPCMicHandler capture process spawned")
+
+    def start(self):
+        if self._started:
+            return
+        self.warm()
+        self._session = next(self._sessions)
+        self._socket_client.set_session(self._session)
+        if not self._capture_handle.arm(self._session):
+            raise RuntimeError("Mic capture process is not accepting commands")
         self._started = True
-        logger.debug("IPCMicHandler started")
+        logger.debug(f"IPCMicHandler started (session {self._session})")
+
+    def set_vad(self, enabled: bool):
+        """Switch VAD on the live capture process (model is loaded only once)."""
+        if enabled == self._enable_vad:
+            return
+        self._enable_vad = enabled
+        if self._capture_handle is not None and self._capture_handle.is_alive():
+            self._capture_handle.set_vad(enabled)
 
     def get_frame(self, timeout: float | None = None) -> bytes:
         if not self._socket_client:
             raise RuntimeError("IPCMicHandler not started")
         return self._socket_client.get(timeout=timeout)
 
+    def get_view(self, timeout: float | None = None) -> memoryview:
+        """Like get_frame, but copy-free with the shm transport.
+
+        The view is only valid until the next get_frame/get_view call.
+        """
+        if not self._socket_client:
+            raise RuntimeError("IPCMicHandler not started")
+        return self._socket_client.get_view(timeout=timeout)
+
     def stop(self):
         if not self._started:
             return
+        # Disarm only; the process stays resident for the next recording
+        try:
+            if self._capture_handle:
+                self._capture_handle.disarm(self._session)
+        except Exception:
+            logger.exception("Error disarming capture process")
+        self._started = False
+        logger.debug(f"IPCMicHandler stopped (session {self._session})")
+
+    def close(self):
+        """Stop recording and shut down the capture process and transport."""
+        self.stop()
+        self._shutdown_worker()
+        logger.debug("IPCMicHandler closed")
+
+    def _shutdown_worker(self):
         # Stop capture process first so it stops sending
         try:
             if self._capture_handle:
-                try:
-                    self._capture_handle.stop(block=False)
-                except TypeError:
-                    # In case legacy handle signature differs
-                    self._capture_handle.stop()
+                self._capture_handle.stop(block=False)
         except Exception:
             logger.exception("Error stopping capture process")
-        # Then stop socket listener
+        self._capture_handle = None
+        # Then stop the listener / ring
         try:
             if self._socket_client:
                 self._socket_client.stop()
         except Exception:
-            logger.exception("Error stopping UnixAudioInput")
-        self._started = False
-        logger.debug("IPCMicHandler stopped")
+            logger.exception("Error stopping audio input")
+        self._socket_client = None
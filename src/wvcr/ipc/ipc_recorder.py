@@ -1,53 +1,99 @@
 from __future__ import annotations
+import array
+import threading
 import time
-import wave
-import subprocess
 from pathlib import Path
+from typing import Callable
 from loguru import logger
 
 from wvcr.common import create_key_monitor
 from wvcr.config import RecorderAudioConfig
 from wvcr.ipc.ipc_mic_handler import IPCMicHandler
+from wvcr.services.audio_encoder import open_encoder
+
+
+class RecordingCancelled(RuntimeError):
+    pass
 
 
 class IPCVoiceRecorder:
     """
     IPC-based voice recorder that mimics the public API of the legacy VoiceRecorder.
     It spawns a separate mic capture process that streams VAD-filtered PCM frames
-    via a Unix domain socket. Frames are accumulated locally until stopped.
+    via a shared-memory ring (or a Unix domain socket). Frames are fed to a
+    streaming encoder as they arrive, so stopping only flushes the tail.
     """
 
     def __init__(self, config: RecorderAudioConfig, use_evdev: bool = False):
         self.config = config
         self.use_evdev = use_evdev
         self._current_vad = config.ENABLE_VAD
-        self._ipc = IPCMicHandler(
+        self._ipc = self._make_ipc(self._current_vad)
+        self._recording = False
+        # One mic: concurrent jobs queue up here rather than sharing the device
+        self._mic_lock = threading.Lock()
+
+    def _make_ipc(self, enable_vad: bool) -> IPCMicHandler:
+        return IPCMicHandler(
             rate=self.config.RATE,
             channels=self.config.CHANNELS,
-            enable_vad=self._current_vad,
+            enable_vad=enable_vad,
+            transport=self.config.IPC_TRANSPORT,
         )
-        self._frames: list[bytes] = []
-        self._recording = False
 
     def _ensure_ipc(self, enable_vad: bool):
-        """Recreate IPC handler if VAD setting changed."""
+        """Switch VAD on the live capture process if the setting changed."""
         if enable_vad != self._current_vad:
             self._current_vad = enable_vad
-            self._ipc = IPCMicHandler(
-                rate=self.config.RATE,
-                channels=self.config.CHANNELS,
-                enable_vad=enable_vad,
-            )
+            self._ipc.set_vad(enable_vad)
+
+    def warm(self):
+        """Start the resident capture process ahead of the first recording."""
+        self._ipc.warm()
+
+    def close(self):
+        self._ipc.close()
 
     def record(
-        self, output_file: Path, format: str = "wav", vad: bool | None = None
+        self,
+        output_file: Path,
+        format: str = "wav",
+        vad: bool | None = None,
+        on_segment: Callable[[bytes], None] | None = None,
+        cancel_event: threading.Event | None = None,
     ) -> tuple[Path, float]:
+        """Record until the stop key (or MAX_DURATION) and save to output_file.
+
+        format is "wav", "mp3" or "ogg"/"opus"; the encoder runs while
+        recording, so the file is complete right after capture stops.
+
+        If on_segment is given, the PCM is additionally cut into pause-aligned
+        segments that are handed over while recording is still running; the
+        trailing segment is delivered right after capture stops.
+
+        Only one recording runs at a time; other callers block until the mic
+        is free. Setting cancel_event (while waiting or recording) discards
+        the recording and raises RecordingCancelled.
+        """
+        while not self._mic_lock.acquire(timeout=0.25):
+            if cancel_event is not None and cancel_event.is_set():
+                raise RecordingCancelled("Recording cancelled while waiting for the mic")
+        try:
+            return self._record(output_file, format, vad, on_segment, cancel_event)
+        finally:
+            self._mic_lock.release()
+
+    def _record(self, output_file, format, vad, on_segment, cancel_event):
         if vad is not None:
             self._ensure_ipc(vad)
         logger.info(f"[IPC] Recording with VAD={self._current_vad}")
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        self._ipc.start()
-        self._frames = []
+        encoder = self._open_encoder(output_file, format)
+        try:
+            self._ipc.start()
+        except Exception:
+            encoder.abort()
+            raise
         self._recording = True
         start_time = time.time()
 
@@ -61,78 +107,98 @@ class IPCVoiceRecorder:
         key_monitor = create_key_monitor(stop_key, _stop, prefer_evdev=self.use_evdev)
         key_monitor.start()
 
+        segment = bytearray()
+        last_frame_at = time.monotonic()
         try:
             while (
                 self._recording
                 and (time.time() - start_time) < self.config.MAX_DURATION
             ):
                 try:
-                    frame = self._ipc.get_frame(timeout=0.25)
-                    if frame:
-                        self._frames.append(frame)
+                    # View into the transport buffer; valid until the next get
+                    frame = self._ipc.get_view(timeout=0.25)
                 except Exception:
                     # Timeout or queue empty; just loop
-                    pass
+                    frame = None
+                now = time.monotonic()
+                if on_segment is not None and self._pause_ends_segment(segment, now - last_frame_at):
+                    self._emit_segment(segment, on_segment)
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RecordingCancelled("Recording cancelled")
+                if not frame:
+                    continue
+                last_frame_at = now
+                encoder.write(frame)
+                if on_segment is not None:
+                    segment.extend(frame)
+                    if self._frame_ends_segment(segment, frame):
+                        self._emit_segment(segment, on_segment)
+        except BaseException:
+            encoder.abort()
+            raise
         finally:
             key_monitor.stop()
             self._ipc.stop()
+            cancelled = cancel_event is not None and cancel_event.is_set()
             self._recording = False
+            if on_segment is not None and not cancelled:
+                self._emit_segment(segment, on_segment)
 
         duration = time.time() - start_time
         logger.info(f"[IPC] Recording stopped ({duration:.1f}s)")
 
-        if format.lower() == "mp3":
-            self._save_mp3(output_file)
-        else:
-            self._save_wav(output_file)
-        logger.info("Files saved")
-        return output_file, duration
-
-    def _save_wav(self, output_file: Path):
-        if not self._frames:
+        if not encoder.bytes_written:
             logger.warning("[IPC] No audio frames captured; creating empty file")
-        raw = b"".join(self._frames)
-        import pyaudio
-
-        with wave.open(str(output_file), "wb") as wf:
-            wf.setnchannels(self.config.CHANNELS)
-            wf.setsampwidth(pyaudio.PyAudio().get_sample_size(pyaudio.paInt16))
-            wf.setframerate(self.config.RATE)
-            wf.writeframes(raw)
+        encoder.close()
         logger.info(f"[IPC] Audio saved to {output_file}")
+        return output_file, duration
 
-    def _save_mp3(self, output_file: Path):
-        if not self._frames:
-            logger.warning("[IPC] No audio frames captured; creating empty file")
-
-        raw = b"".join(self._frames)
-
-        # Pipe raw PCM directly to ffmpeg - no temp file needed
-        cmd = [
-            "ffmpeg",
-            "-f",
-            "s16le",  # signed 16-bit little-endian PCM
-            "-ar",
-            str(self.config.RATE),  # sample rate
-            "-ac",
-            str(self.config.CHANNELS),  # channels
-            "-i",
-            "pipe:0",  # read from stdin
-            "-codec:a",
-            "libmp3lame",
-            # "-b:a", "16k",           # 16 kbps to match Gemini downsampling
-            "-b:a",
-            "128k",  # 128 kbps for better quality
-            "-y",  # overwrite output
-            str(output_file),
-        ]
+    # Segmentation for streaming transcription
+    def _segment_seconds(self, segment: bytearray) -> float:
+        return len(segment) / (self.config.RATE * self.config.CHANNELS * 2)
+
+    def _pause_ends_segment(self, segment: bytearray, gap: float) -> bool:
+        # With VAD on the capture process sends nothing during silence, so a
+        # gap in frame arrival is the pause we cut on.
+        return (
+            bool(segment)
+            and gap >= self.config.SEGMENT_GAP_S
+            and self._segment_seconds(segment) >= self.config.SEGMENT_MIN_S
+        )
 
+    def _frame_ends_segment(self, segment: bytearray, frame) -> bool:
+        seconds = self._segment_seconds(segment)
+        if seconds >= self.config.SEGMENT_MAX_S:
+            return True
+        if seconds < self.config.SEGMENT_MIN_S:
+            return False
+        # Without VAD frames keep coming; cut on a quiet batch instead.
+        samples = array.array("h")
+        samples.frombytes(frame[: len(frame) - len(frame) % 2])
+        if not samples:
+            return False
+        level = sum(map(abs, samples)) / len(samples)
+        return level < self.config.SEGMENT_QUIET_LEVEL
+
+    def _emit_segment(self, segment: bytearray, on_segment: Callable[[bytes], None]):
+        if not segment:
+            return
+        pcm = bytes(segment)
+        segment.clear()
         try:
-            result = subprocess.run(cmd, input=raw, check=True, capture_output=True)
-            logger.info(f"[IPC] Audio saved as MP3 to {output_file}")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"[IPC] Error converting to MP3: {e.stderr.decode()}")
-            raise
-        except FileNotFoundError:
-            logger.error("ffmpeg not found. Install ffmpeg to enable MP3 saving.")
-            raise
+            on_segment(pcm)
+        except Exception:
+            logger.exception("[IPC] Segment callback failed")
+
+    def _open_encoder(self, output_file: Path, format: str):
+        return open_encoder(
+            output_file,
+            format,
+            rate=self.config.RATE,
+            channels=self.config.CHANNELS,
+            bitrates={
+                "mp3": self.config.MP3_BITRATE,
+                "ogg": self.config.OPUS_BITRATE,
+                "opus": self.config.OPUS_BITRATE,
+            },
+        )
@@ -0,0 +1,258 @@
+"""Single-producer/single-consumer ring buffer in shared memory.
+
+Used as a copy-free alternative to the Unix socket transport between the mic
+capture process and the recorder. The capture process writes PCM batches
+straight into the mapped segment; the consumer reads them back as
+memoryviews over the same pages. An eventfd (or a pipe where eventfd is not
+available) carries wakeups so the consumer blocks in select() instead of
+polling.
+
+Layout: [write_pos u64][read_pos u64][dropped u64][pad to 64][data ...]. Positions are
+monotonic byte counters; each record is a u32 length and a u32 tag followed
+by the payload, padded to 8 bytes. A record never wraps: if it does not fit before the end of
+the data area the producer writes a WRAP marker and starts over at offset 0.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import select
+import struct
+import threading
+from multiprocessing import shared_memory
+
+from loguru import logger
+
+_POS = struct.Struct("<Q")
+_REC = struct.Struct("<II")  # length, tag
+_WRITE_OFF = 0
+_READ_OFF = 8
+_DROP_OFF = 16
+_DATA_OFF = 64
+_WRAP = 0xFFFFFFFF
+_ALIGN = 8
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+class _Wakeup:
+    """eventfd-style doorbell shared across fork()."""
+
+    def __init__(self):
+        if hasattr(os, "eventfd"):
+            fd = os.eventfd(0, os.EFD_NONBLOCK)
+            self._rfd = self._wfd = fd
+            self._eventfd = True
+        else:
+            self._rfd, self._wfd = os.pipe()
+            os.set_blocking(self._rfd, False)
+            os.set_blocking(self._wfd, False)
+            self._eventfd = False
+
+    def notify(self):
+        try:
+            if self._eventfd:
+                os.eventfd_write(self._wfd, 1)
+            else:
+                os.write(self._wfd, b"\x01")
+        except (BlockingIOError, OSError):
+            # Counter saturated / pipe full: consumer is already signalled
+            pass
+
+    def wait(self, timeout: float | None) -> bool:
+        ready, _, _ = select.select([self._rfd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            if self._eventfd:
+                os.eventfd_read(self._rfd)
+            else:
+                os.read(self._rfd, 4096)
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        for fd in {self._rfd, self._wfd}:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class ShmRing:
+    """SPSC byte-record ring over multiprocessing.shared_memory.
+
+    Create it in the consumer before forking the producer; the child inherits
+    the mapping and the wakeup fd, so nothing has to be pickled.
+    """
+
+    def __init__(self, capacity: int = 4_194_304):
+        self.capacity = _aligned(int(capacity))
+        self._shm = shared_memory.SharedMemory(create=True, size=_DATA_OFF + self.capacity)
+        self._buf = self._shm.buf
+        _POS.pack_into(self._buf, _WRITE_OFF, 0)
+        _POS.pack_into(self._buf, _READ_OFF, 0)
+        _POS.pack_into(self._buf, _DROP_OFF, 0)
+        self._wakeup = _Wakeup()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped by the producer because the ring was full."""
+        return self._load(_DROP_OFF)
+
+    def _load(self, off: int) -> int:
+        return _POS.unpack_from(self._buf, off)[0]
+
+    def _store(self, off: int, value: int):
+        _POS.pack_into(self._buf, off, value)
+
+    # Producer side
+    def write(self, payload, tag: int = 0) -> bool:
+        """Copy payload into the ring. Returns False (and drops it) if full."""
+        n = len(payload)
+        need = _aligned(_REC.size + n)
+        if need > self.capacity:
+            self._store(_DROP_OFF, self.dropped + 1)
+            return False
+        w = self._load(_WRITE_OFF)
+        r = self._load(_READ_OFF)
+        off = w % self.capacity
+        pad = self.capacity - off if self.capacity - off < need else 0
+        if w + pad + need - r > self.capacity:
+            self._store(_DROP_OFF, self.dropped + 1)
+            return False
+        if pad:
+            _REC.pack_into(self._buf, _DATA_OFF + off, _WRAP, 0)
+            off = 0
+        start = _DATA_OFF + off
+        _REC.pack_into(self._buf, start, n, tag)
+        self._buf[start + _REC.size : start + _REC.size + n] = payload
+        # Publish only after the payload is in place
+        self._store(_WRITE_OFF, w + pad + need)
+        self._wakeup.notify()
+        return True
+
+    # Consumer side
+    def peek(self) -> tuple[memoryview, int, int] | None:
+        """Return (view, tag, next_read_pos) of the oldest record without consuming it."""
+        r = self._load(_READ_OFF)
+        w = self._load(_WRITE_OFF)
+        while r != w:
+            off = r % self.capacity
+            n, tag = _REC.unpack_from(self._buf, _DATA_OFF + off)
+            if n == _WRAP:
+                r += self.capacity - off
+                continue
+            start = _DATA_OFF + off + _REC.size
+            return self._buf[start : start + n], tag, r + _aligned(_REC.size + n)
+        return None
+
+    def commit(self, next_read_pos: int):
+        self._store(_READ_OFF, next_read_pos)
+
+    def wait(self, timeout: float | None) -> bool:
+        return self._wakeup.wait(timeout)
+
+    def close(self, unlink: bool = True):
+        self._buf = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping goes away with it
+            logger.debug("ShmRing closed with outstanding views")
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._wakeup.close()
+
+
+class ShmAudioInput:
+    """Audio input backed by ShmRing with the same get(timeout) API as
+    UnixAudioInput, plus get_view(timeout) returning memoryviews into the
+    shared segment.
+
+    A view returned by get_view() stays valid until the next get()/get_view()
+    call (or release()); copy it if it has to live longer. Records tagged with
+    a session other than the current one (set_session) are skipped.
+    """
+
+    def __init__(self, capacity_bytes: int = 4_194_304):
+        self.capacity_bytes = int(capacity_bytes)
+        self.ring: ShmRing | None = None
+        self._pending: int | None = None
+        self._view: memoryview | None = None
+        self._lock = threading.Lock()
+        self.session = 0
+
+    def start(self):
+        self.ring = ShmRing(self.capacity_bytes)
+        logger.info(f"ShmAudioInput ring {self.ring.name}, {self.ring.capacity} bytes")
+
+    def stop(self):
+        if self.ring is None:
+            return
+        if self.ring.dropped:
+            logger.warning(f"ShmAudioInput dropped {self.ring.dropped} frames (ring full)")
+        with self._lock:
+            self.release()
+            self.ring.close(unlink=True)
+            self.ring = None
+
+    def set_session(self, session_id: int):
+        with self._lock:
+            self.session = session_id
+
+    def release(self):
+        """Hand the slot of the last view back to the producer."""
+        if self._view is not None:
+            # Invalidate the caller's view so it can't read recycled bytes
+            self._view.release()
+            self._view = None
+        if self._pending is not None and self.ring is not None:
+            self.ring.commit(self._pending)
+        self._pending = None
+
+    def get_view(self, timeout: float | None = None) -> memoryview:
+        """Next frame as a view into shared memory. Raises queue.Empty on timeout."""
+        with self._lock:
+            ring = self.ring
+            if ring is None:
+                raise RuntimeError("ShmAudioInput not started")
+            self.release()
+            rec = self._next_current(ring)
+            if rec is None:
+                ring.wait(timeout)
+                rec = self._next_current(ring)
+            if rec is None:
+                raise queue.Empty
+            self._view, self._pending = rec
+            return self._view
+
+    def _next_current(self, ring: ShmRing) -> tuple[memoryview, int] | None:
+        while True:
+            rec = ring.peek()
+            if rec is None:
+                return None
+            view, tag, next_pos = rec
+            if tag == self.session:
+                return view, next_pos
+            # Tail of a previous recording
+            view.release()
+            ring.commit(next_pos)
+
+    def get(self, timeout: float | None = None) -> bytes:
+        """Blocking pop of next audio frame. Raises queue.Empty on timeout for compatibility."""
+        data = bytes(self.get_view(timeout))
+        with self._lock:
+            self.release()
+        return data
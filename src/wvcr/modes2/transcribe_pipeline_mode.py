@@ -4,6 +4,7 @@ from wvcr.pipeline.steps.lifecycle_steps import InitState, PrepareOutputPath, Fi
 from wvcr.pipeline.steps.configure_recording import ConfigureRecording
 from wvcr.pipeline.steps.record_audio import RecordAudio
 from wvcr.pipeline.steps.transcribe_audio_step import TranscribeAudioStep
+from wvcr.pipeline.steps.streaming_transcribe_step import RecordAudioStreaming, FinishStreamingTranscription
 from wvcr.pipeline.steps.io_steps import SaveTranscript, CopyToClipboard
 from wvcr.pipeline.steps.notify import Notify, NotifyTranscription
 
@@ -12,14 +13,20 @@ class TranscribePipelineMode:
         self.ctx = ctx
 
     def build_pipeline(self) -> Pipeline:
+        # stream: transcribe segments while still recording
+        if self.ctx.options.get("stream"):
+            record, transcribe = RecordAudioStreaming(), FinishStreamingTranscription()
+        else:
+            record, transcribe = RecordAudio(), TranscribeAudioStep()
+
         steps = [
             InitState("transcribe"),
             PrepareOutputPath(records_dir=self.ctx.output_dir / "records"),
             ConfigureRecording(defaults={"rate": 16000, "channels": 1}),
             Notify(text="Start record"),
-            RecordAudio(),
+            record,
             Notify(text="Stop record"),
-            TranscribeAudioStep(),
+            transcribe,
             SaveTranscript(output_dir=self.ctx.output_dir / 'transcribe'),
             CopyToClipboard(key="transcript"),
             NotifyTranscription(title="Transcription completed", key="transcript"),
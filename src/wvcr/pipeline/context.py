@@ -1,6 +1,8 @@
 from pathlib import Path
-from typing import Any, Dict
-from dataclasses import dataclass
+from typing import Any, Callable, Dict
+from dataclasses import dataclass, replace
+
+from loguru import logger
 
 from wvcr.config import OAIConfig, GeminiConfig
 from wvcr.notification_manager import NotificationBackend
@@ -14,6 +16,26 @@ class RuntimeContext:
     output_dir: Path
     options: Dict[str, Any]  # CLI overrides (model, language, flags)
     services: Dict[str, Any]  # recorder, transcription, etc.
+    # Progress sink (daemon streams these to the client as NDJSON)
+    on_event: Callable[[str, Dict[str, Any]], None] | None = None
+
+    def emit(self, event: str, **payload) -> None:
+        """Report progress (step begin/end, partial text, deltas); never raises."""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, payload)
+        except Exception as e:
+            logger.debug(f"Progress listener failed on {event}: {e}")
+
+    def derive(self, **options) -> "RuntimeContext":
+        """Per-request copy: private options, shared configs/notifier/services.
+
+        None values are ignored so unset CLI args keep the defaults.
+        """
+        merged = dict(self.options)
+        merged.update({k: v for k, v in options.items() if v is not None})
+        return replace(self, options=merged)
 
     def get_stt_config(self):
         # Decide which config to use (could use options['provider'])
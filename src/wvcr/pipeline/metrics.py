@@ -0,0 +1,184 @@
+"""Process-wide pipeline metrics: step/run latency, errors, skips, bytes.
+
+Pipeline.run feeds METRICS for every step it executes, services add byte
+counts (audio uploaded, TTS audio received). In the daemon the registry
+lives as long as the process; `wvcr stats` returns snapshot() and, with
+WVCR_METRICS_FILE set, dump() writes it after each job (Prometheus text
+for *.prom, JSON otherwise).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Latency summary over a sliding window of recent samples."""
+
+    def __init__(self, window: int = 1024):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantiles(self) -> dict[float, float]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        # nearest-rank
+        return {
+            q: ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+            for q in QUANTILES
+        }
+
+    def summary(self) -> dict:
+        q = self.quantiles()
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "max": round(self.max, 4),
+            "p50": round(q[0.5], 4),
+            "p95": round(q[0.95], 4),
+            "p99": round(q[0.99], 4),
+        }
+
+
+class PipelineMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.steps: dict[tuple[str, str], Histogram] = {}
+        self.runs: dict[str, Histogram] = {}
+        self.step_errors: Counter = Counter()
+        self.step_skips: Counter = Counter()
+        self.run_errors: Counter = Counter()
+        self.bytes: Counter = Counter()
+
+    def observe_step(self, mode: str, step: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.steps.setdefault((mode, step), Histogram()).observe(seconds)
+            if not ok:
+                self.step_errors[(mode, step)] += 1
+
+    def skip_step(self, mode: str, step: str):
+        with self._lock:
+            self.step_skips[(mode, step)] += 1
+
+    def observe_run(self, mode: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.runs.setdefault(mode, Histogram()).observe(seconds)
+            if not ok:
+                self.run_errors[mode] += 1
+
+    def add_bytes(self, kind: str, n: int):
+        """Count payload bytes, e.g. "stt_upload", "llm_audio_upload", "tts_received"."""
+        if n:
+            with self._lock:
+                self.bytes[kind] += int(n)
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            for table in (self.steps, self.runs, self.step_errors,
+                          self.step_skips, self.run_errors, self.bytes):
+                table.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            modes: dict[str, dict] = {}
+            for mode, hist in self.runs.items():
+                modes.setdefault(mode, {"steps": {}})["run"] = {
+                    **hist.summary(),
+                    "errors": self.run_errors[mode],
+                }
+            for (mode, step), hist in self.steps.items():
+                modes.setdefault(mode, {"steps": {}})["steps"][step] = {
+                    **hist.summary(),
+                    "errors": self.step_errors[(mode, step)],
+                    "skips": self.step_skips[(mode, step)],
+                }
+            for (mode, step), n in self.step_skips.items():
+                steps = modes.setdefault(mode, {"steps": {}})["steps"]
+                steps.setdefault(step, {"count": 0, "errors": 0, "skips": n})
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "modes": modes,
+                "bytes": dict(self.bytes),
+            }
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        # Samples grouped per metric family, as the text format requires
+        families: dict[str, tuple[str, list[str]]] = {
+            name: (kind, [])
+            for name, kind in (
+                ("wvcr_run_seconds", "summary"),
+                ("wvcr_run_errors_total", "counter"),
+                ("wvcr_step_seconds", "summary"),
+                ("wvcr_step_errors_total", "counter"),
+                ("wvcr_step_skips_total", "counter"),
+                ("wvcr_bytes_total", "counter"),
+            )
+        }
+
+        def summary(metric: str, labels: str, s: dict):
+            out = families[metric][1]
+            for q, key in zip(QUANTILES, ("p50", "p95", "p99")):
+                out.append(f'{metric}{{{labels},quantile="{q}"}} {s[key]}')
+            out.append(f"{metric}_sum{{{labels}}} {s['sum']}")
+            out.append(f"{metric}_count{{{labels}}} {s['count']}")
+
+        for mode, data in sorted(snap["modes"].items()):
+            if "run" in data:
+                labels = f'mode="{mode}"'
+                summary("wvcr_run_seconds", labels, data["run"])
+                families["wvcr_run_errors_total"][1].append(
+                    f"wvcr_run_errors_total{{{labels}}} {data['run']['errors']}"
+                )
+            for step, s in sorted(data["steps"].items()):
+                labels = f'mode="{mode}",step="{step}"'
+                if s["count"]:
+                    summary("wvcr_step_seconds", labels, s)
+                families["wvcr_step_errors_total"][1].append(
+                    f"wvcr_step_errors_total{{{labels}}} {s['errors']}"
+                )
+                families["wvcr_step_skips_total"][1].append(
+                    f"wvcr_step_skips_total{{{labels}}} {s['skips']}"
+                )
+        for kind, n in sorted(snap["bytes"].items()):
+            families["wvcr_bytes_total"][1].append(f'wvcr_bytes_total{{kind="{kind}"}} {n}')
+
+        lines = []
+        for name, (kind, samples) in families.items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str | Path):
+        """Write metrics atomically; *.prom gets Prometheus text, anything else JSON."""
+        path = Path(path)
+        if path.suffix == ".prom":
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+METRICS = PipelineMetrics()
@@ -1,6 +1,8 @@
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List
 from loguru import logger
+from .metrics import METRICS
 from .step import Step, StepError
 from .state import WorkingState
 
@@ -18,33 +20,162 @@ class Pipeline:
 
     def run(self, state: WorkingState, ctx):
         self.validate()
-        for step in self.steps:
-            if not step.enabled(ctx, state):
-                logger.debug(f"[pipeline] Skip step {step.name}")
-                continue
-            start = time.monotonic()
-            logger.debug(f"[pipeline] Begin {step.name}")
-            try:
-                step.execute(state, ctx)
-            except StepError as e:
-                state.errors.append(f"{step.name}: {e}")
-                logger.error(f"[pipeline] {step.name} error: {e}")
-                # Send notification about the error
-                self._notify_error(ctx, step.name, str(e))
-                if not e.recoverable:
+        start = time.monotonic()
+        try:
+            if ctx.options.get("parallel_steps"):
+                return self._run_parallel(state, ctx)
+            cancel_event = ctx.options.get("cancel_event")
+            for step in self.steps:
+                if cancel_event is not None and cancel_event.is_set():
+                    state.errors.append("cancelled")
+                    logger.info(f"[pipeline] Cancelled before {step.name}")
+                    break
+                ok, _ = self._run_step(step, state, ctx)
+                if not ok:
+                    break
+            return state
+        finally:
+            METRICS.observe_run(
+                state.get("mode", "unknown"), time.monotonic() - start, ok=not state.errors
+            )
+
+    def _run_step(self, step: Step, state: WorkingState, ctx) -> tuple[bool, float]:
+        """Run one step. Returns (keep_going, duration); False stops the pipeline."""
+        if not step.enabled(ctx, state):
+            logger.debug(f"[pipeline] Skip step {step.name}")
+            ctx.emit("step_skip", step=step.name)
+            METRICS.skip_step(state.get("mode", "unknown"), step.name)
+            return True, 0.0
+        start = time.monotonic()
+        logger.debug(f"[pipeline] Begin {step.name}")
+        ctx.emit("step_begin", step=step.name)
+        failed = False
+        keep_going = True
+        try:
+            step.execute(state, ctx)
+        except StepError as e:
+            failed = True
+            state.errors.append(f"{step.name}: {e}")
+            logger.error(f"[pipeline] {step.name} error: {e}")
+            # Send notification about the error
+            self._notify_error(ctx, step.name, str(e))
+            keep_going = e.recoverable
+        except Exception as e:
+            failed = True
+            state.errors.append(f"{step.name}: {e}")
+            logger.exception(f"[pipeline] {step.name} unexpected error")
+            # Send notification about the unexpected error
+            self._notify_error(ctx, step.name, str(e))
+            keep_going = False
+        finally:
+            duration = time.monotonic() - start
+            state.timeline.append((step.name, duration))
+            logger.debug(f"[pipeline] End {step.name} ({duration:.2f}s)")
+            METRICS.observe_step(state.get("mode", "unknown"), step.name, duration, ok=not failed)
+            ctx.emit(
+                "step_end",
+                step=step.name,
+                duration=round(duration, 3),
+                ok=not failed,
+            )
+        return keep_going, duration
+
+    def dependencies(self) -> List[set]:
+        """Indices each step has to wait for when steps run concurrently.
+
+        A step waits for the latest earlier provider of every key it
+        requires or uses; a provider waits for earlier readers and providers
+        of keys it (re)writes. Steps that declare no data at all (plain
+        notifications, option tweaks) stay between their list neighbours,
+        and barrier steps wait for everything before them.
+        """
+        deps: List[set] = []
+        last_provider: dict = {}
+        readers: dict = {}
+        for i, step in enumerate(self.steps):
+            d = set()
+            inputs = step.requires | step.uses
+            for key in inputs:
+                if key in last_provider:
+                    d.add(last_provider[key])
+            for key in step.provides:
+                if key in last_provider:
+                    d.add(last_provider[key])
+                d.update(readers.get(key, ()))
+            if step.barrier:
+                d.update(range(i))
+            elif i and (_is_side_effect(step) or _is_side_effect(self.steps[i - 1])):
+                d.add(i - 1)
+            d.discard(i)
+            deps.append(d)
+            for key in inputs:
+                readers.setdefault(key, set()).add(i)
+            for key in step.provides:
+                last_provider[key] = i
+                readers[key] = set()
+        return deps
+
+    def _run_parallel(self, state: WorkingState, ctx):
+        """Run independent steps concurrently following dependencies().
+
+        Error semantics match the sequential run: a recoverable StepError
+        lets dependents continue, anything else stops scheduling new steps
+        (steps already running are allowed to finish).
+        """
+        deps = self.dependencies()
+        cancel_event = ctx.options.get("cancel_event")
+        durations: dict = {}
+        pending = list(range(len(self.steps)))
+        running: dict = {}
+        stop = False
+        wall_start = time.monotonic()
+        workers = int(ctx.options.get("step_workers", 4))
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="wvcr-step") as pool:
+            while pending or running:
+                if not stop and cancel_event is not None and cancel_event.is_set():
+                    state.errors.append("cancelled")
+                    logger.info("[pipeline] Cancelled")
+                    stop = True
+                if not stop:
+                    for i in [i for i in pending if deps[i] <= durations.keys()]:
+                        pending.remove(i)
+                        running[pool.submit(self._run_step, self.steps[i], state, ctx)] = i
+                if not running:
                     break
-            except Exception as e:
-                state.errors.append(f"{step.name}: {e}")
-                logger.exception(f"[pipeline] {step.name} unexpected error")
-                # Send notification about the unexpected error
-                self._notify_error(ctx, step.name, str(e))
-                break
-            finally:
-                duration = time.monotonic() - start
-                state.timeline.append((step.name, duration))
-                logger.debug(f"[pipeline] End {step.name} ({duration:.2f}s)")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    ok, durations[i] = future.result()
+                    if not ok:
+                        stop = True
+        wall = time.monotonic() - wall_start
+        self._record_critical_path(state, deps, durations, wall)
         return state
 
+    def _record_critical_path(self, state: WorkingState, deps, durations: dict, wall: float):
+        # Longest chain of dependent steps by measured duration
+        finish: dict = {}
+        prev: dict = {}
+        for i in sorted(durations):
+            before = [d for d in deps[i] if d in finish]
+            best = max(before, key=finish.get, default=None)
+            prev[i] = best
+            finish[i] = durations[i] + (finish[best] if best is not None else 0.0)
+        if not finish:
+            return
+        node = max(finish, key=finish.get)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(self.steps[node].name)
+            node = prev[node]
+        path.reverse()
+        state.set("critical_path", path)
+        state.set("critical_path_s", total)
+        logger.debug(
+            f"[pipeline] Wall {wall:.2f}s, critical path {total:.2f}s: {' -> '.join(path)}"
+        )
+
     def _notify_error(self, ctx, step_name: str, error_message: str):
         """Send a notification about a pipeline error."""
         try:
@@ -52,9 +183,13 @@ class Pipeline:
             max_length = 200
             if len(error_message) > max_length:
                 error_message = error_message[:max_length] + "..."
-            
+
             title = f"WVCR Error: {step_name}"
             ctx.notifier.send_notification(title, error_message, timeout=15)
         except Exception as notify_err:
             # Don't let notification errors crash the pipeline
             logger.warning(f"Failed to send error notification: {notify_err}")
+
+
+def _is_side_effect(step: Step) -> bool:
+    return not (step.requires or step.uses or step.provides)
@@ -11,7 +11,9 @@ class Step(ABC):
     name: str = "unnamed"
     requires: Set[str] = set()
     provides: Set[str] = set()
+    uses: Set[str] = set()  # optional inputs, read if some earlier step provided them
     optional: bool = False  # pipeline can drop if flagged
+    barrier: bool = False  # parallel run: wait for every earlier step
 
     @abstractmethod
     def execute(self, state, ctx):
@@ -1,13 +1,64 @@
+import re
+import time
+
 from ..step import Step
 from wvcr.services.text_processing_service import explain
 
+# Coalesce streamed tokens into one "delta" event per interval
+DELTA_INTERVAL_S = 0.05
+# Preview notification once the first sentence (or this much text) is in
+PREVIEW_MIN_CHARS = 120
+_SENTENCE_END = re.compile(r"[.!?…:](\s|$)")
+
+
 class ExplainTextStep(Step):
     name = "explain"
     requires = {"transcript"}
     provides = {"explanation"}
+    uses = {"thing"}
 
     def execute(self, state, ctx):
         config = ctx.get_stt_config()  # reuse provider selection; explain() handles different config types
         transcript = state.get("transcript")
-        explanation = explain(transcript, config, thing=state.get('thing'))
+        on_delta = None
+        stream = None
+        if ctx.options.get("stream_explain", True):
+            stream = _ExplainStream(ctx)
+            on_delta = stream.feed
+        explanation = explain(transcript, config, thing=state.get('thing'), on_delta=on_delta)
+        if stream is not None:
+            stream.flush()
         state.set("explanation", explanation)
+
+
+class _ExplainStream:
+    """Forwards streamed text as throttled "delta" events plus one early preview notification."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.text = []
+        self.pending = []
+        self.last_flush = time.monotonic()
+        self.preview_sent = not ctx.options.get("notify", True)
+
+    def feed(self, delta: str):
+        self.text.append(delta)
+        self.pending.append(delta)
+        if time.monotonic() - self.last_flush >= DELTA_INTERVAL_S:
+            self.flush()
+        if not self.preview_sent:
+            self._maybe_preview()
+
+    def flush(self):
+        if self.pending:
+            self.ctx.emit("delta", step=ExplainTextStep.name, text="".join(self.pending))
+            self.pending.clear()
+        self.last_flush = time.monotonic()
+
+    def _maybe_preview(self):
+        text = "".join(self.text)
+        if len(text) < PREVIEW_MIN_CHARS and not _SENTENCE_END.search(text):
+            return
+        self.preview_sent = True
+        # First words on screen now; NotifyTranscription shows the full answer later
+        self.ctx.notifier.send_notification("Explaining...", text.strip(), font_size="14px")
@@ -40,6 +40,7 @@ class Finalize(Step):
     """Compute and store elapsed time."""
     name = "finalize"
     requires = {"start_time"}
+    barrier = True  # elapsed time covers the whole run
 
     def execute(self, state, ctx):
         start = state.get("start_time")
@@ -3,7 +3,9 @@ from pathlib import Path
 from loguru import logger
 from google.genai import types
 
+from ..metrics import METRICS
 from ..step import Step
+from wvcr.services.file_upload import upload_if_large
 
 class LoadAudioArtifact(Step):
     name = "load_audio_artifact"
@@ -19,10 +21,6 @@ class LoadAudioArtifact(Step):
         if not audio_file.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_file}")
 
-        # Read raw audio bytes
-        with open(audio_file, "rb") as f:
-            audio_data = f.read()
-
         # Determine MIME type based on file extension
         # ADK supports various audio formats
         suffix = audio_file.suffix.lower()
@@ -31,18 +29,27 @@ class LoadAudioArtifact(Step):
             ".mp3": "audio/mp3",
             ".m4a": "audio/mp4",
             ".ogg": "audio/ogg",
+            ".opus": "audio/ogg",
             ".flac": "audio/flac",
             ".pcm": "audio/pcm",
         }
 
         mime_type = mime_type_map.get(suffix, "audio/wav")  # default to wav
 
-        # Create ADK Part using from_bytes constructor
-        audio_part = types.Part.from_bytes(data=audio_data, mime_type=mime_type)
+        # Large recordings are uploaded once and referenced by URI
+        file_uri = upload_if_large(ctx.gemini_config, audio_file, mime_type)
+        if file_uri:
+            audio_part = types.Part.from_uri(file_uri=file_uri, mime_type=mime_type)
+        else:
+            # Create ADK Part using from_bytes constructor
+            audio_data = audio_file.read_bytes()
+            audio_part = types.Part.from_bytes(data=audio_data, mime_type=mime_type)
+            METRICS.add_bytes("llm_audio_upload", len(audio_data))
 
         state.set("audio_part", audio_part)
 
         logger.info(
             f"Loaded audio artifact: {audio_file.name} "
-            f"({len(audio_data)} bytes, {mime_type})"
+            f"({audio_file.stat().st_size} bytes, {mime_type}"
+            f"{', ' + file_uri if file_uri else ''})"
         )
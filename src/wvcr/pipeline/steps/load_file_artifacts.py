@@ -5,11 +5,13 @@ from pathlib import Path
 from loguru import logger
 
 from ..step import Step, StepError
+from wvcr.services.file_upload import upload_if_large
 
 
 class LoadFileArtifacts(Step):
     name = "load_file_artifacts"
     provides = {"file_parts"}
+    uses = {"files"}
 
     def execute(self, state, ctx):
         files_str = state.get("files", "")
@@ -32,18 +34,27 @@ class LoadFileArtifacts(Step):
             if not mime_type:
                 mime_type = "application/octet-stream"
 
-            data = path.read_bytes()
-            b64_data = base64.b64encode(data).decode("utf-8")
-
-            part = {
-                "inlineData": {
-                    "mimeType": mime_type,
-                    "data": b64_data,
+            # Large files are uploaded once; repeated turns reference the URI
+            file_uri = upload_if_large(ctx.gemini_config, path, mime_type)
+            if file_uri:
+                part = {
+                    "fileData": {
+                        "mimeType": mime_type,
+                        "fileUri": file_uri,
+                    }
+                }
+            else:
+                data = path.read_bytes()
+                part = {
+                    "inlineData": {
+                        "mimeType": mime_type,
+                        "data": base64.b64encode(data).decode("utf-8"),
+                    }
                 }
-            }
             parts.append(part)
             logger.debug(
-                f"Loaded file artifact: {path} ({mime_type}, {len(data)} bytes)"
+                f"Loaded file artifact: {path} ({mime_type}, {path.stat().st_size} bytes"
+                f"{', ' + file_uri if file_uri else ''})"
             )
 
         state.set("file_parts", parts)
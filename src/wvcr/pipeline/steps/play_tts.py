@@ -48,7 +48,8 @@ class PlayTextToSpeech(Step):
             # Play audio in separate thread so we can monitor for stop key
             play_thread = threading.Thread(
                 target=tts_service.generate_and_play,
-                args=(text, output_file, provider, stop_playback)
+                args=(text, output_file, provider, stop_playback),
+                kwargs={"use_cache": not ctx.options.get("no_cache")},
             )
             play_thread.start()
             
@@ -1,18 +1,32 @@
+from ..metrics import METRICS
 from ..step import Step, StepError
+from wvcr.ipc.ipc_recorder import RecordingCancelled
 
 
 class RecordAudio(Step):
     name = "record"
     requires = {"audio_file", "audio_params"}
-    provides = {"raw_audio_meta"}
+    provides = {"raw_audio_meta", "audio_file"}  # audio_file: the recording itself
 
     def execute(self, state, ctx):
+        self._record(state, ctx)
+
+    def _record(self, state, ctx, on_segment=None):
         recorder = ctx.services["recorder"]  # existing IPCVoiceRecorder instance
         audio_file = state.get("audio_file")
         params = state.get("audio_params")
         fmt = params["format"]
         vad = params.get("vad")
-        _, duration = recorder.record(audio_file, format=fmt, vad=vad)
+        try:
+            _, duration = recorder.record(
+                audio_file,
+                format=fmt,
+                vad=vad,
+                on_segment=on_segment,
+                cancel_event=ctx.options.get("cancel_event"),
+            )
+        except RecordingCancelled as e:
+            raise StepError(str(e), recoverable=False)
 
         if duration < 3:
             raise StepError(
@@ -25,3 +39,4 @@ class RecordAudio(Step):
             "duration": duration,
         }
         state.set("raw_audio_meta", meta)
+        METRICS.add_bytes("recorded_audio", meta["size_bytes"])
@@ -18,6 +18,7 @@ SYSTEM_INSTRUCTION = (
 class RunAgenticGeminiStep(Step):
     name = "run_agentic_gemini"
     provides = {"agentic_result"}
+    uses = {"audio_part", "instruction", "file_parts"}
 
     def execute(self, state, ctx):
         config = ctx.gemini_config
@@ -75,6 +76,15 @@ class RunAgenticGeminiStep(Step):
             parts.append(types.Part(text=instruction))
 
         for fp in state.get("file_parts", []):
+            file_data = fp.get("fileData")
+            if file_data:
+                parts.append(
+                    types.Part.from_uri(
+                        file_uri=file_data["fileUri"],
+                        mime_type=file_data["mimeType"],
+                    )
+                )
+                continue
             inline = fp.get("inlineData", {})
             data = inline.get("data")
             mime_type = inline.get("mimeType")
@@ -6,6 +6,7 @@ import httpx
 from loguru import logger
 
 from ..step import Step, StepError
+from wvcr.config.clients import http_client
 
 
 def get_adk_config() -> dict:
@@ -19,6 +20,7 @@ def get_adk_config() -> dict:
 class RunAgenticStep(Step):
     name = "run_agentic"
     provides = {"agentic_result"}
+    uses = {"audio_part", "instruction", "file_parts", "session_id", "app_name"}
 
     def execute(self, state, ctx):
         cfg = get_adk_config()
@@ -30,29 +32,30 @@ class RunAgenticStep(Step):
         app_name = state.get("app_name") or cfg["app_name"]
 
         try:
-            with httpx.Client(timeout=300.0) as client:
-                self._ensure_session(client, cfg, app_name, session_id)
-
-                parts = self._build_parts(state)
-                if not parts:
-                    raise StepError("RunAgenticStep requires 'audio_part', 'instruction', or 'file_parts' in state")
-
-                payload = {
-                    "appName": app_name,
-                    "userId": cfg["user_id"],
-                    "sessionId": session_id,
-                    "newMessage": {
-                        "role": "user",
-                        "parts": parts,
-                    },
-                }
-
-                url = f"{cfg['url']}/run"
-                logger.info(f"Calling ADK API: {url} payload {payload}")
-
-                resp = client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            # Shared pooled client: keeps the connection to the ADK server warm
+            client = http_client()
+            self._ensure_session(client, cfg, app_name, session_id)
+
+            parts = self._build_parts(state)
+            if not parts:
+                raise StepError("RunAgenticStep requires 'audio_part', 'instruction', or 'file_parts' in state")
+
+            payload = {
+                "appName": app_name,
+                "userId": cfg["user_id"],
+                "sessionId": session_id,
+                "newMessage": {
+                    "role": "user",
+                    "parts": parts,
+                },
+            }
+
+            url = f"{cfg['url']}/run"
+            logger.info(f"Calling ADK API: {url} payload {payload}")
+
+            resp = client.post(url, json=payload, timeout=300.0)
+            resp.raise_for_status()
+            data = resp.json()
         except httpx.HTTPStatusError as e:
             raise StepError(f"ADK API error: {e.response.status_code} - {e.response.text}")
         except httpx.RequestError as e:
@@ -66,7 +69,7 @@ class RunAgenticStep(Step):
         url = f"{cfg['url']}/apps/{app_name}/users/{cfg['user_id']}/sessions/{session_id}"
 
         try:
-            resp = client.post(url, json={})
+            resp = client.post(url, json={}, timeout=30.0)
             if resp.status_code == 200:
                 logger.info(f"Created new session: {session_id}")
             elif resp.status_code == 409:  # Conflict = already exists
@@ -80,7 +83,17 @@ class RunAgenticStep(Step):
 
         # Audio part (from LoadAudioArtifact - types.Part object)
         audio_part = state.get("audio_part")
-        if audio_part:
+        if audio_part and audio_part.file_data:
+            # Uploaded through the Files API: reference it instead of re-sending bytes
+            parts.append(
+                {
+                    "fileData": {
+                        "mimeType": audio_part.file_data.mime_type,
+                        "fileUri": audio_part.file_data.file_uri,
+                    }
+                }
+            )
+        elif audio_part:
             parts.append(
                 {
                     "inlineData": {
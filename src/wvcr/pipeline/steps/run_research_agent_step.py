@@ -8,6 +8,7 @@ class RunResearchAgentStep(Step):
     name = "run_research_agent"
     # requires = {}
     provides = {"research_result"}
+    uses = {"audio_part", "transcript"}
 
     def execute(self, state, ctx):
         # Try audio first, fallback to text
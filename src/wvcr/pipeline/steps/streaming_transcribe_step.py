@@ -0,0 +1,51 @@
+from loguru import logger
+
+from ..step import Step
+from .record_audio import RecordAudio
+from wvcr.services.streaming_transcription import StreamingTranscriber
+from wvcr.services.transcription_service import transcribe_audio
+
+
+class RecordAudioStreaming(RecordAudio):
+    """Record audio while transcribing finished segments in the background."""
+    name = "record_streaming"
+    provides = {"raw_audio_meta", "audio_file", "stream_transcriber"}
+
+    def execute(self, state, ctx):
+        params = state.get("audio_params")
+        transcriber = StreamingTranscriber(
+            ctx.get_stt_config(),
+            language=ctx.options.get("language", "ru"),
+            rate=params.get("rate", 16000),
+            channels=params.get("channels", 1),
+            on_partial=lambda index, text: ctx.emit("partial", index=index, text=text),
+        )
+        try:
+            self._record(state, ctx, on_segment=transcriber.submit)
+        except Exception:
+            transcriber.cancel()
+            raise
+        state.set("stream_transcriber", transcriber)
+
+
+class FinishStreamingTranscription(Step):
+    """Collect the streamed segments; fall back to the whole file on failure."""
+    name = "transcribe_streaming"
+    requires = {"stream_transcriber", "audio_file"}
+    provides = {"transcript"}
+
+    def execute(self, state, ctx):
+        transcriber = state.get("stream_transcriber")
+        try:
+            transcript = transcriber.finish()
+        except Exception as e:
+            logger.warning(f"Streaming transcription failed ({e}); transcribing full recording")
+            config = ctx.get_stt_config()
+            language = ctx.options.get("language", "ru")
+            transcript = transcribe_audio(
+                state.get("audio_file"),
+                config,
+                language=language,
+                use_cache=not ctx.options.get("no_cache"),
+            )
+        state.set("transcript", transcript)
@@ -9,5 +9,10 @@ class TranscribeAudioStep(Step):
     def execute(self, state, ctx):
         config = ctx.get_stt_config()
         language = ctx.options.get("language", "ru")
-        transcript = transcribe_audio(state.get("audio_file"), config, language=language)
+        transcript = transcribe_audio(
+            state.get("audio_file"),
+            config,
+            language=language,
+            use_cache=not ctx.options.get("no_cache"),
+        )
         state.set("transcript", transcript)
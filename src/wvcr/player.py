@@ -1,16 +1,17 @@
 import wave
-import pyaudio
 from pathlib import Path
 from loguru import logger
 
 from wvcr.common import create_key_monitor
 from wvcr.config import PlayerAudioConfig
 from wvcr.notification_manager import NotificationBackend
+from wvcr.services.audio_output import AudioOutputEngine, get_audio_output
 
 
 class SpeechPlayer:
-    def __init__(self, notifier: NotificationBackend):
+    def __init__(self, notifier: NotificationBackend, audio_out: AudioOutputEngine | None = None):
         self.config = PlayerAudioConfig()
+        self.audio_out = audio_out or get_audio_output()
         self.playing = False
         self.notifier = notifier
 
@@ -23,14 +24,11 @@ class SpeechPlayer:
             return
 
         wf = wave.open(str(filename), 'rb')
-        p = pyaudio.PyAudio()
-
-        stream = p.open(
-            format=p.get_format_from_width(wf.getsampwidth()),
-            channels=wf.getnchannels(),
-            rate=wf.getframerate(),
-            output=True
-        )
+        if wf.getsampwidth() != 2:
+            logger.error(f"Only 16-bit WAV playback is supported: {filename}")
+            wf.close()
+            return
+        playback = self.audio_out.open_playback(rate=wf.getframerate(), channels=wf.getnchannels())
 
         self.playing = True
         # self._send_notification('Playback Started', 'playing')
@@ -44,11 +42,15 @@ class SpeechPlayer:
         data = wf.readframes(chunk_size)
 
         while data and self.playing:
-            stream.write(data)
+            playback.write(data)
             data = wf.readframes(chunk_size)
+        wf.close()
 
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        if self.playing:
+            playback.finish()
+            while self.playing and not playback.done.wait(0.05):
+                pass
+        playback.stop()
+        self.playing = False
         if stop_on_key:
             key_monitor.stop()
\ No newline at end of file
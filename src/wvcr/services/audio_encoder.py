@@ -0,0 +1,152 @@
+"""Incremental encoders for recorded PCM16.
+
+An encoder is opened when recording starts and fed frames as they arrive,
+so stopping only has to flush the tail instead of encoding the whole
+recording in one go.
+
+ - "wav": written in place with the wave module (header patched on close)
+ - "mp3": long-lived ffmpeg/libmp3lame reading raw PCM from stdin
+ - "ogg" / "opus": same, with libopus in an Ogg container (small voice files)
+"""
+
+from __future__ import annotations
+
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+
+from loguru import logger
+
+
+FFMPEG_CODECS = {
+    "mp3": ("libmp3lame", "mp3", []),
+    "ogg": ("libopus", "ogg", ["-application", "voip"]),
+    "opus": ("libopus", "ogg", ["-application", "voip"]),
+}
+SUPPORTED_FORMATS = ("wav", *FFMPEG_CODECS)
+
+
+class WavStreamWriter:
+    """Append PCM16 frames to a WAV file as they arrive."""
+
+    def __init__(self, output_file: Path, rate: int, channels: int):
+        self.output_file = output_file
+        self.bytes_written = 0
+        self._wf = wave.open(str(output_file), "wb")
+        self._wf.setnchannels(channels)
+        self._wf.setsampwidth(2)
+        self._wf.setframerate(rate)
+
+    def write(self, pcm) -> None:
+        self._wf.writeframesraw(pcm)
+        self.bytes_written += len(pcm)
+
+    def close(self) -> Path:
+        # wave patches the RIFF/data sizes on close
+        self._wf.close()
+        return self.output_file
+
+    def abort(self) -> None:
+        try:
+            self._wf.close()
+        except Exception:
+            pass
+
+
+class FfmpegStreamEncoder:
+    """ffmpeg process started up front; PCM goes to its stdin while recording."""
+
+    def __init__(self, output_file: Path, fmt: str, rate: int, channels: int, bitrate: str):
+        codec, container, extra = FFMPEG_CODECS[fmt]
+        self.output_file = output_file
+        self.bytes_written = 0
+        self._cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-f", "s16le",  # signed 16-bit little-endian PCM
+            "-ar", str(rate),
+            "-ac", str(channels),
+            "-i", "pipe:0",  # read from stdin
+            "-codec:a", codec,
+            "-b:a", bitrate,
+            *extra,
+            "-f", container,
+            "-y",  # overwrite output
+            str(output_file),
+        ]
+        # stderr to a file so a chatty ffmpeg can never block on a full pipe
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                self._cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except FileNotFoundError:
+            self._stderr.close()
+            logger.error(f"ffmpeg not found. Install ffmpeg to enable {fmt} saving.")
+            raise
+        self._broken = False
+
+    def write(self, pcm) -> None:
+        if self._broken:
+            return
+        try:
+            self._proc.stdin.write(pcm)
+            self.bytes_written += len(pcm)
+        except BrokenPipeError:
+            # ffmpeg exited early; close() reports its error
+            self._broken = True
+
+    def _stderr_text(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors="replace")
+
+    def close(self, timeout: float = 10.0) -> Path:
+        """Flush the tail and wait for ffmpeg to finish the file."""
+        try:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self._proc.wait(timeout=timeout)
+            if returncode != 0:
+                stderr = self._stderr_text()
+                logger.error(f"Error encoding {self.output_file.name}: {stderr}")
+                raise subprocess.CalledProcessError(returncode, self._cmd, stderr=stderr)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+            raise
+        finally:
+            self._stderr.close()
+        return self.output_file
+
+    def abort(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        self._stderr.close()
+
+
+def open_encoder(
+    output_file: Path,
+    fmt: str,
+    rate: int,
+    channels: int,
+    bitrates: dict[str, str] | None = None,
+) -> WavStreamWriter | FfmpegStreamEncoder:
+    """Open a streaming encoder for fmt ("wav", "mp3", "ogg"/"opus").
+
+    Unknown formats fall back to WAV, as recordings always have.
+    """
+    fmt = fmt.lower()
+    if fmt not in FFMPEG_CODECS:
+        if fmt != "wav":
+            logger.warning(f"Unsupported audio format {fmt!r} (expected one of {SUPPORTED_FORMATS}), saving WAV")
+        return WavStreamWriter(output_file, rate, channels)
+    bitrate = (bitrates or {}).get(fmt, "128k")
+    return FfmpegStreamEncoder(output_file, fmt, rate, channels, bitrate)
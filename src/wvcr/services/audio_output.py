@@ -0,0 +1,316 @@
+"""Long-lived audio output shared by TTS and file playback.
+
+Opening a PyAudio device per playback costs hundreds of milliseconds and
+clicks on open/close. AudioOutputEngine opens one output stream (at the
+PlayerAudioConfig rate) on first use and keeps it for the life of the
+process. Sources open a Playback, write PCM16 at their own rate and
+channel count (converted with audioop.ratecv/tomono), and playbacks are
+played one after another by a single writer thread. Writes block once
+about MAX_BUFFER_MS is queued, so producers run at playback speed and a
+stop only has to drop what is queued. Gaps inside a playback (producer
+late) are filled with silence and counted as underruns.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from loguru import logger
+
+from wvcr.config import PlayerAudioConfig
+
+try:
+    import audioop
+except ImportError:  # Python 3.13+ without the audioop-lts backport
+    audioop = None
+
+
+class Playback:
+    """One stream of audio queued on the engine (a TTS answer, a file)."""
+
+    def __init__(self, engine: "AudioOutputEngine", rate: int, channels: int):
+        self.engine = engine
+        self.rate = int(rate)
+        self.channels = int(channels)
+        self.done = threading.Event()
+        self.finished = False
+        self.stopped = False
+        self.bytes_played = 0
+        self._chunks: deque = deque()
+        self._queued = 0
+        self._pending = bytearray()
+        self._ratecv_state = None
+
+    def write(self, pcm) -> None:
+        """Queue PCM16 at this playback's rate; blocks while the buffer is full.
+
+        Audio already in the output format is queued as views of pcm, not
+        copies, so pcm must not be modified afterwards (bytes and read-only
+        mmaps are fine).
+        """
+        if self.channels != self.engine.channels or self.rate != self.engine.rate:
+            data = memoryview(self._convert(bytes(pcm)))
+        else:
+            data = memoryview(pcm).cast("B")
+        chunk = self.engine.chunk_bytes
+        if self._pending:
+            # Top up the leftover from the last write to one whole chunk
+            fill = min(chunk - len(self._pending), len(data))
+            self._pending.extend(data[:fill])
+            data = data[fill:]
+            if len(self._pending) < chunk:
+                return
+            self.engine._enqueue(self, bytes(self._pending))
+            self._pending.clear()
+        usable = len(data) - len(data) % chunk
+        if usable:
+            self.engine._enqueue(self, data[:usable])
+        self._pending.extend(data[usable:])
+
+    def _convert(self, data: bytes) -> bytes:
+        if audioop is None:
+            raise RuntimeError(
+                f"Playing {self.rate} Hz/{self.channels} ch audio on a {self.engine.rate} Hz/"
+                f"{self.engine.channels} ch output needs audioop (pip install audioop-lts)"
+            )
+        if self.channels == 2 and self.engine.channels == 1:
+            data = audioop.tomono(data, 2, 0.5, 0.5)
+        elif self.channels == 1 and self.engine.channels == 2:
+            data = audioop.tostereo(data, 2, 1, 1)
+        if self.rate != self.engine.rate:
+            data, self._ratecv_state = audioop.ratecv(
+                data, 2, self.engine.channels, self.rate, self.engine.rate, self._ratecv_state
+            )
+        return data
+
+    def finish(self) -> None:
+        """No more data: flush the tail; done is set once it has been played."""
+        if self._pending:
+            self.engine._enqueue(self, bytes(self._pending))
+            self._pending.clear()
+        self.engine._finish(self)
+
+    def stop(self) -> None:
+        """Drop everything still queued and end the playback now."""
+        self.engine._stop(self)
+
+    def wait(self, stop_event: threading.Event | None = None) -> bool:
+        """Wait until played out; a set stop_event stops it. True if played to the end."""
+        while not self.done.wait(0.05):
+            if stop_event is not None and stop_event.is_set():
+                self.stop()
+                return False
+        return not self.stopped
+
+
+class AudioOutputEngine:
+    def __init__(self, config: PlayerAudioConfig | None = None):
+        self.config = config or PlayerAudioConfig()
+        self.rate = int(self.config.RATE)
+        self.channels = int(self.config.CHANNELS)
+        self.frame_bytes = 2 * self.channels
+        self.chunk_bytes = int(self.config.CHUNK) * self.frame_bytes
+        self.max_buffer_bytes = max(
+            self.chunk_bytes * 2,
+            self.rate * self.frame_bytes * int(self.config.MAX_BUFFER_MS) // 1000,
+        )
+        self._silence = bytes(self.chunk_bytes)
+        self._cond = threading.Condition()
+        self._playbacks: deque[Playback] = deque()
+        self._closed = False
+        self._pa = None
+        self._stream = None
+        self._thread: threading.Thread | None = None
+        self.underruns = 0
+        self.chunks_written = 0
+        self.playbacks_done = 0
+
+    def open_playback(self, rate: int, channels: int = 1) -> Playback:
+        playback = Playback(self, rate, channels)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Audio output engine is closed")
+            self._start_thread()
+            self._playbacks.append(playback)
+            self._cond.notify_all()
+        return playback
+
+    def play(self, pcm, rate: int, channels: int = 1, stop_event: threading.Event | None = None) -> bool:
+        """Play a complete PCM16 buffer and wait for it. True if played to the end."""
+        playback = self.open_playback(rate, channels)
+        view = memoryview(pcm)
+        step = self.chunk_bytes
+        for offset in range(0, len(view), step):
+            if playback.stopped or (stop_event is not None and stop_event.is_set()):
+                break
+            playback.write(view[offset : offset + step])
+        playback.finish()
+        return playback.wait(stop_event)
+
+    def stop_all(self) -> None:
+        """Stop and flush every playback."""
+        with self._cond:
+            playbacks = list(self._playbacks)
+        for playback in playbacks:
+            playback.stop()
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = sum(p._queued for p in self._playbacks)
+            active = len(self._playbacks)
+        return {
+            "rate": self.rate,
+            "underruns": self.underruns,
+            "chunks_written": self.chunks_written,
+            "playbacks_done": self.playbacks_done,
+            "active_playbacks": active,
+            "queued_ms": queued * 1000 // (self.rate * self.frame_bytes),
+        }
+
+    def close(self) -> None:
+        self.stop_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        with self._cond:
+            for playback in self._playbacks:
+                playback.stopped = True
+                playback.done.set()
+            self._playbacks.clear()
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing audio output stream: {e}")
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+    # -- producer side ---------------------------------------------------
+
+    def _enqueue(self, playback: Playback, data) -> None:
+        view = memoryview(data)
+        for offset in range(0, len(view), self.chunk_bytes):
+            chunk = view[offset : offset + self.chunk_bytes]
+            with self._cond:
+                while (
+                    playback._queued >= self.max_buffer_bytes
+                    and not playback.stopped
+                    and not self._closed
+                ):
+                    self._cond.wait()
+                if playback.stopped or self._closed:
+                    return
+                playback._chunks.append(chunk)
+                playback._queued += len(chunk)
+                self._cond.notify_all()
+
+    def _finish(self, playback: Playback) -> None:
+        with self._cond:
+            playback.finished = True
+            self._cond.notify_all()
+
+    def _stop(self, playback: Playback) -> None:
+        with self._cond:
+            playback.stopped = True
+            playback._chunks.clear()
+            playback._queued = 0
+            if playback in self._playbacks and self._playbacks[0] is not playback:
+                # Not reached by the writer yet, so it would never set done
+                self._playbacks.remove(playback)
+                playback.done.set()
+            self._cond.notify_all()
+
+    # -- writer thread ---------------------------------------------------
+
+    def _start_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="wvcr-audio-out", daemon=True)
+            self._thread.start()
+
+    def _open_stream(self):
+        if self._stream is None:
+            import pyaudio
+
+            self._pa = pyaudio.PyAudio()
+            self._stream = self._pa.open(
+                format=pyaudio.paInt16,
+                channels=self.channels,
+                rate=self.rate,
+                output=True,
+                frames_per_buffer=int(self.config.CHUNK),
+            )
+            logger.debug(f"Audio output opened at {self.rate} Hz, {self.channels} ch")
+        elif self._stream.is_stopped():
+            self._stream.start_stream()
+        return self._stream
+
+    def _next_chunk(self):
+        """Next chunk to play, or None when idle. Called with the lock held."""
+        while not self._closed:
+            if not self._playbacks:
+                if self._stream is not None and not self._stream.is_stopped():
+                    # Idle: stop (not close) so the device is not clocked with nothing
+                    self._stream.stop_stream()
+                self._cond.wait()
+                continue
+            head = self._playbacks[0]
+            if head._chunks:
+                chunk = head._chunks.popleft()
+                head._queued -= len(chunk)
+                head.bytes_played += len(chunk)
+                self._cond.notify_all()
+                return chunk
+            if head.finished or head.stopped:
+                self._playbacks.popleft()
+                self.playbacks_done += 1
+                head.done.set()
+                continue
+            if head.bytes_played:
+                # Mid-playback and the producer is late: keep the device fed
+                self.underruns += 1
+                return self._silence
+            # Nothing played yet: wait for the first data without starting the device
+            self._cond.wait(0.05)
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                chunk = self._next_chunk()
+            if chunk is None:
+                return
+            try:
+                self._open_stream().write(bytes(chunk))
+                self.chunks_written += 1
+            except Exception as e:
+                logger.error(f"Audio output write failed: {e}")
+                self.stop_all()
+                self._reset_stream()
+
+    def _reset_stream(self) -> None:
+        # Reopen on next write (device unplugged, server restarted, ...)
+        try:
+            if self._stream is not None:
+                self._stream.close()
+        except Exception:
+            pass
+        self._stream = None
+
+
+_engine: AudioOutputEngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_audio_output() -> AudioOutputEngine:
+    """Process-wide output engine (created on first use)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioOutputEngine()
+        return _engine
@@ -0,0 +1,132 @@
+"""Small content-addressed disk cache with LRU eviction by total size.
+
+Entries are plain files named by key (fanned out by the first two hex
+chars). Reads bump the file mtime, so mtime order is recency order and
+eviction just removes the oldest files until the cache is back under
+its size budget. Writes go through a temp file + rename, so concurrent
+readers never see a partial entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """sha256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_key(*parts) -> str:
+    """Stable key from arbitrary parts (joined with NUL, then sha256)."""
+    return hashlib.sha256("\0".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, root: Path, max_bytes: int, suffix: str = ".bin"):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._size: int | None = None  # computed lazily on first write
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def get_path(self, key: str) -> Path | None:
+        """Path of a cached entry (marked as recently used), or None."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str) -> bytes | None:
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted between utime and read
+            return None
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            old = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - old
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    def _entries(self) -> list[os.DirEntry]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.is_file() and entry.name.endswith(self.suffix):
+                    entries.append(entry)
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict(self):
+        # Drop least recently used entries down to 90% of the budget
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        size = sum(e.stat().st_size for e in entries)
+        removed = 0
+        for entry in entries:
+            if size <= target:
+                break
+            try:
+                st_size = entry.stat().st_size
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            size -= st_size
+            removed += 1
+        self._size = size
+        if removed:
+            logger.debug(f"Cache {self.root.name}: evicted {removed} entries, {size} bytes left")
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries():
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
@@ -0,0 +1,247 @@
+"""Upload large artifacts once through the Gemini Files API and reuse them.
+
+Inline parts re-send (and for ADK, base64-inflate) the same bytes on
+every request. ArtifactUploader uploads files above a size threshold,
+remembers the returned file URI by content hash in a small JSON index,
+and hands out URI references until shortly before the file expires on
+the provider side (Gemini keeps uploads for 48 h). Uploads belong to the
+API key that made them, so the index is keyed by key and content. Small files stay
+inline, where a separate upload round trip would not pay off.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from wvcr.config import OUTPUT
+from wvcr.pipeline.metrics import METRICS
+from wvcr.services.disk_cache import hash_file
+
+
+UPLOAD_INDEX = OUTPUT / "cache" / "uploads.json"
+UPLOADS_ENABLED = os.getenv("WVCR_FILE_UPLOADS", "true").lower() in ("1", "true", "yes")
+UPLOAD_MIN_BYTES = int(os.getenv("WVCR_UPLOAD_MIN_KB", "4096")) * 1024
+# Used when the API does not report an expiration time
+DEFAULT_TTL_S = 47 * 3600
+# Stop handing out a URI this long before it expires
+EXPIRY_MARGIN_S = 15 * 60
+ACTIVE_TIMEOUT_S = 120.0
+
+_uploaders: dict[str, "ArtifactUploader"] = {}
+_uploaders_lock = threading.Lock()
+_index: "UploadIndex | None" = None
+
+
+def _timestamp(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _state_name(file: Any) -> str:
+    state = getattr(file, "state", None)
+    return str(getattr(state, "name", state) or "")
+
+
+class UploadIndex:
+    """File URIs by (API key, content hash), shared by all uploaders in the process.
+
+    Uploads are only visible to the key that made them, so entries are
+    keyed by a hash of the API key plus the content hash; one index (and
+    one lock) per file keeps uploaders for different keys from
+    overwriting each other's entries.
+    """
+
+    def __init__(self, path: Path = UPLOAD_INDEX):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self._entries: dict[str, dict] | None = None
+
+    def lookup(self, key: str) -> dict | None:
+        with self.lock:
+            entry = self._load().get(key)
+            if entry is None:
+                return None
+            if entry.get("expires_at", 0) - EXPIRY_MARGIN_S <= time.time():
+                del self._entries[key]
+                self._save()
+                return None
+            return entry
+
+    def store(self, key: str, entry: dict) -> None:
+        with self.lock:
+            self._load()[key] = entry
+            self._purge_expired()
+            self._save()
+
+    def remove(self, key: str) -> None:
+        with self.lock:
+            if self._load().pop(key, None) is not None:
+                self._save()
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable upload index {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _purge_expired(self):
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if e.get("expires_at", 0) <= now]:
+            del self._entries[key]
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._entries, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save upload index: {e}")
+
+
+class ArtifactUploader:
+    def __init__(
+        self,
+        client: Any,
+        api_key: str,
+        index: UploadIndex | None = None,
+        min_bytes: int = UPLOAD_MIN_BYTES,
+    ):
+        self.client = client
+        self.key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.index = index or _shared_index()
+        self.min_bytes = int(min_bytes)
+        self._lock = threading.Lock()
+        # Serialize uploads per content hash so parallel steps don't upload
+        # twice: digest -> [lock, number of callers holding or waiting on it]
+        self._pending: dict[str, list] = {}
+
+    def should_upload(self, path: Path) -> bool:
+        return UPLOADS_ENABLED and path.stat().st_size >= self.min_bytes
+
+    def file_uri(self, path: Path, mime_type: str) -> str:
+        """URI of an active upload of path's content, uploading it if needed."""
+        digest = hash_file(path)
+        with self._lock:
+            pending = self._pending.setdefault(digest, [threading.Lock(), 0])
+            pending[1] += 1
+        try:
+            with pending[0]:
+                entry = self.index.lookup(self._key(digest))
+                if entry is not None:
+                    logger.debug(f"Reusing uploaded {path.name}: {entry['uri']}")
+                    METRICS.add_bytes("file_upload_reused", path.stat().st_size)
+                    return entry["uri"]
+                return self._upload(digest, path, mime_type)
+        finally:
+            with self._lock:
+                pending[1] -= 1
+                if not pending[1]:
+                    del self._pending[digest]
+
+    def forget(self, path: Path) -> None:
+        """Drop the cached URI for path's content (e.g. the provider rejected it)."""
+        self.index.remove(self._key(hash_file(path)))
+
+    def _key(self, digest: str) -> str:
+        return f"{self.key_id}:{digest}"
+
+    def _upload(self, digest: str, path: Path, mime_type: str) -> str:
+        start = time.monotonic()
+        size = path.stat().st_size
+        file = self.client.files.upload(file=str(path), config={"mime_type": mime_type})
+        file = self._wait_active(file)
+        METRICS.add_bytes("file_upload", size)
+        expires_at = _timestamp(getattr(file, "expiration_time", None)) or time.time() + DEFAULT_TTL_S
+        self.index.store(
+            self._key(digest),
+            {
+                "uri": file.uri,
+                "name": file.name,
+                "mime_type": mime_type,
+                "expires_at": expires_at,
+            },
+        )
+        logger.info(
+            f"Uploaded {path.name} ({size} bytes) in {time.monotonic() - start:.1f}s: {file.uri}"
+        )
+        return file.uri
+
+    def _wait_active(self, file: Any) -> Any:
+        # Audio/video are processed before they can be referenced
+        deadline = time.monotonic() + ACTIVE_TIMEOUT_S
+        while _state_name(file) == "PROCESSING":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Upload {file.name} still processing after {ACTIVE_TIMEOUT_S:.0f}s")
+            time.sleep(1.0)
+            file = self.client.files.get(name=file.name)
+        if _state_name(file) == "FAILED":
+            raise RuntimeError(f"Upload {file.name} failed processing")
+        return file
+
+
+def _shared_index() -> UploadIndex:
+    global _index
+    with _uploaders_lock:
+        if _index is None:
+            _index = UploadIndex()
+        return _index
+
+
+def get_uploader(config: Any) -> ArtifactUploader | None:
+    """Uploader for a GeminiConfig (one per API key), or None if unavailable."""
+    if config is None or getattr(config, "provider", None) != "gemini" or not config.api_key:
+        return None
+    index = _shared_index()
+    with _uploaders_lock:
+        uploader = _uploaders.get(config.api_key)
+        if uploader is None:
+            uploader = _uploaders[config.api_key] = ArtifactUploader(
+                config.get_client(), config.api_key, index
+            )
+        return uploader
+
+
+def upload_if_large(config: Any, path: Path, mime_type: str) -> str | None:
+    """File URI for path when it is worth uploading, else None (send inline).
+
+    Upload failures are logged and fall back to inline data.
+    """
+    uploader = get_uploader(config)
+    if uploader is None or not uploader.should_upload(path):
+        return None
+    try:
+        return uploader.file_uri(path, mime_type)
+    except Exception as e:
+        logger.warning(f"File upload of {path.name} failed, sending inline: {e}")
+        return None
+
+
+def forget_upload(config: Any, path: Path) -> None:
+    """Stop reusing path's upload, so the next attempt uploads it afresh."""
+    uploader = get_uploader(config)
+    if uploader is not None:
+        try:
+            uploader.forget(path)
+        except OSError as e:
+            logger.debug(f"Failed to forget upload of {path.name}: {e}")
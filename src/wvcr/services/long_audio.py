@@ -0,0 +1,353 @@
+"""Map-reduce transcription for long recordings.
+
+A single upload of an hour-long file runs into provider payload limits
+and is one serial request. Instead the audio is decoded to 16 kHz mono
+PCM in a mmapped temp file, cut at the quietest point near every
+SEGMENT_S boundary (scored with the Silero VAD, or frame energy as a
+fallback), and the segments
+(with OVERLAP_S of audio shared across each cut) are encoded and
+transcribed concurrently on a bounded pool. Results are cleaned of
+timestamps, the text repeated across overlaps is dropped, and the parts
+are joined in order.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from loguru import logger
+
+from wvcr.services.audio_encoder import open_encoder
+from wvcr.services.vad import StreamingSileroVAD, frame_energies
+
+
+RATE = 16000
+FRAME_SAMPLES = StreamingSileroVAD.FRAME_SAMPLES
+FRAME_S = FRAME_SAMPLES / RATE
+BYTES_PER_S = RATE * 2
+
+# Files longer than this go through the segmented path
+LONG_AUDIO_MIN_S = float(os.getenv("WVCR_LONG_AUDIO_MIN_S", "600"))
+SEGMENT_S = float(os.getenv("WVCR_LONG_AUDIO_SEGMENT_S", "240"))
+OVERLAP_S = float(os.getenv("WVCR_LONG_AUDIO_OVERLAP_S", "1.5"))
+WORKERS = int(os.getenv("WVCR_LONG_AUDIO_WORKERS", "4"))
+SEGMENT_BITRATE = "64k"
+
+# How far around a target boundary to look for a pause, and the pause width
+SEARCH_S = 20.0
+PAUSE_S = 0.4
+MAX_OVERLAP_WORDS = 40
+# Lowest bitrate we expect from a real recording (bytes/s); a smaller file
+# cannot be LONG_AUDIO_MIN_S long, so it is never probed
+MIN_BYTES_PER_S = 6000 // 8
+
+# Layer III bitrates (kbps) for MPEG-1 and MPEG-2/2.5 frame headers
+_MP3_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+_vad: StreamingSileroVAD | None = None
+_vad_failed = False
+_vad_lock = threading.Lock()
+
+
+def _mp3_duration(audio_file: Path) -> float | None:
+    """Duration of a CBR MP3 from its first frame header and the file size."""
+    size = audio_file.stat().st_size
+    with audio_file.open("rb") as f:
+        head = f.read(64 * 1024)
+    offset = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        offset = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+    if offset + 4 > len(head) or head[offset] != 0xFF or head[offset + 1] & 0xE0 != 0xE0:
+        return None
+    if b"Xing" in head[offset : offset + 64] or b"VBRI" in head[offset : offset + 64]:
+        return None  # VBR: the first frame's bitrate says nothing about the rest
+    version = (head[offset + 1] >> 3) & 3
+    bitrate_idx = head[offset + 2] >> 4
+    if version == 1 or bitrate_idx in (0, 15):
+        return None
+    bitrate = _MP3_BITRATES[version == 3][bitrate_idx] * 1000
+    return (size - offset) * 8 / bitrate
+
+
+def _ogg_opus_duration(audio_file: Path) -> float | None:
+    """Duration of Ogg Opus from the last page's granule position (always 48 kHz)."""
+    size = audio_file.stat().st_size
+    with audio_file.open("rb") as f:
+        head = f.read(64)
+        f.seek(max(0, size - 64 * 1024))
+        tail = f.read()
+    if head[28:36] != b"OpusHead":
+        return None
+    pre_skip = int.from_bytes(head[38:40], "little")
+    page = tail.rfind(b"OggS")
+    if page < 0 or page + 14 > len(tail):
+        return None
+    granule = int.from_bytes(tail[page + 6 : page + 14], "little", signed=True)
+    return max(0, granule - pre_skip) / 48000.0 if granule >= 0 else None
+
+
+def header_duration(audio_file: Path) -> float | None:
+    """Duration read from the file itself (wav, CBR mp3, Ogg Opus), no subprocess."""
+    suffix = audio_file.suffix.lower()
+    try:
+        if suffix == ".wav":
+            with wave.open(str(audio_file), "rb") as wf:
+                return wf.getnframes() / float(wf.getframerate())
+        if suffix == ".mp3":
+            return _mp3_duration(audio_file)
+        if suffix in (".ogg", ".opus"):
+            return _ogg_opus_duration(audio_file)
+    except (OSError, EOFError, wave.Error):
+        pass
+    return None
+
+
+def probe_duration(audio_file: Path) -> float | None:
+    """Duration in seconds from the header or ffprobe, or None if it cannot be determined."""
+    duration = header_duration(audio_file)
+    if duration is not None:
+        return duration
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(audio_file),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        )
+        return float(result.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        logger.debug(f"ffprobe failed for {audio_file.name}: {e}")
+        return None
+
+
+@contextmanager
+def decoded_pcm(audio_file: Path) -> Iterator[mmap.mmap | bytes]:
+    """Decode any ffmpeg-readable file to 16 kHz mono PCM16, mapped from disk.
+
+    ffmpeg writes the PCM to a temp file that is mmapped read-only, so an
+    hour of audio (~115 MB) is paged in as segments are read instead of
+    being held in memory. The file is removed on exit.
+    """
+    fd, name = tempfile.mkstemp(prefix="wvcr_long_", suffix=".pcm")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-v", "error", "-y", "-i", str(audio_file),
+                "-f", "s16le", "-ac", "1", "-ar", str(RATE), name,
+            ],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            check=True,
+        )
+        if not os.fstat(fd).st_size:
+            yield b""  # mmap cannot map an empty file
+            return
+        pcm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            yield pcm
+        finally:
+            try:
+                pcm.close()
+            except BufferError:
+                # A slice is still alive (e.g. in a propagating traceback);
+                # the mapping is released with it
+                pass
+    finally:
+        os.close(fd)
+        os.unlink(name)
+
+
+def speech_scores(pcm) -> list[float]:
+    """Per-frame speech score (higher = more speech) of a PCM16 stretch."""
+    global _vad, _vad_failed
+    with _vad_lock:
+        if not _vad_failed:
+            try:
+                if _vad is None:
+                    _vad = StreamingSileroVAD()
+                return _vad.score(pcm, RATE)
+            except Exception as e:
+                _vad_failed = True
+                logger.warning(f"Silero scoring unavailable ({e}); using frame energy")
+    return [float(e) for e in frame_energies(pcm, FRAME_SAMPLES)]
+
+
+def find_cuts(
+    n_frames: int,
+    score: Callable[[int, int], list[float]],
+    segment_s: float = SEGMENT_S,
+) -> list[int]:
+    """Frame indices to cut at: the quietest pause near every segment_s boundary.
+
+    score(lo, hi) returns per-frame speech scores for frames [lo, hi); only
+    the search windows around the boundaries are scored, not the whole file.
+    """
+    seg = max(1, int(segment_s / FRAME_S))
+    search = min(int(SEARCH_S / FRAME_S), seg // 4)
+    width = max(1, int(PAUSE_S / FRAME_S))
+
+    cuts = []
+    last = 0
+    while n_frames - last > seg + search:
+        target = last + seg
+        lo = max(last + 1, target - search)
+        hi = min(n_frames, target + search + width)
+        prefix = [0.0]
+        for s in score(lo, hi):
+            prefix.append(prefix[-1] + s)
+        if len(prefix) <= width:
+            cut = target
+        else:
+            # Window of `width` frames with the least speech; cut in its middle
+            best = min(range(len(prefix) - width), key=lambda i: prefix[i + width] - prefix[i])
+            cut = lo + best + width // 2
+        cuts.append(cut)
+        last = cut
+    return cuts
+
+
+def plan_segments(
+    total_s: float, cuts_s: list[float], overlap_s: float = OVERLAP_S
+) -> list[tuple[float, float]]:
+    """(start, end) seconds per segment, each extended by overlap_s across its cuts."""
+    bounds = [0.0, *cuts_s, total_s]
+    return [
+        (max(0.0, start - overlap_s if i else start), min(total_s, end + overlap_s))
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _norm(word: str) -> str:
+    return "".join(_WORD_RE.findall(word.lower()))
+
+
+def dedupe_overlap(prev: str, text: str, max_words: int = MAX_OVERLAP_WORDS) -> str:
+    """Drop the head of `text` that repeats the tail of `prev` (overlap audio)."""
+    prev_words = [_norm(w) for w in prev.split()[-max_words:]]
+    words = text.split()
+    head = [_norm(w) for w in words[:max_words]]
+    for k in range(min(len(prev_words), len(head)), 0, -1):
+        if prev_words[-k:] == head[:k] and any(head[:k]):
+            return " ".join(words[k:])
+    return text
+
+
+def join_segments(parts: list[str]) -> str:
+    out: list[str] = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        if out:
+            part = dedupe_overlap(out[-1], part)
+        if part:
+            out.append(part)
+    return " ".join(out)
+
+
+def transcribe_long_audio(
+    audio_file: Path,
+    transcribe: Callable[[Path], str],
+    workers: int = WORKERS,
+    segment_s: float = SEGMENT_S,
+) -> str:
+    """Split audio_file on pauses and transcribe the segments concurrently.
+
+    `transcribe` takes a segment file and returns its raw text; it is called
+    from worker threads. Any segment failure fails the whole transcription.
+    """
+    with decoded_pcm(audio_file) as pcm, memoryview(pcm) as view:
+        return _transcribe_pcm(audio_file, view, transcribe, workers, segment_s)
+
+
+def _transcribe_pcm(
+    audio_file: Path,
+    pcm: memoryview,
+    transcribe: Callable[[Path], str],
+    workers: int,
+    segment_s: float,
+) -> str:
+    from wvcr.services.transcription_service import strip_timestamps
+
+    total_s = len(pcm) / BYTES_PER_S
+    frame_bytes = FRAME_SAMPLES * 2
+    cuts = find_cuts(
+        len(pcm) // frame_bytes,
+        lambda lo, hi: speech_scores(pcm[lo * frame_bytes : hi * frame_bytes]),
+        segment_s,
+    )
+    cuts_s = [c * FRAME_S for c in cuts]
+    segments = plan_segments(total_s, cuts_s)
+    logger.info(
+        f"Long audio {audio_file.name}: {total_s:.0f}s -> {len(segments)} segments, "
+        f"{min(workers, len(segments))} workers"
+    )
+
+    def run(index: int, start: float, end: float) -> str:
+        fd, name = tempfile.mkstemp(prefix=f"wvcr_long{index:03d}_", suffix=".mp3")
+        os.close(fd)
+        path = Path(name)
+        try:
+            a = int(start * RATE) * 2
+            b = int(end * RATE) * 2
+            encoder = open_encoder(path, "mp3", RATE, 1, {"mp3": SEGMENT_BITRATE})
+            # Released here so the mapping can be closed once all segments are done
+            with pcm[a:b] as segment:
+                try:
+                    encoder.write(segment)
+                except BaseException:
+                    encoder.abort()
+                    raise
+            encoder.close()
+            text = strip_timestamps(transcribe(path)).strip()
+        finally:
+            path.unlink(missing_ok=True)
+        logger.debug(f"[long] segment #{index} {start:.0f}-{end:.0f}s: {len(text)} chars")
+        return text
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(segments))), thread_name_prefix="wvcr-long"
+    ) as pool:
+        futures = [pool.submit(run, i, s, e) for i, (s, e) in enumerate(segments)]
+        try:
+            parts = [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+    return join_segments(parts)
+
+
+def is_long_audio(audio_file: Path, min_s: float = LONG_AUDIO_MIN_S) -> bool:
+    if min_s <= 0:
+        return False
+    try:
+        if audio_file.stat().st_size < min_s * MIN_BYTES_PER_S:
+            return False
+    except OSError:
+        return False
+    duration = probe_duration(audio_file)
+    return duration is not None and duration > min_s
+
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from wvcr.services.transcription_service import transcribe_audio
+
+
+class StreamingTranscriber:
+    """Transcribe PCM segments in the background while recording continues.
+
+    The recorder hands over VAD-segmented chunks via submit(); each one is
+    written to a small temporary WAV and sent through transcribe_audio on a
+    worker thread. finish() waits for whatever is still in flight (usually
+    only the last segment) and stitches the partial transcripts in order.
+    """
+
+    def __init__(
+        self,
+        config: Any,
+        language: str = "ru",
+        rate: int = 16000,
+        channels: int = 1,
+        max_workers: int = 2,
+        on_partial: Callable[[int, str], None] | None = None,
+    ):
+        self.config = config
+        self.language = language
+        self.rate = rate
+        self.channels = channels
+        self.on_partial = on_partial
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="wvcr-stt"
+        )
+        self._futures: list[Future] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, pcm: bytes) -> None:
+        if not pcm:
+            return
+        with self._lock:
+            if self._closed:
+                logger.warning("StreamingTranscriber already finished; dropping segment")
+                return
+            index = len(self._futures)
+            self._futures.append(self._executor.submit(self._transcribe_segment, index, pcm))
+        seconds = len(pcm) / (self.rate * self.channels * 2)
+        logger.debug(f"[stream] queued segment #{index} ({seconds:.1f}s)")
+
+    def finish(self, timeout: float | None = None) -> str:
+        """Wait for pending segments and return the stitched transcript.
+
+        Raises the first segment error so the caller can fall back to
+        transcribing the complete recording.
+        """
+        with self._lock:
+            self._closed = True
+            futures = list(self._futures)
+        try:
+            parts = [f.result(timeout=timeout) for f in futures]
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        return stitch_transcripts(parts)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _transcribe_segment(self, index: int, pcm: bytes) -> str:
+        fd, name = tempfile.mkstemp(prefix=f"wvcr_seg{index:03d}_", suffix=".wav")
+        os.close(fd)
+        path = Path(name)
+        try:
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(self.channels)
+                wf.setsampwidth(2)
+                wf.setframerate(self.rate)
+                wf.writeframes(pcm)
+            # Segments are one-off temp files; caching them would only churn the cache
+            text = transcribe_audio(
+                path, self.config, language=self.language, use_cache=False
+            ).strip()
+        finally:
+            path.unlink(missing_ok=True)
+        logger.debug(f"[stream] segment #{index} transcribed ({len(text)} chars)")
+        if self.on_partial is not None:
+            try:
+                self.on_partial(index, text)
+            except Exception as e:
+                logger.debug(f"[stream] on_partial callback failed: {e}")
+        return text
+
+
+def stitch_transcripts(parts: list[str]) -> str:
+    return " ".join(p.strip() for p in parts if p and p.strip())
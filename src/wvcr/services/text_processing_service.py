@@ -1,5 +1,6 @@
 import re
 from pathlib import Path
+from typing import Callable
 from PIL import Image
 from io import BytesIO
 import base64
@@ -44,7 +45,7 @@ def answer_question(transcript: str, config: OAIConfig) -> str:
         messages.add_message("user", transcript)
         messages._print()
         
-        response = config.client.chat.completions.create(
+        response = config.get_client().chat.completions.create(
             model=config.GPT_MODEL,
             temperature=config.temperature,
             messages=messages.get_messages()
@@ -55,7 +56,13 @@ def answer_question(transcript: str, config: OAIConfig) -> str:
         return transcript
 
 
-def explain(transcript: str, config: OAIConfig | GeminiConfig, thing) -> str:
+def explain(
+    transcript: str,
+    config: OAIConfig | GeminiConfig,
+    thing,
+    on_delta: Callable[[str], None] | None = None,
+) -> str:
+    """Answer with context; with on_delta the response is streamed chunk by chunk."""
     logger.info(f"Explaining with context: {transcript}")
     messages = Messages()
     messages.clear_history()
@@ -100,16 +107,36 @@ def explain(transcript: str, config: OAIConfig | GeminiConfig, thing) -> str:
     messages._print()
 
     if isinstance(config, OAIConfig):
-        return explain_oai(messages, config)
+        return explain_oai(messages, config, on_delta)
     elif isinstance(config, GeminiConfig):
-        return explain_gemini(messages, config)
+        return explain_gemini(messages, config, on_delta)
     return ""
 
 
-def explain_oai(messages, config: OAIConfig) -> str:
+def explain_oai(messages, config: OAIConfig, on_delta: Callable[[str], None] | None = None) -> str:
     client = config.get_client()
 
     try:
+        if on_delta is not None:
+            stream = client.chat.completions.create(
+                model=config.EXPLAIN_MODEL,
+                reasoning_effort='minimal',
+                messages=messages.to_oai(),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            chunks = []
+            for chunk in stream:
+                if chunk.usage:
+                    logger.debug(f"Response usage: {chunk.usage}")
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    on_delta(delta)
+            return "".join(chunks)
+
         response = client.chat.completions.create(
             model=config.EXPLAIN_MODEL,
             # temperature=config.temperature,
@@ -123,7 +150,7 @@ def explain_oai(messages, config: OAIConfig) -> str:
         return ""
 
 
-def explain_gemini(messages, config: GeminiConfig) -> str:
+def explain_gemini(messages, config: GeminiConfig, on_delta: Callable[[str], None] | None = None) -> str:
     from google.genai import types
 
     client = config.get_client()
@@ -153,14 +180,31 @@ def explain_gemini(messages, config: GeminiConfig) -> str:
         
         logger.debug(f"Sending {len(parts)} parts to Gemini for explanation")
         
+        generate_config = types.GenerateContentConfig(
+            temperature=config.temperature,
+            thinking_config=types.ThinkingConfig(
+                thinking_level=types.ThinkingLevel.LOW,
+            )
+        )
+
+        if on_delta is not None:
+            chunks = []
+            for chunk in client.models.generate_content_stream(
+                model=config.EXPLAIN_MODEL,
+                config=generate_config,
+                contents=parts,
+            ):
+                delta = getattr(chunk, "text", None)
+                if delta:
+                    chunks.append(delta)
+                    on_delta(delta)
+            text = "".join(chunks)
+            logger.debug(f"Gemini explanation streamed {len(text)} chars in {len(chunks)} chunks")
+            return text.strip()
+
         response = client.models.generate_content(
             model=config.EXPLAIN_MODEL,
-            config=types.GenerateContentConfig(
-                temperature=config.temperature,
-                thinking_config=types.ThinkingConfig(
-                    thinking_level=types.ThinkingLevel.LOW,
-                )
-            ),
+            config=generate_config,
             contents=parts,
         )
         
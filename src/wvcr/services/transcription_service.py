@@ -1,10 +1,16 @@
+import hashlib
+import os
 import re
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
-from wvcr.config import GeminiConfig, OAIConfig
+from wvcr.config import OUTPUT, GeminiConfig, OAIConfig
+from wvcr.pipeline.metrics import METRICS
+from wvcr.services.disk_cache import DiskCache, hash_file, make_key
+from wvcr.services.file_upload import forget_upload, upload_if_large
+from wvcr.services.long_audio import is_long_audio, transcribe_long_audio
 
 
 TRANSCRIBE_PROMPT = (
@@ -29,24 +35,84 @@ TRANSCRIBE_PROMPT = (
 _TIMESTAMP_RE = re.compile(r"\s?(?<!\d)\d{1,2}:\d{2}(?!\d)")
 
 
+# Part of the cache key: editing the prompt invalidates cached transcripts
+PROMPT_VERSION = hashlib.sha256(TRANSCRIBE_PROMPT.encode("utf-8")).hexdigest()[:12]
+TRANSCRIPT_CACHE_DIR = OUTPUT / "cache" / "transcripts"
+TRANSCRIPT_CACHE_MB = int(os.getenv("WVCR_TRANSCRIPT_CACHE_MB", "64"))
+
+_transcript_cache: DiskCache | None = None
+
+
 def strip_timestamps(text: str) -> str:
     return _TIMESTAMP_RE.sub("", text)
 
-def transcribe_audio(audio_file: Path, config: OAIConfig | GeminiConfig | Any, language: str = "ru") -> str:
+
+def get_transcript_cache() -> DiskCache:
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = DiskCache(
+            TRANSCRIPT_CACHE_DIR, max_bytes=TRANSCRIPT_CACHE_MB * 1024 * 1024, suffix=".txt"
+        )
+    return _transcript_cache
+
+
+def transcript_cache_key(audio_file: Path, config: Any, language: str) -> str:
+    """Audio content hash + provider, model, language and prompt version."""
+    return make_key(
+        hash_file(audio_file),
+        getattr(config, "provider", None),
+        getattr(config, "STT_MODEL", None),
+        language,
+        PROMPT_VERSION,
+    )
+
+
+def transcribe_audio(
+    audio_file: Path,
+    config: OAIConfig | GeminiConfig | Any,
+    language: str = "ru",
+    use_cache: bool = True,
+) -> str:
+    """Transcribe a file; identical audio with the same settings is served from cache."""
     provider = getattr(config, "provider", None)
+    key = None
+    if use_cache:
+        try:
+            key = transcript_cache_key(audio_file, config, language)
+            cached = get_transcript_cache().get(key)
+        except OSError as e:
+            logger.warning(f"Transcript cache unavailable: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(f"Transcript cache hit for {audio_file.name} (provider={provider})")
+            return cached.decode("utf-8")
+
     logger.info(f"Transcribing with provider={provider}")
 
-    try:
+    def transcribe_file(path: Path) -> str:
+        METRICS.add_bytes("stt_upload", path.stat().st_size)
         if provider == "openai":
-            text = transcribe_oai(audio_file, config, language)
-        elif provider == "gemini":
-            text = transcribe_gemini(audio_file, config, language)
+            return transcribe_oai(path, config, language)
+        if provider == "gemini":
+            return transcribe_gemini(path, config, language)
+        raise TypeError( f"Unsupported provider: {provider} (config type={type(config)})")
+
+    try:
+        if is_long_audio(audio_file):
+            # Too long for one request: split on pauses, transcribe segments in parallel
+            # (segments are cleaned of timestamps before their overlaps are merged)
+            text = transcribe_long_audio(audio_file, transcribe_file)
         else:
-            raise TypeError( f"Unsupported provider: {provider} (config type={type(config)})")
+            text = strip_timestamps(transcribe_file(audio_file))
     except Exception as e:
         raise Exception(f"Transcription failed: {e}") from e
 
-    return strip_timestamps(text)
+    if key is not None and text.strip():
+        try:
+            get_transcript_cache().put(key, text.encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Failed to cache transcript: {e}")
+    return text
 
 
 def transcribe_oai(audio_file: Path, config: OAIConfig, language: str = "ru") -> str:
@@ -85,30 +151,40 @@ def transcribe_gemini(
         ".mpeg": "audio/mpeg",
         ".wav": "audio/wav",
         ".ogg": "audio/ogg",
+        ".opus": "audio/ogg",
         ".m4a": "audio/mp4",
         ".mp4": "audio/mp4",
         ".webm": "audio/webm",
     }
     mime_type = mime_map.get(ext, "application/octet-stream")
 
-    with open(audio_file, "rb") as f:
-        audio_bytes = f.read()
-
+    # Large files go through the Files API once; retries reuse the URI
+    file_uri = upload_if_large(config, audio_file, mime_type)
+    if file_uri:
+        audio_part = types.Part.from_uri(file_uri=file_uri, mime_type=mime_type)
+    else:
+        audio_part = types.Part.from_bytes(data=audio_file.read_bytes(), mime_type=mime_type)
 
     logger.debug("sending audio to Gemini for transcription")
-    response = client.models.generate_content(
-        model=config.STT_MODEL,
-        config=types.GenerateContentConfig(
-            temperature=config.temperature,
-            thinking_config=types.ThinkingConfig(
-                thinking_level=types.ThinkingLevel.LOW,
+    try:
+        response = client.models.generate_content(
+            model=config.STT_MODEL,
+            config=types.GenerateContentConfig(
+                temperature=config.temperature,
+                thinking_config=types.ThinkingConfig(
+                    thinking_level=types.ThinkingLevel.LOW,
+                ),
             ),
-        ),
-        contents=[
-            TRANSCRIBE_PROMPT,
-            types.Part.from_bytes(data=audio_bytes, mime_type=mime_type),
-        ],
-    )
+            contents=[
+                TRANSCRIBE_PROMPT,
+                audio_part,
+            ],
+        )
+    except Exception:
+        if file_uri:
+            # The upload may have been deleted or expired early; re-upload next time
+            forget_upload(config, audio_file)
+        raise
     logger.debug(response)
 
     text = getattr(response, "text", None)
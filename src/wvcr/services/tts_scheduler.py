@@ -0,0 +1,139 @@
+"""Sentence-pipelined TTS: synthesize ahead while earlier sentences play.
+
+The text is split into sentence-sized pieces. Synthesis requests run on a
+small pool, at most `prefetch` pieces ahead of playback, and finished
+audio is written in order to one output stream. Playback can start as
+soon as the first (short) piece is synthesized, so time-to-first-audio no
+longer grows with the length of the text. A set stop_event ends playback
+between chunks and cancels requests that have not started.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+
+from loguru import logger
+
+
+MAX_PIECE_CHARS = 400
+# Short first piece of every long sentence: for the opening one it gates
+# time-to-first-audio
+FIRST_PIECE_CHARS = 160
+WRITE_CHUNK_BYTES = 4096
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])\s+|\n+")
+_CLAUSE_RE = re.compile(r"(?<=[,;:—–])\s+")
+
+
+def _split_long(sentence: str, limit: int, first_limit: int) -> list[str]:
+    """Break an over-long sentence at clause punctuation, then at spaces.
+
+    The first part is kept within first_limit, the rest within limit.
+    """
+    if len(sentence) <= first_limit:
+        return [sentence]
+    pieces: list[str] = []
+    current = ""
+    for clause in _CLAUSE_RE.split(sentence):
+        words = clause.split(" ") if len(clause) > first_limit else [clause]
+        for word in words:
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) > (limit if pieces else first_limit) and current:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_sentences(
+    text: str,
+    max_chars: int = MAX_PIECE_CHARS,
+    first_chars: int = FIRST_PIECE_CHARS,
+) -> list[str]:
+    """Sentence-sized pieces; long sentences are split at clauses.
+
+    Each sentence is split on its own, never merged with its neighbours or
+    cut differently depending on where it appears, so a sentence always
+    yields the same pieces (and TTS cache keys) in any text.
+    """
+    sentences = [" ".join(s.split()) for s in _SENTENCE_RE.split(text) if s and s.strip()]
+    return [part for sentence in sentences for part in _split_long(sentence, max_chars, first_chars)]
+
+
+class TTSScheduler:
+    def __init__(
+        self,
+        synthesize: Callable[[str], bytes],
+        workers: int = 2,
+        prefetch: int = 3,
+    ):
+        self.synthesize = synthesize
+        self.workers = max(1, int(workers))
+        self.prefetch = max(1, int(prefetch))
+
+    def run(
+        self,
+        text: str,
+        write: Callable[[bytes], None],
+        stop_event: threading.Event | None = None,
+        keep_played: bool = False,
+    ) -> list[memoryview]:
+        """Synthesize and play text piece by piece.
+
+        With keep_played, returns the chunks that were played, as views of
+        the synthesized (or cached, mmapped) audio rather than copies.
+        """
+        pieces = split_sentences(text)
+        played: list[memoryview] = []
+        if not pieces:
+            return played
+        logger.debug(f"TTS: {len(pieces)} pieces, {self.workers} workers, prefetch {self.prefetch}")
+
+        def stopped() -> bool:
+            return stop_event is not None and stop_event.is_set()
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wvcr-tts")
+        futures: list[Future] = []
+        try:
+            for index in range(len(pieces)):
+                # Keep up to `prefetch` pieces in flight beyond the one playing
+                while len(futures) < min(len(pieces), index + 1 + self.prefetch):
+                    futures.append(pool.submit(self.synthesize, pieces[len(futures)]))
+                if stopped():
+                    break
+                pcm = self._result(futures[index], stop_event)
+                if pcm is None:
+                    break
+                view = memoryview(pcm)
+                for offset in range(0, len(view), WRITE_CHUNK_BYTES):
+                    if stopped():
+                        break
+                    chunk = view[offset : offset + WRITE_CHUNK_BYTES]
+                    write(chunk)
+                    if keep_played:
+                        played.append(chunk)
+            if stopped():
+                logger.info("Stopping TTS playback as requested")
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return played
+
+    @staticmethod
+    def _result(future: Future, stop_event: threading.Event | None) -> bytes | None:
+        # Poll so a stop request is noticed while waiting on a slow request
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                continue
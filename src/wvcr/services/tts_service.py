@@ -1,10 +1,66 @@
+import mmap
+import os
 import wave
 import threading
 from pathlib import Path
+from typing import Any, Callable
 
-import pyaudio
 from loguru import logger
-from wvcr.config import OAIConfig, GeminiConfig
+from wvcr.config import OUTPUT, OAIConfig, GeminiConfig
+from wvcr.pipeline.metrics import METRICS
+from wvcr.services.disk_cache import DiskCache, make_key
+from wvcr.services.audio_output import AudioOutputEngine, get_audio_output
+from wvcr.services.tts_scheduler import TTSScheduler
+
+# Concurrent synthesis requests and how many sentences to synthesize ahead
+TTS_WORKERS = int(os.getenv("WVCR_TTS_WORKERS", "2"))
+TTS_PREFETCH = int(os.getenv("WVCR_TTS_PREFETCH", "3"))
+# Synthesized PCM per sentence, keyed by provider/model/voice/instructions/text
+TTS_CACHE_DIR = OUTPUT / "cache" / "tts"
+TTS_CACHE_MB = int(os.getenv("WVCR_TTS_CACHE_MB", "256"))
+
+_tts_cache: DiskCache | None = None
+
+
+def get_tts_cache() -> DiskCache:
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = DiskCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MB * 1024 * 1024, suffix=".pcm")
+    return _tts_cache
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _cached(synthesize: Callable[[str], bytes], *voice) -> Callable[[str], Any]:
+    """Wrap a per-sentence synthesize function with the TTS cache.
+
+    Hits are returned as a read-only mmap of the cache file, so repeated
+    playback never copies the audio into memory up front.
+    """
+    cache = get_tts_cache()
+
+    def run(piece: str):
+        key = make_key("tts", *voice, _normalize_text(piece))
+        try:
+            path = cache.get_path(key)
+            if path is not None:
+                with open(path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size:
+                        logger.debug(f"TTS cache hit: {piece[:40]!r}")
+                        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            logger.debug(f"TTS cache read failed: {e}")
+        pcm = synthesize(piece)
+        if pcm:
+            try:
+                cache.put(key, pcm)
+            except OSError as e:
+                logger.warning(f"Failed to cache TTS audio: {e}")
+        return pcm
+
+    return run
 
 
 def _save_pcm_to_wav(pcm_data, output_file, sample_rate=24000, channels=1, sample_width=2):
@@ -13,190 +69,102 @@ def _save_pcm_to_wav(pcm_data, output_file, sample_rate=24000, channels=1, sampl
             wav_file.setnchannels(channels)
             wav_file.setsampwidth(sample_width)  # 2 bytes for 16-bit audio
             wav_file.setframerate(sample_rate)
-            wav_file.writeframes(pcm_data)
+            # A list of chunks (e.g. views of cached audio) is written without joining
+            for chunk in pcm_data if isinstance(pcm_data, list) else [pcm_data]:
+                wav_file.writeframesraw(chunk)
         return True
     except Exception as e:
         logger.exception(f"Error saving WAV file: {e}")
         return False
 
 
-def _stream_audio_with_buffer(response, stream, pcm_data, stop_event, buffer_size=5):
-    initial_buffer = []
-    buffering = True
-    
-    for chunk in response.iter_bytes(1024):
-        if stop_event and stop_event.is_set():
-            logger.info("Stopping audio playback as requested")
-            break
-        
-        if buffering:
-            initial_buffer.append(chunk)
-            if len(initial_buffer) >= buffer_size:
-                # Play buffered audio all at once
-                for buffered_chunk in initial_buffer:
-                    stream.write(buffered_chunk)
-                    if pcm_data is not None:
-                        pcm_data.extend(buffered_chunk)
-                buffering = False
-        else:
-            stream.write(chunk)
-            if pcm_data is not None:
-                pcm_data.extend(chunk)
-    
-    return True
-
-
-def _generate_and_play_oai(
-    text: str,
-    config: OAIConfig,
-    output_file: Path,
-    stop_event: threading.Event | None = None,
-    use_gpt_tts: bool = True
-) -> bool:
-    try:
-        p = pyaudio.PyAudio()
-        stream = p.open(format=8, channels=1, rate=24_000, output=True)
-        
-        try:
-            pcm_data = bytearray() if output_file else None
-
-            # Create the response with appropriate parameters
-            create_params = {
-                "input": text,
-                "response_format": "pcm"
-            }
-            
-            if use_gpt_tts:
-                model = "gpt-4o-mini-tts"
-                voice = "alloy"
-                instructions = """
+def _oai_voice(use_gpt_tts: bool = True) -> tuple[str, str, str | None]:
+    """(model, voice, instructions) for OpenAI TTS."""
+    if use_gpt_tts:
+        instructions = """
 Voice Affect: Low, smoove, fast
 Pacing: Fast and deliberate
 Pronunciation: Smooth, flowing articulation
 """
-                create_params["instructions"] = instructions
-            else:
-                model = "tts-1"
-                voice = "alloy"
-
-            create_params["voice"] = voice
-            create_params["model"] = model
-            
-            logger.debug(f"Generating OpenAI TTS with model={model}, voice={voice}")
-            
-            with config.client.audio.speech.with_streaming_response.create(**create_params) as response:
-                _stream_audio_with_buffer(response, stream, pcm_data, stop_event, buffer_size=5)
-
-            # If we need to save to a file, convert the collected PCM data to WAV
-            if output_file and pcm_data:
-                return _save_pcm_to_wav(pcm_data, output_file)
-                
-            return True
-        finally:
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-            
-    except Exception as e:
-        logger.exception(f"OpenAI TTS generation failed: {e}")
-        return False
+        return "gpt-4o-mini-tts", "alloy", instructions
+    return "tts-1", "alloy", None
 
 
-def _generate_and_play_gemini_non_streaming(
-    text: str,
-    config: GeminiConfig,
-    output_file: Path,
-    stop_event: threading.Event | None = None
-) -> bool:
-    """Generate and play TTS using Gemini API (non-streaming)."""
-    try:
-        from google.genai import types
-        
-        p = pyaudio.PyAudio()
-        stream = p.open(format=8, channels=1, rate=24_000, output=True)
-        
-        try:
-            logger.debug("Generating Gemini TTS with model=gemini-2.5-flash-preview-tts, voice=Kore")
-            
-            # Generate TTS using Gemini API
-            client = config.get_client()
-            response = client.models.generate_content(
-                model="gemini-2.5-flash-preview-tts",
-                contents=text,
-                config=types.GenerateContentConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        voice_config=types.VoiceConfig(
-                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                voice_name='Kore',
-                            )
-                        )
-                    ),
+def _synthesize_oai(text: str, config: OAIConfig, use_gpt_tts: bool = True) -> bytes:
+    """One OpenAI TTS request; returns 24 kHz mono PCM16."""
+    model, voice, instructions = _oai_voice(use_gpt_tts)
+    # Create the response with appropriate parameters
+    create_params = {
+        "input": text,
+        "response_format": "pcm",
+        "voice": voice,
+        "model": model,
+    }
+    if instructions:
+        create_params["instructions"] = instructions
+
+    logger.debug(f"Generating OpenAI TTS with model={model}, voice={voice}: {text[:40]!r}")
+
+    pcm = bytearray()
+    client = config.get_client()
+    with client.audio.speech.with_streaming_response.create(**create_params) as response:
+        for chunk in response.iter_bytes(4096):
+            pcm.extend(chunk)
+    METRICS.add_bytes("tts_received", len(pcm))
+    return bytes(pcm)
+
+
+GEMINI_TTS_MODEL = "gemini-2.5-flash-preview-tts"
+GEMINI_TTS_VOICE = "Kore"
+
+
+def _synthesize_gemini(text: str, config: GeminiConfig) -> bytes:
+    """One Gemini TTS request; returns 24 kHz mono PCM16."""
+    from google.genai import types
+
+    logger.debug(f"Generating Gemini TTS with model={GEMINI_TTS_MODEL}, voice={GEMINI_TTS_VOICE}: {text[:40]!r}")
+
+    client = config.get_client()
+    response = client.models.generate_content(
+        model=GEMINI_TTS_MODEL,
+        contents=text,
+        config=types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name=GEMINI_TTS_VOICE,
+                    )
                 )
-            )
-            logger.debug("Gemini TTS response received")
-            
-            # Extract audio data from response
-            audio_data = response.candidates[0].content.parts[0].inline_data.data
-            logger.debug(f"Gemini TTS audio data: {len(audio_data)} bytes")
-            
-            # Play audio with buffering to prevent stuttering/clicking
-            chunk_size = 4096  # Larger chunks to reduce stuttering
-            buffer_size = 5
-            initial_buffer = []
-            buffering = True
-            
-            for i in range(0, len(audio_data), chunk_size):
-                if stop_event and stop_event.is_set():
-                    logger.info("Stopping Gemini TTS playback as requested")
-                    break
-                
-                chunk = audio_data[i:i + chunk_size]
-                
-                if buffering:
-                    initial_buffer.append(chunk)
-                    if len(initial_buffer) >= buffer_size:
-                        # Play buffered audio all at once
-                        for buffered_chunk in initial_buffer:
-                            stream.write(buffered_chunk)
-                        buffering = False
-                else:
-                    stream.write(chunk)
-            
-            # Save to file if requested
-            if output_file:
-                return _save_pcm_to_wav(audio_data, output_file)
-            
-            return True
-            
-        finally:
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-            
-    except Exception as e:
-        logger.exception(f"Gemini TTS generation failed: {e}")
-        return False
+            ),
+        )
+    )
+
+    # Extract audio data from response
+    audio_data = response.candidates[0].content.parts[0].inline_data.data
+    logger.debug(f"Gemini TTS audio data: {len(audio_data)} bytes")
+    METRICS.add_bytes("tts_received", len(audio_data))
+    return audio_data
 
 
 def _generate_and_play_gemini(
     text: str,
     config: GeminiConfig,
     output_file: Path,
-    stop_event: threading.Event | None = None
+    stop_event: threading.Event | None = None,
+    audio_out: AudioOutputEngine | None = None,
 ) -> bool:
     """Generate and play TTS using Gemini API with streaming."""
     try:
         from google.genai import types, Client
-        
-        p = pyaudio.PyAudio()
-        stream = p.open(format=8, channels=1, rate=24_000, output=True)
-        
+
+        playback = (audio_out or get_audio_output()).open_playback(rate=24_000, channels=1)
+
         try:
             logger.debug("Generating streaming Gemini TTS with model=gemini-2.5-flash-tts, voice=Kore")
-            
+
             client: Client = config.get_client()
-            
+
             generate_content_config = types.GenerateContentConfig(
                 response_modalities=["AUDIO"],
                 speech_config=types.SpeechConfig(
@@ -208,13 +176,9 @@ def _generate_and_play_gemini(
                     )
                 ),
             )
-            
+
             final_audio_data = bytearray() if output_file else None
             chunk_count = 0
-            buffer_size = 5
-            initial_buffer = []
-            buffering = True
-            
 
             # this shit wont stream properly, i think its genai-gemini problem
             # comes out in one chunk
@@ -229,9 +193,9 @@ def _generate_and_play_gemini(
                 if stop_event and stop_event.is_set():
                     logger.info("Stopping streaming Gemini TTS playback as requested")
                     break
-                
+
                 chunk_count += 1
-                
+
                 # Check if chunk has audio data
                 if (
                     chunk.candidates is None
@@ -240,90 +204,87 @@ def _generate_and_play_gemini(
                     or not chunk.candidates[0].content.parts
                 ):
                     continue
-                
+
                 part = chunk.candidates[0].content.parts[0]
                 if part.inline_data and part.inline_data.data:
                     audio_chunk = part.inline_data.data
-                    
+                    METRICS.add_bytes("tts_received", len(audio_chunk))
+
                     # Accumulate for file saving
                     if final_audio_data is not None:
                         final_audio_data.extend(audio_chunk)
-                    
-                    # Play with buffering to prevent stuttering
-                    if buffering:
-                        initial_buffer.append(audio_chunk)
-                        logger.debug(f"Buffering chunk {len(initial_buffer)}/{buffer_size}, size: {len(audio_chunk)} bytes")
-                        if len(initial_buffer) >= buffer_size:
-                            # Play buffered audio all at once
-                            total_buffered = sum(len(bc) for bc in initial_buffer)
-                            logger.debug(f"Playing {len(initial_buffer)} buffered chunks, total: {total_buffered} bytes")
-                            for buffered_chunk in initial_buffer:
-                                stream.write(buffered_chunk)
-                            initial_buffer.clear()
-                            buffering = False
-                            logger.debug("Buffering complete, switching to direct playback")
-                    else:
-                        logger.debug(f"Direct playback: {len(audio_chunk)} bytes")
-                        stream.write(audio_chunk)
-            
-            # Play any remaining buffered chunks that didn't reach buffer_size
-            if buffering and initial_buffer:
-                total_buffered = sum(len(bc) for bc in initial_buffer)
-                logger.debug(f"Playing {len(initial_buffer)} remaining buffered chunks, total: {total_buffered} bytes")
-                for buffered_chunk in initial_buffer:
-                    stream.write(buffered_chunk)
-            
+
+                    # The output engine buffers ahead of the device, no priming needed
+                    playback.write(audio_chunk)
+
             logger.debug(f"Gemini TTS streaming completed: {chunk_count} chunks received")
-            
-            # Save to file if requested
-            if output_file and final_audio_data:
-                return _save_pcm_to_wav(bytes(final_audio_data), output_file)
-            
-            return True
-            
         finally:
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-            
+            playback.finish()
+        playback.wait(stop_event)
+
+        # Save to file if requested
+        if output_file and final_audio_data:
+            return _save_pcm_to_wav(bytes(final_audio_data), output_file)
+
+        return True
+
     except Exception as e:
         logger.exception(f"Gemini TTS streaming generation failed: {e}")
         return False
 
 
 class TTSService:
-    def __init__(self, oai_config: OAIConfig, gemini_config: GeminiConfig):
+    def __init__(
+        self,
+        oai_config: OAIConfig,
+        gemini_config: GeminiConfig,
+        audio_out: AudioOutputEngine | None = None,
+    ):
         self.oai_config = oai_config
         self.gemini_config = gemini_config
-    
+        self.audio_out = audio_out or get_audio_output()
+
     def generate_and_play(
-        self, 
-        text: str, 
-        output_file: Path, 
+        self,
+        text: str,
+        output_file: Path,
         provider: str = "openai",
-        stop_event: threading.Event | None = None) -> bool:
+        stop_event: threading.Event | None = None,
+        use_cache: bool = True) -> bool:
+        """Speak text sentence by sentence, synthesizing ahead of playback.
 
+        Sentences spoken before with the same voice come from the TTS cache.
+        """
         logger.info(f"Generating TTS with provider={provider}")
-        
+
+        if provider == "openai" or not self.gemini_config:
+            synthesize = lambda piece: _synthesize_oai(piece, self.oai_config, use_gpt_tts=True)
+            voice = ("openai", *_oai_voice(use_gpt_tts=True))
+        elif provider == "gemini":
+            synthesize = lambda piece: _synthesize_gemini(piece, self.gemini_config)
+            voice = ("gemini", GEMINI_TTS_MODEL, GEMINI_TTS_VOICE, None)
+        else:
+            logger.error(f"TTS generation failed: unsupported provider: {provider}")
+            return False
+        if use_cache:
+            synthesize = _cached(synthesize, *voice)
+
         try:
-            if provider == "openai" or not self.gemini_config:
-                return _generate_and_play_oai(
-                    text=text,
-                    config=self.oai_config,
-                    output_file=output_file,
-                    stop_event=stop_event,
-                    use_gpt_tts=True
-                )
-            elif provider == "gemini":
-                return _generate_and_play_gemini_non_streaming(
-                    text=text,
-                    config=self.gemini_config,
-                    output_file=output_file,
-                    stop_event=stop_event
-                )
-            else:
-                raise ValueError(f"Unsupported provider: {provider}")
-                
+            playback = self.audio_out.open_playback(rate=24_000, channels=1)
+            try:
+                scheduler = TTSScheduler(synthesize, workers=TTS_WORKERS, prefetch=TTS_PREFETCH)
+                pcm_data = scheduler.run(text, playback.write, stop_event, keep_played=bool(output_file))
+            except BaseException:
+                playback.stop()
+                raise
+            playback.finish()
+            playback.wait(stop_event)
+
+            # Save what was played as WAV
+            if output_file and pcm_data:
+                return _save_pcm_to_wav(pcm_data, output_file)
+            return True
+
         except Exception as e:
             logger.exception(f"TTS generation failed: {e}")
             return False
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import array
+import math
+import operator
 from collections import deque
 from dataclasses import dataclass
 from typing import Optional
@@ -19,11 +22,17 @@ class BaseVAD:
     ) -> bool:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def reset(self) -> None:
+        """Forget stream state (start of a new recording)."""
+
 
 class NoVad:
     def is_speech(self, pcm_bytes: bytes, rate: int) -> bool:
         return True
 
+    def reset(self) -> None:
+        pass
+
 
 class WebRtcVAD(BaseVAD):
     """WebRTC VAD wrapper with hangover handling."""
@@ -49,6 +58,9 @@ class WebRtcVAD(BaseVAD):
         self._hangover_frames = 0
         self._hangover_limit = max(0, int(hangover_ms) // self._chunk_ms)
 
+    def reset(self) -> None:
+        self._hangover_frames = 0
+
     def is_speech(self, pcm_bytes: bytes, rate: int) -> bool:
         try:
             is_speech = self._vad.is_speech(pcm_bytes, rate)
@@ -95,6 +107,11 @@ class SileroVAD(BaseVAD):
         self._buf = bytearray()
         self._last_chunk_samples = 0
 
+    def reset(self) -> None:
+        self._buf.clear()
+        self._last_chunk_samples = 0
+        self._hangover_frames = 0
+
     def _bytes_to_tensor(self, pcm_bytes: bytes):
         # Avoid numpy to reduce extra deps; use array + torch
         import array
@@ -173,3 +190,137 @@ class SileroVAD(BaseVAD):
             self._hangover_frames -= 1
             return True
         return False
+
+
+class StreamingSileroVAD(BaseVAD):
+    """Stateful Silero VAD that scores every 512-sample frame exactly once.
+
+    Unlike SileroVAD, which re-runs get_speech_timestamps over the whole
+    rolling window for every chunk, this keeps the model's recurrent state
+    between calls and feeds it only the new frames. Incoming PCM16 is copied
+    into preallocated int16/float32 buffers, so steady-state work is one
+    model call per 32 ms of audio. is_speech() applies hysteresis (enter at
+    `threshold`, leave below `neg_threshold`) plus a hangover.
+    """
+
+    RATE = 16000
+    FRAME_SAMPLES = 512  # what Silero expects at 16 kHz
+    FRAME_BYTES = FRAME_SAMPLES * 2
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        neg_threshold: Optional[float] = None,
+        hangover_ms: int = 300,
+    ):
+        import torch
+        from silero_vad import load_silero_vad  # type: ignore
+
+        self._torch = torch
+        self._model = load_silero_vad()
+        self.threshold = float(threshold)
+        self.neg_threshold = (
+            float(neg_threshold) if neg_threshold is not None else max(0.01, self.threshold - 0.15)
+        )
+        self._hangover_samples = max(0, int(hangover_ms)) * self.RATE // 1000
+
+        # Preallocated model input: raw frame bytes, an int16 view over them
+        # and the normalized float32 tensor handed to the model.
+        self._frame_bytes = bytearray(self.FRAME_BYTES)
+        self._frame_i16 = torch.frombuffer(self._frame_bytes, dtype=torch.int16)
+        self._frame = torch.zeros(self.FRAME_SAMPLES, dtype=torch.float32)
+        self._pending = bytearray()
+
+        self._speaking = False
+        self._hangover_left = 0
+        self.last_prob = 0.0
+
+    def reset(self) -> None:
+        self._model.reset_states()
+        self._pending.clear()
+        self._speaking = False
+        self._hangover_left = 0
+        self.last_prob = 0.0
+
+    def _score_frame(self, pcm, offset: int) -> float:
+        self._frame_bytes[:] = pcm[offset : offset + self.FRAME_BYTES]
+        self._frame.copy_(self._frame_i16)
+        self._frame.mul_(1.0 / 32768.0)
+        with self._torch.no_grad():
+            return float(self._model(self._frame, self.RATE))
+
+    def process(self, pcm_bytes) -> list[float]:
+        """Feed PCM16 and return the speech probability of each completed frame."""
+        self._pending.extend(pcm_bytes)
+        probs = []
+        offset = 0
+        while len(self._pending) - offset >= self.FRAME_BYTES:
+            probs.append(self._score_frame(self._pending, offset))
+            offset += self.FRAME_BYTES
+        if offset:
+            del self._pending[:offset]
+        return probs
+
+    def _update(self, prob: float) -> bool:
+        self.last_prob = prob
+        if prob >= self.threshold:
+            self._speaking = True
+            self._hangover_left = self._hangover_samples
+        elif prob < self.neg_threshold and self._speaking:
+            if self._hangover_left > 0:
+                self._hangover_left -= self.FRAME_SAMPLES
+            else:
+                self._speaking = False
+        return self._speaking
+
+    def is_speech(self, pcm_bytes: bytes, rate: int) -> bool:
+        if rate != self.RATE:
+            # Silero models are trained for 16k; fail-open if mismatch
+            logger.debug("Silero VAD expects 16kHz audio; passing through")
+            return True
+        for prob in self.process(pcm_bytes):
+            self._update(prob)
+        return self._speaking
+
+    def score(self, pcm_bytes, rate: int = 16000) -> list[float]:
+        """Offline: per-frame speech probabilities for a whole recording.
+
+        Runs with fresh model state and leaves the streaming state reset.
+        """
+        if rate != self.RATE:
+            raise ValueError("Silero VAD scoring expects 16kHz PCM16")
+        self.reset()
+        try:
+            view = memoryview(pcm_bytes)
+            usable = len(view) - len(view) % self.FRAME_BYTES
+            return [
+                self._score_frame(view, off)
+                for off in range(0, usable, self.FRAME_BYTES)
+            ]
+        finally:
+            self.reset()
+
+
+def _rms(samples) -> int:
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples)))
+
+
+def pcm_rms(pcm_bytes) -> int:
+    """RMS level of PCM16 (what audioop.rms did before Python 3.13 dropped it)."""
+    samples = array.array("h")
+    samples.frombytes(bytes(pcm_bytes[: len(pcm_bytes) - len(pcm_bytes) % 2]))
+    return _rms(samples)
+
+
+def frame_energies(pcm_bytes, frame_samples: int = 512) -> list[int]:
+    """Offline: RMS level of each PCM16 frame (cheap fallback when Silero is missing)."""
+    samples = array.array("h")
+    view = memoryview(pcm_bytes)
+    samples.frombytes(view[: len(view) - len(view) % 2])
+    usable = len(samples) - len(samples) % frame_samples
+    return [
+        _rms(samples[off : off + frame_samples])
+        for off in range(0, usable, frame_samples)
+    ]
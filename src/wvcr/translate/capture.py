@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+from loguru import logger
+
+
+class CaptureReader:
+    """Frames from a capture pipe, read on the event loop itself.
+
+    The fd is switched to non-blocking and registered with loop.add_reader,
+    so each readable event is drained straight into a preallocated frame
+    buffer with os.readv -- no executor handoff or future per 20 ms frame.
+    Completed frames go to a bounded asyncio.Queue; when the consumer falls
+    behind, the oldest frame is dropped so latency stays bounded. get()
+    returns None at end of stream.
+    """
+
+    def __init__(self, fd: int, frame_bytes: int, max_frames: int = 50):
+        self.fd = fd
+        self.frame_bytes = frame_bytes
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_frames)
+        self._frame = bytearray(frame_bytes)
+        self._frame_view = memoryview(self._frame)
+        self._fill = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._eof = False
+        self.frames = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.lag_max_ms = 0.0
+        self._lag_sum_ms = 0.0
+        self._lag_count = 0
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        os.set_blocking(self.fd, False)
+        self._loop.add_reader(self.fd, self._on_readable)
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(self.fd)
+            self._loop = None
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                n = os.readv(self.fd, [self._frame_view[self._fill :]])
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.warning(f"capture read failed: {e}")
+                n = 0
+            if n == 0:
+                self._finish()
+                return
+            self._fill += n
+            if self._fill == self.frame_bytes:
+                self._fill = 0
+                self._push((time.monotonic(), bytes(self._frame)))
+
+    def _push(self, item) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+        self.frames += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _finish(self) -> None:
+        if self._eof:
+            return
+        self._eof = True
+        self.stop()
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[bytes]:
+        item = await self.queue.get()
+        if item is None:
+            return None
+        captured_at, frame = item
+        lag_ms = (time.monotonic() - captured_at) * 1000.0
+        self.lag_max_ms = max(self.lag_max_ms, lag_ms)
+        self._lag_sum_ms += lag_ms
+        self._lag_count += 1
+        return frame
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "lag_avg_ms": round(self._lag_sum_ms / self._lag_count, 2) if self._lag_count else 0.0,
+            "lag_max_ms": round(self.lag_max_ms, 2),
+        }
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import array
+from collections import deque
+
+from loguru import logger
+
+from wvcr.services.vad import pcm_rms
+
+PREROLL_MS = 300
+HANGOVER_MS = 600
+VAD_RATE = 16000
+# RMS level treated as speech when Silero is unavailable
+ENERGY_THRESHOLD = 500
+
+
+class _EnergyVAD:
+    def is_speech(self, pcm_bytes: bytes, rate: int) -> bool:
+        return pcm_rms(pcm_bytes) >= ENERGY_THRESHOLD
+
+
+def _resample(frame: bytes, src_rate: int, dst_rate: int) -> bytes:
+    """Linear-interpolation resample of one mono PCM16 frame (VAD input only)."""
+    samples = array.array("h")
+    samples.frombytes(frame)
+    n = len(samples)
+    out_n = n * dst_rate // src_rate
+    out = array.array("h", bytes(out_n * 2))
+    step = src_rate / dst_rate
+    for i in range(out_n):
+        pos = i * step
+        j = int(pos)
+        a = samples[j]
+        b = samples[j + 1] if j + 1 < n else a
+        out[i] = int(a + (b - a) * (pos - j))
+    return out.tobytes()
+
+
+def _load_vad():
+    try:
+        from wvcr.services.vad import StreamingSileroVAD
+
+        # The gate applies its own hangover
+        return StreamingSileroVAD(hangover_ms=0)
+    except Exception as e:
+        logger.warning(f"Silero VAD unavailable, gating uplink on energy: {e}")
+        return _EnergyVAD()
+
+
+class UplinkGate:
+    """Drops capture frames during silence before they reach the uplink.
+
+    Frames are scored by a streaming VAD (Silero on 16 kHz audio, linearly
+    resampled if needed; an RMS threshold without torch). While silent,
+    the last PREROLL_MS of frames are kept so a word onset is sent with the
+    audio just before it, and speech stays open for HANGOVER_MS after the VAD
+    drops so trailing syllables and short pauses pass through. process()
+    returns the frames to send and whether speech has just ended, which is
+    the point to signal end of activity to the backend.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        frame_ms: int,
+        preroll_ms: int = PREROLL_MS,
+        hangover_ms: int = HANGOVER_MS,
+        vad=None,
+    ):
+        self.rate = rate
+        self.vad = vad if vad is not None else _load_vad()
+        self._preroll: deque = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._hangover_frames = max(0, hangover_ms // frame_ms)
+        self._hangover_left = 0
+        self.active = False
+        self.frames = 0
+        self.suppressed = 0
+        self.activations = 0
+
+    def process(self, frame: bytes) -> tuple[list[bytes], bool]:
+        self.frames += 1
+        if self._is_speech(frame):
+            self._hangover_left = self._hangover_frames
+            if not self.active:
+                self.active = True
+                self.activations += 1
+                out = list(self._preroll)
+                self._preroll.clear()
+                # Preroll frames were counted as suppressed when they came in
+                self.suppressed -= len(out)
+                out.append(frame)
+                return out, False
+            return [frame], False
+        if self.active:
+            if self._hangover_left > 0:
+                self._hangover_left -= 1
+                return [frame], False
+            self.active = False
+            self._preroll.append(frame)
+            self.suppressed += 1
+            return [], True
+        self._preroll.append(frame)
+        self.suppressed += 1
+        return [], False
+
+    def _is_speech(self, frame: bytes) -> bool:
+        pcm = frame if self.rate == VAD_RATE else _resample(frame, self.rate, VAD_RATE)
+        return self.vad.is_speech(pcm, VAD_RATE)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "suppressed": self.suppressed,
+            "suppressed_fraction": round(self.suppressed / self.frames, 3) if self.frames else 0.0,
+            "activations": self.activations,
+        }
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Awaitable, Callable, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 from loguru import logger
-from google import genai
 from google.genai import types
 
+from wvcr.config.clients import genai_client
+
+if TYPE_CHECKING:
+    from google import genai
+
+# Input audio format for translation is 16-bit PCM at 16kHz
+INPUT_MIME_TYPE = "audio/pcm;rate=16000"
+
 
 class GeminiConfig:
     def __init__(self, target_language: str, api_key: str, echo_target_language: bool = True):
@@ -41,7 +48,7 @@ class GeminiSession:
 
     async def connect(self) -> None:
         logger.info("connecting to Gemini Live Translate API")
-        self._client = genai.Client(api_key=self.config.api_key)
+        self._client = genai_client(self.config.api_key)
         
         # Configure Live Translate
         model = "gemini-3.5-live-translate-preview"
@@ -63,17 +70,28 @@ class GeminiSession:
         if self._session is None or self._closing:
             return
         try:
-            # Input audio format for translation is 16-bit PCM at 16kHz
             await self._session.send_realtime_input(
-                audio=types.Blob(
-                    data=pcm16,
-                    mime_type="audio/pcm;rate=16000"
-                )
+                audio=types.Blob(data=pcm16, mime_type=INPUT_MIME_TYPE)
             )
         except Exception as e:
             if not self._closing:
                 logger.error(f"Error sending audio to Gemini: {e}")
 
+    async def end_activity(self) -> None:
+        """Speech paused and the uplink goes quiet: flush audio cached server-side."""
+        if self._session is None or self._closing:
+            return
+        try:
+            await self._session.send_realtime_input(audio_stream_end=True)
+        except Exception as e:
+            if not self._closing:
+                logger.error(f"Error sending audio stream end to Gemini: {e}")
+
+    def rtt_ms(self) -> float | None:
+        # The SDK keeps its websocket private; use its ping latency if exposed
+        latency = getattr(getattr(self._session, "_ws", None), "latency", None)
+        return latency * 1000.0 if latency else None
+
     async def receive_loop(self) -> None:
         if self._session is None:
             return
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import BinaryIO, Optional
+
+from loguru import logger
+
+from .audio import CHANNELS, FRAME_MS, SAMPLE_WIDTH
+
+# Jitter buffer target: how much audio to collect before (re)starting a burst
+TARGET_MS = 80
+MIN_TARGET_MS = 40
+MAX_TARGET_MS = 400
+TARGET_STEP_MS = 20
+# Starved again this soon after running dry: the data was late, not a pause
+UNDERRUN_WINDOW_S = 0.3
+# Shrink the target after this long without an underrun
+DECAY_AFTER_S = 10.0
+# Audio written ahead into the pipe; the rest waits here
+LEAD_MS = 60
+# Beyond target + this much buffered is an overrun
+OVERRUN_MS = 1000
+
+
+class PlaybackWriter:
+    """Feeds translated audio to the playback pipe from its own thread.
+
+    put() only appends to a buffer, so a stalled pacat can no longer block
+    the event loop (and with it the capture uplink). The thread writes in
+    FRAME_MS chunks paced to real time, keeping just LEAD_MS in the pipe,
+    so the buffer here is the actual jitter buffer: each burst starts once
+    target_ms is queued (or the first chunk has waited that long), and
+    running dry mid-burst raises the target while smooth playback slowly
+    lowers it again.
+    """
+
+    def __init__(
+        self,
+        pipe: BinaryIO,
+        rate: int,
+        target_ms: int = TARGET_MS,
+    ):
+        self.pipe = pipe
+        self.rate = rate
+        self.bytes_per_ms = rate * CHANNELS * SAMPLE_WIDTH / 1000.0
+        self.chunk_bytes = int(self.bytes_per_ms * FRAME_MS)
+        self.target_ms = target_ms
+        self._cond = threading.Condition()
+        self._chunks: deque = deque()
+        self._buffered = 0
+        self._first_at = 0.0
+        self._playing = False
+        self._dry_at: Optional[float] = None
+        self._last_underrun = time.monotonic()
+        self._over = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.underruns = 0
+        self.overruns = 0
+        self.bytes_written = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="translate-playback", daemon=True)
+        self._thread.start()
+
+    def put(self, pcm: bytes) -> None:
+        if not pcm:
+            return
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return
+            if not self._buffered:
+                self._first_at = now
+                if self._dry_at is not None:
+                    late = now - self._dry_at
+                    if late <= 0:
+                        # The previous audio is still playing: carry on without re-buffering
+                        self._playing = True
+                    elif late < UNDERRUN_WINDOW_S:
+                        self.underruns += 1
+                        self._last_underrun = now
+                        self.target_ms = min(MAX_TARGET_MS, self.target_ms + TARGET_STEP_MS)
+                self._dry_at = None
+            self._chunks.append(pcm)
+            self._buffered += len(pcm)
+            over = self._buffered > (self.target_ms + OVERRUN_MS) * self.bytes_per_ms
+            if over and not self._over:
+                self.overruns += 1
+            self._over = over
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Stop the thread; audio still buffered is dropped."""
+        with self._cond:
+            self._closed = True
+            self._chunks.clear()
+            self._buffered = 0
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def buffered_ms(self) -> float:
+        return self._buffered / self.bytes_per_ms
+
+    def _take(self) -> Optional[bytes]:
+        """Next chunk once the jitter buffer allows it; None when closed."""
+        with self._cond:
+            while not self._closed:
+                if not self._buffered:
+                    self._cond.wait()
+                    continue
+                if not self._playing:
+                    wait = self._first_at + self.target_ms / 1000.0 - time.monotonic()
+                    if self.buffered_ms() < self.target_ms and wait > 0:
+                        self._cond.wait(wait)
+                        continue
+                    self._playing = True
+                return self._pop()
+        return None
+
+    def _pop(self) -> bytes:
+        out = bytearray()
+        while self._chunks and len(out) < self.chunk_bytes:
+            chunk = self._chunks.popleft()
+            need = self.chunk_bytes - len(out)
+            if len(chunk) > need:
+                self._chunks.appendleft(chunk[need:])
+                chunk = chunk[:need]
+            out += chunk
+        self._buffered -= len(out)
+        self._over = self._buffered > (self.target_ms + OVERRUN_MS) * self.bytes_per_ms
+        return bytes(out)
+
+    def _run(self) -> None:
+        # Wall-clock time at which everything written so far has played out
+        play_until = time.monotonic()
+        while True:
+            chunk = self._take()
+            if chunk is None:
+                return
+            now = time.monotonic()
+            ahead = play_until - now - LEAD_MS / 1000.0
+            if ahead > 0:
+                time.sleep(ahead)
+                now = time.monotonic()
+            try:
+                self.pipe.write(chunk)
+                self.pipe.flush()
+            except (BrokenPipeError, ValueError, OSError) as e:
+                logger.warning(f"playback pipe closed: {e}")
+                return
+            self.bytes_written += len(chunk)
+            play_until = max(play_until, now) + len(chunk) / self.bytes_per_ms / 1000.0
+            with self._cond:
+                if not self._buffered:
+                    # Ran dry; a chunk arriving within UNDERRUN_WINDOW_S of the
+                    # audio ending counts as an underrun
+                    self._playing = False
+                    self._dry_at = play_until
+                elif now - self._last_underrun > DECAY_AFTER_S:
+                    self.target_ms = max(MIN_TARGET_MS, self.target_ms - TARGET_STEP_MS)
+                    self._last_underrun = now
+
+    def stats(self) -> dict:
+        return {
+            "target_ms": self.target_ms,
+            "buffered_ms": round(self.buffered_ms()),
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "bytes_written": self.bytes_written,
+        }
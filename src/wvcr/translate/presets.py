@@ -16,6 +16,18 @@ DEFAULT_PRESETS = [
     {"name": "English", "language": "en"},
 ]
 
+# Written above the presets in a fresh translate.yaml; every key below
+# is optional and can be set per preset
+CONFIG_HEADER = """\
+# wvcr translate presets. Optional keys per preset (defaults shown):
+#   backend: openai               # or gemini
+#   echo_target_language: true    # gemini: also speak input already in the target language
+#   uplink_ms: 40                 # smallest audio packet sent upstream
+#   uplink_max_ms: 200            # largest packet under a slow link / send backlog
+#                                 # (set equal to uplink_ms for a fixed size)
+#   vad_gate: false               # skip silent capture frames instead of streaming them
+"""
+
 
 @dataclass
 class Preset:
@@ -23,6 +35,12 @@ class Preset:
     language: str
     backend: str = "openai"
     echo_target_language: bool = True
+    # Uplink packet size in ms: the floor, and the ceiling it may adapt up to
+    # under a slow link or send backlog (equal values fix the size)
+    uplink_ms: int = 40
+    uplink_max_ms: int = 200
+    # Skip silent capture frames (with pre-roll/hangover) instead of streaming them
+    vad_gate: bool = False
 
 
 def config_path() -> Path:
@@ -47,10 +65,15 @@ def load_presets() -> list[Preset]:
                     language=item["language"],
                     backend=item.get("backend", "openai"),
                     echo_target_language=item.get("echo_target_language", True),
+                    uplink_ms=int(item.get("uplink_ms", 40)),
+                    uplink_max_ms=int(item.get("uplink_max_ms", 200)),
+                    vad_gate=bool(item.get("vad_gate", False)),
                 )
             )
         except KeyError as e:
             logger.warning(f"skipping preset missing key {e}: {item}")
+        except (TypeError, ValueError) as e:
+            logger.warning(f"skipping preset with invalid value ({e}): {item}")
     if not out:
         logger.warning("preset file present but empty, using defaults")
         return [Preset(p["name"], p["language"]) for p in DEFAULT_PRESETS]
@@ -63,6 +86,7 @@ def write_default_config() -> Path:
         return path
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w") as f:
+        f.write(CONFIG_HEADER)
         yaml.safe_dump({"presets": DEFAULT_PRESETS}, f, sort_keys=False)
     logger.info(f"wrote default presets to {path}")
     return path
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-import wave
+import json
+import os
+import queue
+import struct
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
 
 from loguru import logger
 
@@ -18,44 +24,183 @@ def make_session_dir() -> Path:
     return path
 
 
-class PCMRecorder:
-    def __init__(self, path: Path, sample_rate: int = SAMPLE_RATE):
+# Flush, patch the WAV header and fsync at most this often, so a crash
+# loses only the last few seconds
+SYNC_INTERVAL_S = 5.0
+# Sidecar index granularity
+INDEX_INTERVAL_S = 1.0
+WAV_HEADER_BYTES = 44
+
+
+def _wav_header(sample_rate: int, data_bytes: int) -> bytes:
+    byte_rate = sample_rate * CHANNELS * SAMPLE_WIDTH
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        CHANNELS,
+        sample_rate,
+        byte_rate,
+        CHANNELS * SAMPLE_WIDTH,
+        SAMPLE_WIDTH * 8,
+        b"data",
+        data_bytes,
+    )
+
+
+class _BackgroundWriter:
+    """File I/O (including fsync) for a recorder, run on its own thread.
+
+    write()/append() are called on the event loop, so they only enqueue;
+    a sync there would stall capture, uplink and playback every few
+    seconds. The thread starts with the first item.
+    """
+
+    def __init__(self, path: Path):
         self.path = path
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._failed = False
+
+    def _put(self, item: tuple) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"record-{self.path.name}", daemon=True
+            )
+            self._thread.start()
+        self._queue.put(item)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._failed:
+                continue
+            try:
+                self._handle(*item)
+            except OSError as e:
+                self._failed = True
+                logger.warning(f"recording to {self.path} failed: {e}")
+
+    def _handle(self, *item) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def _drain(self) -> bool:
+        """Wait until everything queued is written; False if nothing ever was."""
+        if self._thread is None:
+            return False
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        return True
+
+
+class PCMRecorder(_BackgroundWriter):
+    """Streams PCM to a WAV file as it arrives.
+
+    The header is written with the sizes known so far and re-patched on
+    every sync and on save(), so the file is playable up to the last sync
+    even if the process dies. A sidecar <name>.idx.jsonl maps wall-clock
+    time to byte offsets in the data chunk, which lets the source and
+    translated tracks (the latter only has audio while the model speaks)
+    be aligned and seeked without reading them.
+    """
+
+    def __init__(self, path: Path, sample_rate: int = SAMPLE_RATE):
+        super().__init__(path)
+        self.index_path = path.with_suffix(".idx.jsonl")
         self.sample_rate = sample_rate
-        self._chunks: list[bytes] = []
+        self._file: Optional[BinaryIO] = None
+        self._index: Optional[TextIO] = None
+        self._queued = 0
+        self._bytes = 0
+        self._last_sync = 0.0
+        self._last_index = 0.0
 
     def write(self, pcm: bytes) -> None:
         if pcm:
-            self._chunks.append(pcm)
+            self._queued += len(pcm)
+            self._put((time.time(), pcm))
 
     def total_bytes(self) -> int:
-        return sum(len(c) for c in self._chunks)
+        return self._queued
 
     def save(self) -> bool:
-        if not self._chunks:
+        if not self._drain() or self._file is None:
             return False
-        with wave.open(str(self.path), "wb") as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(SAMPLE_WIDTH)
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(b"".join(self._chunks))
-        logger.info(f"saved {self.total_bytes()} bytes -> {self.path}")
+        self._sync()
+        self._file.close()
+        self._index.close()
+        self._file = None
+        self._index = None
+        logger.info(f"saved {self._bytes} bytes -> {self.path}")
         return True
 
+    def _handle(self, now: float, pcm: bytes) -> None:
+        if self._file is None:
+            self._open(now)
+        if now - self._last_index >= INDEX_INTERVAL_S:
+            self._index.write(json.dumps({"t": round(now, 3), "offset": self._bytes}) + "\n")
+            self._last_index = now
+        self._file.write(pcm)
+        self._bytes += len(pcm)
+        if now - self._last_sync >= SYNC_INTERVAL_S:
+            self._sync()
+            self._last_sync = now
+
+    def _open(self, now: float) -> None:
+        self._file = self.path.open("wb")
+        self._file.write(_wav_header(self.sample_rate, 0))
+        self._index = self.index_path.open("w", encoding="utf-8")
+        self._index.write(
+            json.dumps({"rate": self.sample_rate, "channels": CHANNELS, "sample_width": SAMPLE_WIDTH})
+            + "\n"
+        )
+        self._last_sync = now
+
+    def _sync(self) -> None:
+        self._file.seek(0)
+        self._file.write(_wav_header(self.sample_rate, self._bytes))
+        self._file.seek(WAV_HEADER_BYTES + self._bytes)
+        for f in (self._file, self._index):
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class TranscriptRecorder(_BackgroundWriter):
+    """Appends transcript deltas to a text file as they arrive."""
 
-class TranscriptRecorder:
     def __init__(self, path: Path):
-        self.path = path
-        self._buf: list[str] = []
+        super().__init__(path)
+        self._file: Optional[TextIO] = None
+        self._chars = 0
+        self._last_sync = 0.0
 
     def append(self, delta: str) -> None:
         if delta:
-            self._buf.append(delta)
+            self._put((time.time(), delta))
 
     def save(self) -> bool:
-        if not self._buf:
+        if not self._drain() or self._file is None:
             return False
-        text = "".join(self._buf)
-        self.path.write_text(text, encoding="utf-8")
-        logger.info(f"saved transcript ({len(text)} chars) -> {self.path}")
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        logger.info(f"saved transcript ({self._chars} chars) -> {self.path}")
         return True
+
+    def _handle(self, now: float, delta: str) -> None:
+        if self._file is None:
+            self._file = self.path.open("w", encoding="utf-8")
+            self._last_sync = now
+        self._file.write(delta)
+        self._file.flush()
+        self._chars += len(delta)
+        if now - self._last_sync >= SYNC_INTERVAL_S:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
@@ -17,9 +17,13 @@ from .audio import (
     start_loopback,
     stop_loopback,
 )
+from .capture import CaptureReader
+from .gate import UplinkGate
+from .playback import PlaybackWriter
 from .presets import Preset
 from .recorder import PCMRecorder, TranscriptRecorder, make_session_dir
 from .session import TranslateConfig, TranslateSession
+from .uplink import Uplink
 
 
 def _spawn_capture(rate: int) -> subprocess.Popen:
@@ -77,18 +81,17 @@ class Runner:
         self.input_rate = 16000 if self.preset.backend == "gemini" else 24000
         self.frame_samples = self.input_rate * FRAME_MS // 1000
         self.frame_bytes = self.frame_samples * CHANNELS * SAMPLE_WIDTH
+        self.capture: Optional[CaptureReader] = None
+        self.uplink: Optional[Uplink] = None
+        self.playback: Optional[PlaybackWriter] = None
+        self.gate: Optional[UplinkGate] = None
 
     def _on_output_audio(self, pcm: bytes) -> None:
         self._audio_out_bytes += len(pcm)
         if self._translated_rec is not None:
             self._translated_rec.write(pcm)
-        if self.playback_proc is None or self.playback_proc.stdin is None:
-            return
-        try:
-            self.playback_proc.stdin.write(pcm)
-            self.playback_proc.stdin.flush()
-        except (BrokenPipeError, ValueError):
-            pass
+        if self.playback is not None:
+            self.playback.put(pcm)
 
     def _on_output_transcript(self, delta: str) -> None:
         if self._translated_text is not None:
@@ -102,26 +105,50 @@ class Runner:
     async def _capture_loop(self) -> None:
         assert self.capture_proc is not None
         assert self.session is not None
-        loop = asyncio.get_running_loop()
         stdout = self.capture_proc.stdout
         assert stdout is not None
+        self.capture = CaptureReader(stdout.fileno(), self.frame_bytes)
+        self.uplink = Uplink(
+            self.session.send_audio,
+            frame_ms=FRAME_MS,
+            min_ms=self.preset.uplink_ms,
+            max_ms=self.preset.uplink_max_ms,
+            rtt_ms=getattr(self.session, "rtt_ms", None),
+        )
+        self.capture.start()
+        self.uplink.start()
         try:
             while not self._stop.is_set():
-                chunk = await loop.run_in_executor(None, stdout.read, self.frame_bytes)
-                if not chunk:
+                chunk = await self.capture.get()
+                if chunk is None:
                     logger.warning("capture stdout closed")
                     break
                 self._audio_in_bytes += len(chunk)
                 if self._source_rec is not None:
                     self._source_rec.write(chunk)
-                await self.session.send_audio(chunk)
+                if self.gate is None:
+                    await self.uplink.push(chunk)
+                    continue
+                frames, ended = self.gate.process(chunk)
+                for frame in frames:
+                    await self.uplink.push(frame)
+                if ended:
+                    # Activity end must follow the last frames of the phrase
+                    await self.uplink.flush()
+                    await self.session.end_activity()
+            await self.uplink.flush()
         except asyncio.CancelledError:
             pass
+        finally:
+            self.capture.stop()
+            self.uplink.stop()
 
     async def run(self) -> None:
         stop_loopback()
         self.capture_proc = _spawn_capture(self.input_rate)
         self.playback_proc = _spawn_playback()
+        self.playback = PlaybackWriter(self.playback_proc.stdin, SAMPLE_RATE)
+        self.playback.start()
         logger.info(
             f"capture pid={self.capture_proc.pid} playback pid={self.playback_proc.pid}"
         )
@@ -136,6 +163,9 @@ class Runner:
             )
             logger.info(f"recording -> {self._session_dir}")
 
+        if self.preset.vad_gate:
+            self.gate = UplinkGate(self.input_rate, FRAME_MS)
+
         if self.preset.backend == "gemini":
             from .gemini_session import GeminiConfig, GeminiSession
             cfg = GeminiConfig(
@@ -183,8 +213,18 @@ class Runner:
                 f"audio in={self._audio_in_bytes} bytes "
                 f"out={self._audio_out_bytes} bytes"
             )
+            if self.capture is not None:
+                logger.info(f"capture {self.capture.stats()}")
+            if self.uplink is not None:
+                logger.info(f"uplink {self.uplink.stats()}")
+            if self.playback is not None:
+                logger.info(f"playback {self.playback.stats()}")
+            if self.gate is not None:
+                logger.info(f"uplink gate {self.gate.stats()}")
 
     def _cleanup_audio_procs(self) -> None:
+        if self.playback is not None:
+            self.playback.close()
         for proc in (self.capture_proc, self.playback_proc):
             if proc is None:
                 continue
@@ -10,7 +10,19 @@ from typing import Awaitable, Callable
 import websockets
 from loguru import logger
 
+from .audio import CHANNELS, SAMPLE_RATE, SAMPLE_WIDTH
+
 WS_URL = "wss://api.openai.com/v1/realtime/translations?model=gpt-realtime-translate"
+# Keepalive pings double as the RTT probe for uplink packet sizing
+PING_INTERVAL_S = 5.0
+
+# The append event is fixed apart from the payload, so it is assembled
+# around the base64 text instead of json.dumps-ing a dict per packet
+_APPEND_PREFIX = '{"type":"session.input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = '"}'
+# The translate API wants silence between phrases; when the uplink is gated,
+# one block of digital silence (tiny after permessage-deflate) stands in for it
+SILENCE_FLUSH_MS = 1000
 
 
 @dataclass
@@ -34,6 +46,7 @@ class TranslateSession:
         self._ws: websockets.WebSocketClientProtocol | None = None
         self._closing = False
         self._closed_event = asyncio.Event()
+        self._silence_message: str | None = None
 
     async def __aenter__(self) -> "TranslateSession":
         await self.connect()
@@ -54,6 +67,7 @@ class TranslateSession:
             WS_URL,
             additional_headers=headers,
             max_size=None,
+            ping_interval=PING_INTERVAL_S,
         )
         await self._ws.send(
             json.dumps(
@@ -75,14 +89,22 @@ class TranslateSession:
         if self._ws is None or self._closing:
             return
         b64 = base64.b64encode(pcm16).decode("ascii")
-        await self._ws.send(
-            json.dumps(
-                {
-                    "type": "session.input_audio_buffer.append",
-                    "audio": b64,
-                }
+        await self._ws.send(_APPEND_PREFIX + b64 + _APPEND_SUFFIX)
+
+    async def end_activity(self) -> None:
+        """Speech paused and the uplink goes quiet: let the phrase finish."""
+        if self._ws is None or self._closing:
+            return
+        if self._silence_message is None:
+            silence = bytes(SAMPLE_RATE * SILENCE_FLUSH_MS // 1000 * CHANNELS * SAMPLE_WIDTH)
+            self._silence_message = (
+                _APPEND_PREFIX + base64.b64encode(silence).decode("ascii") + _APPEND_SUFFIX
             )
-        )
+        await self._ws.send(self._silence_message)
+
+    def rtt_ms(self) -> float | None:
+        latency = getattr(self._ws, "latency", None)
+        return latency * 1000.0 if latency else None
 
     async def receive_loop(self) -> None:
         assert self._ws is not None
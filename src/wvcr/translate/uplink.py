@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from loguru import logger
+
+# Packets waiting beyond this make the next one bigger
+BACKLOG_PACKETS = 2
+# Share of the network RTT we are willing to add as coalescing delay
+RTT_SHARE = 0.25
+GROW = 1.5
+# Per-packet pull back toward the RTT-derived size once the queue is clear
+DECAY = 0.9
+MAX_QUEUED_PACKETS = 16
+
+
+class Uplink:
+    """Coalesces capture frames into larger packets before they are sent.
+
+    Each send costs a WebSocket message (and for OpenAI a JSON/base64
+    envelope), so 20 ms frames are joined into packets of min_ms..max_ms.
+    With min_ms == max_ms the packet size is fixed. Otherwise the target
+    follows the connection: it is at least RTT_SHARE of the measured RTT
+    (a few tens of ms more buffering matters little on a slow link), grows
+    while sends back up in the queue, and decays back toward the floor once
+    the queue drains.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        frame_ms: int,
+        min_ms: int,
+        max_ms: int,
+        rtt_ms: Optional[Callable[[], Optional[float]]] = None,
+    ):
+        self.send = send
+        self.frame_ms = frame_ms
+        self.min_ms = max(frame_ms, min_ms)
+        self.max_ms = max(self.min_ms, max_ms)
+        self.rtt_ms = rtt_ms
+        self.target_ms = float(self.min_ms)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED_PACKETS)
+        self._packet = bytearray()
+        self._packet_frames = 0
+        self._task: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self.frames = 0
+        self.packets = 0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        self._task = asyncio.create_task(self._send_loop())
+
+    async def push(self, frame: bytes) -> None:
+        self._packet += frame
+        self._packet_frames += 1
+        self.frames += 1
+        if self._packet_frames * self.frame_ms >= self._target():
+            await self._emit()
+
+    async def flush(self) -> None:
+        """Send what is buffered and wait until the queue is empty."""
+        if self._packet:
+            await self._emit()
+        if self._task is not None and not self._task.done():
+            await self.queue.join()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _target(self) -> int:
+        if self.min_ms == self.max_ms:
+            return self.min_ms
+        floor = float(self.min_ms)
+        rtt = self.rtt_ms() if self.rtt_ms is not None else None
+        if rtt:
+            floor = max(floor, rtt * RTT_SHARE)
+        depth = self.queue.qsize()
+        if depth >= BACKLOG_PACKETS:
+            self.target_ms = max(self.target_ms * GROW, floor)
+        elif depth == 0:
+            self.target_ms = max(floor, self.target_ms * DECAY)
+        self.target_ms = min(max(self.target_ms, float(self.min_ms)), float(self.max_ms))
+        # Whole frames only
+        frames = max(1, round(self.target_ms / self.frame_ms))
+        return frames * self.frame_ms
+
+    async def _emit(self) -> None:
+        packet = bytes(self._packet)
+        self._packet.clear()
+        self._packet_frames = 0
+        await self.queue.put(packet)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def _send_loop(self) -> None:
+        while True:
+            packet = await self.queue.get()
+            try:
+                await self.send(packet)
+                self.packets += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"uplink send failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self._started_at, 1e-6) if self._started_at else 0.0
+        return {
+            "frames": self.frames,
+            "packets": self.packets,
+            "avg_packet_ms": round(self.frames * self.frame_ms / self.packets, 1) if self.packets else 0.0,
+            "packets_per_s": round(self.packets / elapsed, 1) if elapsed else 0.0,
+            "target_ms": round(self.target_ms),
+            "max_depth": self.max_depth,
+        }